@@ -0,0 +1,292 @@
+"""
+SurFit V1 — Cycle-Time Analytics
+SQL-side aggregation over execution_log, so reports across thousands of
+runs never pull individual log rows into Python.
+
+Human time is the latency logged at approval gates. Gates are identified
+from each run's stored SAW spec (runs.saw_spec, read with SQLite's JSON
+functions); runs recorded before specs were stored fall back to treating
+tool-less rows (start/end/gates) as human time, which only gates carry.
+
+Run:  python analytics.py --db surfit_runs.db
+      python analytics.py --db surfit_runs.db --saw-id saw_board_metrics_v1 --since 2026-03-01 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from logger import DEFAULT_DB_PATH, init_db
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+def _where(clauses: list[str]) -> str:
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+def _run_times_sql(run_filter: str, gate_filter: str) -> str:
+    """
+    Per-run system/human split. run_filter applies to the `runs r` /
+    `execution_log l` aliases; gate_filter applies the same predicates to
+    `runs r` alone, so only the selected runs' specs are expanded.
+    """
+    return f"""
+        WITH gate_nodes AS (
+            SELECT r.run_id, json_extract(n.value, '$.id') AS node_id
+            FROM runs r, json_each(r.saw_spec, '$.graph.nodes') AS n
+            WHERE r.saw_spec IS NOT NULL
+              AND json_extract(n.value, '$.type') = 'approval_gate'
+              {gate_filter}
+        ),
+        classified AS (
+            SELECT
+                l.run_id,
+                l.saw_id,
+                l.latency_ms,
+                CASE
+                    WHEN r.saw_spec IS NULL THEN l.tool_name = ''
+                    ELSE g.node_id IS NOT NULL
+                END AS is_human
+            FROM execution_log l
+            LEFT JOIN runs r ON r.run_id = l.run_id
+            LEFT JOIN gate_nodes g ON g.run_id = l.run_id AND g.node_id = l.node_id
+            {run_filter}
+        )
+        SELECT
+            c.run_id,
+            c.saw_id,
+            SUM(CASE WHEN c.is_human THEN 0.0 ELSE c.latency_ms END) AS system_ms,
+            SUM(CASE WHEN c.is_human THEN c.latency_ms ELSE 0.0 END) AS human_ms,
+            COUNT(*) AS log_rows
+        FROM classified c
+        GROUP BY c.run_id, c.saw_id
+    """
+
+
+def _run_filter(
+    run_ids: list[str] | None = None,
+    saw_id: str | None = None,
+    since: str | None = None,
+) -> tuple[str, str, list]:
+    """(run_filter, gate_filter, params) for _run_times_sql; params cover both filters."""
+    log_clauses: list[str] = []
+    gate_clauses: list[str] = []
+    params: list = []
+    if run_ids is not None:
+        placeholders = ", ".join("?" for _ in run_ids)
+        log_clauses.append(f"l.run_id IN ({placeholders})")
+        gate_clauses.append(f"r.run_id IN ({placeholders})")
+        params.extend(run_ids)
+    if saw_id is not None:
+        log_clauses.append("l.saw_id = ?")
+        gate_clauses.append("r.saw_id = ?")
+        params.append(saw_id)
+    if since is not None:
+        log_clauses.append("r.started_at >= ?")
+        gate_clauses.append("r.started_at >= ?")
+        params.append(since)
+    gate_filter = "".join(f"AND {clause} " for clause in gate_clauses)
+    # gate_nodes comes first in the SQL, so its parameters do too.
+    return _where(log_clauses), gate_filter, params + params
+
+
+def run_cycle_times(
+    conn: sqlite3.Connection,
+    run_ids: list[str] | None = None,
+    saw_id: str | None = None,
+    since: str | None = None,
+) -> list[dict]:
+    """System vs human time per run, ordered by run_id."""
+    run_filter, gate_filter, params = _run_filter(run_ids, saw_id, since)
+    rows = conn.execute(_run_times_sql(run_filter, gate_filter) + " ORDER BY c.run_id", params)
+    return [
+        {
+            "run_id": run_id,
+            "saw_id": row_saw_id,
+            "system_time_ms": round(system_ms, 2),
+            "human_wait_time_ms": round(human_ms, 2),
+            "total_ms": round(system_ms + human_ms, 2),
+            "log_rows": log_rows,
+        }
+        for run_id, row_saw_id, system_ms, human_ms, log_rows in rows
+    ]
+
+
+def cycle_time_breakdown(conn: sqlite3.Connection, run_id: str) -> dict:
+    """One run's split, shaped like logger.get_cycle_time_breakdown."""
+    rows = run_cycle_times(conn, run_ids=[run_id])
+    if not rows:
+        return {"run_id": run_id, "system_time_ms": 0.0, "human_wait_time_ms": 0.0, "total_ms": 0.0}
+    row = rows[0]
+    return {key: row[key] for key in ("run_id", "system_time_ms", "human_wait_time_ms", "total_ms")}
+
+
+def tool_latency_percentiles(
+    conn: sqlite3.Connection,
+    saw_id: str | None = None,
+    since: str | None = None,
+    percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+    include_cache_hits: bool = False,
+) -> list[dict]:
+    """
+    Nearest-rank latency percentiles per tool over allowed tool calls (every
+    retry attempt counts as a call). Cache hits are excluded by default,
+    since the tool did not run.
+    """
+    pcts = [int(p) for p in percentiles]
+    if any(not 0 < p <= 100 for p in pcts):
+        raise ValueError(f"Percentiles must be in (0, 100]: {percentiles}")
+
+    clauses = ["tool_name != ''", "decision = 'allow'"]
+    params: list = []
+    if not include_cache_hits:
+        clauses.append("cache_hit = 0")
+    if saw_id is not None:
+        clauses.append("saw_id = ?")
+        params.append(saw_id)
+    if since is not None:
+        clauses.append("timestamp_iso >= ?")
+        params.append(since)
+
+    # rank = ceil(p * n / 100), in integer arithmetic
+    pct_columns = ",\n".join(
+        f"MAX(CASE WHEN rn = ({p} * n + 99) / 100 THEN latency_ms END) AS p{p}" for p in pcts
+    )
+    sql = f"""
+        WITH ranked AS (
+            SELECT
+                tool_name,
+                latency_ms,
+                ROW_NUMBER() OVER (PARTITION BY tool_name ORDER BY latency_ms) AS rn,
+                COUNT(*) OVER (PARTITION BY tool_name) AS n
+            FROM execution_log
+            {_where(clauses)}
+        )
+        SELECT
+            tool_name,
+            MAX(n) AS calls,
+            AVG(latency_ms) AS mean_ms,
+            MAX(latency_ms) AS max_ms,
+            {pct_columns}
+        FROM ranked
+        GROUP BY tool_name
+        ORDER BY tool_name
+    """
+    results = []
+    for row in conn.execute(sql, params):
+        tool_name, calls, mean_ms, max_ms, *values = row
+        entry = {
+            "tool_name": tool_name,
+            "calls": calls,
+            "mean_ms": round(mean_ms, 2),
+            "max_ms": round(max_ms, 2),
+        }
+        entry.update({f"p{p}_ms": round(v, 2) for p, v in zip(pcts, values)})
+        results.append(entry)
+    return results
+
+
+def saw_trends(
+    conn: sqlite3.Connection,
+    saw_id: str | None = None,
+    since: str | None = None,
+) -> list[dict]:
+    """Per SAW and run-start day: run counts by outcome and mean/max system and human time."""
+    run_filter, gate_filter, params = _run_filter(saw_id=saw_id, since=since)
+    sql = f"""
+        WITH run_times AS ({_run_times_sql(run_filter, gate_filter)})
+        SELECT
+            t.saw_id,
+            substr(r.started_at, 1, 10) AS day,
+            COUNT(*) AS runs,
+            SUM(r.status = 'completed') AS completed,
+            SUM(r.status = 'denied') AS denied,
+            SUM(r.status NOT IN ('completed', 'denied')) AS other,
+            AVG(t.system_ms) AS mean_system_ms,
+            MAX(t.system_ms) AS max_system_ms,
+            AVG(t.human_ms) AS mean_human_ms
+        FROM run_times t
+        JOIN runs r ON r.run_id = t.run_id
+        GROUP BY t.saw_id, day
+        ORDER BY t.saw_id, day
+    """
+    return [
+        {
+            "saw_id": row_saw_id,
+            "day": day,
+            "runs": runs,
+            "completed": completed,
+            "denied": denied,
+            "other": other,
+            "mean_system_ms": round(mean_system, 2),
+            "max_system_ms": round(max_system, 2),
+            "mean_human_wait_ms": round(mean_human, 2),
+        }
+        for row_saw_id, day, runs, completed, denied, other, mean_system, max_system, mean_human in conn.execute(sql, params)
+    ]
+
+
+def build_report(
+    conn: sqlite3.Connection,
+    saw_id: str | None = None,
+    since: str | None = None,
+    percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+) -> dict:
+    return {
+        "saw_id": saw_id,
+        "since": since,
+        "tool_latency": tool_latency_percentiles(conn, saw_id=saw_id, since=since, percentiles=percentiles),
+        "saw_trends": saw_trends(conn, saw_id=saw_id, since=since),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Cycle-time and tool latency report")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite DB path (default: surfit_runs.db)")
+    parser.add_argument("--saw-id", help="Only this SAW")
+    parser.add_argument("--since", help="Only runs/log rows at or after this ISO timestamp")
+    parser.add_argument(
+        "--percentiles", default=",".join(str(p) for p in DEFAULT_PERCENTILES),
+        help="Comma-separated latency percentiles (default: 50,95,99)",
+    )
+    parser.add_argument("--no-migrate", action="store_true", help="Do not upgrade the DB schema first (read-only DBs)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    percentiles = tuple(int(p) for p in args.percentiles.split(",") if p.strip())
+    if not args.no_migrate:
+        # Older DBs lack columns (cache_hit, saw_spec) and the latency index.
+        init_db(Path(args.db)).close()
+    conn = sqlite3.connect(f"file:{Path(args.db).resolve()}?mode=ro", uri=True)
+    try:
+        report = build_report(conn, saw_id=args.saw_id, since=args.since, percentiles=percentiles)
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print("Tool latency (ms):")
+    header = "  {:<34} {:>7} {:>9}".format("tool", "calls", "mean") + "".join(f" {'p' + str(p):>9}" for p in percentiles)
+    print(header)
+    for t in report["tool_latency"]:
+        print(
+            f"  {t['tool_name']:<34} {t['calls']:>7} {t['mean_ms']:>9}"
+            + "".join(f" {t[f'p{p}_ms']:>9}" for p in percentiles)
+        )
+    print("\nSAW trends:")
+    for t in report["saw_trends"]:
+        print(
+            f"  {t['saw_id']} {t['day']}: {t['runs']} runs ({t['completed']} completed, {t['denied']} denied), "
+            f"system {t['mean_system_ms']} ms avg / {t['max_system_ms']} max, human {t['mean_human_wait_ms']} ms avg"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,9 +10,7 @@ import time
 import os
 import shutil
 import hashlib
-import threading
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict, deque
 try:
     import anthropic
 except ModuleNotFoundError:
@@ -42,9 +40,11 @@ from surfit.connectors.adapter_registry import (
     dispatch_connector_action,
 )
 from surfit.runtime.artifact_service import ArtifactRetrievalService, ArtifactService
+from surfit.runtime.blocking_executor import BlockingExecutorConfig, BlockingWorkExecutors
 from surfit.runtime.execution_gateway import ExecutionGateway
 from surfit.runtime.policy_manifest_loader import PolicyManifestLoader
 from surfit.runtime.policy_engine import DefaultPolicyEngine
+from surfit.runtime.rate_limiter import build_rate_limiter
 from surfit.runtime.tenant_context import TenantContextResolver
 from surfit.runtime.token_validation import TokenValidationLayer
 from surfit.runtime.token_service import TokenService, TokenServiceError
@@ -60,9 +60,11 @@ from surfit.runtime.wave_orchestrator import (
 )
 from surfit.runtime.wave_application_service import (
     WaveApplicationService,
+    WaveExecutionJob,
     WaveRunApplicationDeps,
     WaveRunApplicationRequest,
 )
+from surfit.runtime.wave_job_queue import WaveJobQueue, WaveWorkerPool
 from surfit.storage.artifact_store import FileArtifactStore
 from surfit.demos.handlers._common import DemoHandlerDeps, DemoHandlerError
 from surfit.demos.handlers.context_router import prepare_wave_context
@@ -97,6 +99,7 @@ RUNTIME_POLICY_ENGINE = DefaultPolicyEngine(RUNTIME_POLICY_MANIFEST_LOADER)
 RUNTIME_WAVE_SERVICE = WaveService()
 RUNTIME_WAVE_ORCHESTRATOR = WaveOrchestrator(RUNTIME_TENANT_CONTEXT)
 RUNTIME_WAVE_APPLICATION_SERVICE = WaveApplicationService()
+RUNTIME_WAVE_JOB_QUEUE = WaveJobQueue(now_iso=lambda: datetime.now(timezone.utc).isoformat())
 RUNTIME_WAVE_LIFECYCLE_STORE = WaveLifecycleStore(
     default_tenant_id=os.environ.get("SURFIT_DEFAULT_TENANT_ID", "tenant_demo"),
     now_iso=lambda: datetime.now(timezone.utc).isoformat(),
@@ -128,8 +131,22 @@ OCEAN_PROXY_MAX_RESPONSE_BYTES = int(os.environ.get("SURFIT_PROXY_MAX_RESPONSE_B
 RATE_LIMIT_WAVES_PER_MIN = int(os.environ.get("SURFIT_RATE_LIMIT_WAVES_PER_MIN", "30"))
 RATE_LIMIT_PROXY_PER_MIN = int(os.environ.get("SURFIT_RATE_LIMIT_PROXY_PER_MIN", "300"))
 RATE_LIMIT_EXPORT_PER_MIN = int(os.environ.get("SURFIT_RATE_LIMIT_EXPORT_PER_MIN", "20"))
+DB_EXECUTOR_WORKERS = int(os.environ.get("SURFIT_DB_EXECUTOR_WORKERS", "8"))
+PROXY_IO_WORKERS = int(os.environ.get("SURFIT_PROXY_IO_WORKERS", "32"))
+WAVE_EXECUTOR_WORKERS = int(os.environ.get("SURFIT_WAVE_EXECUTOR_WORKERS", "8"))
+WAVE_EXECUTION_MODE = os.environ.get("SURFIT_WAVE_EXECUTION_MODE", "inline").strip().lower() or "inline"
+WAVE_QUEUE_WORKERS = int(os.environ.get("SURFIT_WAVE_QUEUE_WORKERS", "4"))
+# Running jobs whose worker heartbeat is older than this are presumed lost and
+# requeued. Keep it well below the mutation token TTL, or re-runs fail.
+WAVE_QUEUE_STALE_AFTER_SECONDS = int(os.environ.get("SURFIT_WAVE_QUEUE_STALE_AFTER_SECONDS", "120"))
+RATE_LIMIT_STRIPES = int(os.environ.get("SURFIT_RATE_LIMIT_STRIPES", "64"))
+RATE_LIMIT_OVERRIDES_PATH = Path(
+    os.environ.get("SURFIT_RATE_LIMIT_OVERRIDES_PATH", str(PROJECT_ROOT / "tenants" / "rate_limits.json"))
+)
 TOKEN_REPLAY_MAX_USES = int(os.environ.get("SURFIT_TOKEN_REPLAY_MAX_USES", "1000"))
 TOKEN_REPLAY_GRACE_SECONDS = int(os.environ.get("SURFIT_TOKEN_REPLAY_GRACE_SECONDS", "60"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get("SURFIT_TOKEN_CACHE_MAX_ENTRIES", "4096"))
+MUTATION_TOKEN_FORMAT = os.environ.get("SURFIT_MUTATION_TOKEN_FORMAT", "swt2").strip().lower() or "swt2"
 DEFAULT_TENANT_ID = os.environ.get("SURFIT_DEFAULT_TENANT_ID", "tenant_demo")
 DATABASE_URL = os.environ.get("DATABASE_URL", "").strip()
 REDIS_URL = os.environ.get("REDIS_URL", "").strip()
@@ -140,8 +157,18 @@ RUNTIME_TOKEN_SERVICE = TokenService(
     sha256_text=lambda text: hashlib.sha256(text.encode("utf-8")).hexdigest(),
 )
 
-_RATE_LIMIT_LOCK = threading.Lock()
-_RATE_LIMIT_BUCKETS: dict[str, deque[float]] = defaultdict(deque)
+RUNTIME_EXECUTORS = BlockingWorkExecutors(
+    BlockingExecutorConfig(
+        db_workers=DB_EXECUTOR_WORKERS,
+        io_workers=PROXY_IO_WORKERS,
+        wave_workers=WAVE_EXECUTOR_WORKERS,
+    )
+)
+RUNTIME_RATE_LIMITER = build_rate_limiter(
+    redis_url=REDIS_URL,
+    overrides_path=RATE_LIMIT_OVERRIDES_PATH,
+    stripes=RATE_LIMIT_STRIPES,
+)
 
 def _load_api_key_tenant_map() -> dict[str, str]:
     raw_json = os.environ.get("SURFIT_API_KEYS_JSON", "").strip()
@@ -506,6 +533,8 @@ RUNTIME_MUTATION_BOUNDARY = MutationBoundaryService(
         proxy_max_response_bytes=OCEAN_PROXY_MAX_RESPONSE_BYTES,
         token_replay_max_uses=TOKEN_REPLAY_MAX_USES,
         token_replay_grace_seconds=TOKEN_REPLAY_GRACE_SECONDS,
+        token_cache_max_entries=TOKEN_CACHE_MAX_ENTRIES,
+        mutation_token_format=MUTATION_TOKEN_FORMAT,
         market_intel_templates=MARKET_INTEL_TEMPLATES,
         prod_config_target=PROD_CONFIG_TARGET,
         prod_config_allowed_keys=PROD_CONFIG_ALLOWED_KEYS,
@@ -593,6 +622,7 @@ class WaveExecutionError(Exception):
 
 def ensure_wave_tables(conn: sqlite3.Connection) -> None:
     RUNTIME_WAVE_LIFECYCLE_STORE.ensure_schema(conn)
+    RUNTIME_WAVE_JOB_QUEUE.ensure_schema(conn)
 
 
 @app.on_event("startup")
@@ -605,6 +635,18 @@ def initialize_runtime_schema() -> None:
         conn.close()
 
 
+@app.on_event("startup")
+def start_wave_workers() -> None:
+    if WAVE_EXECUTION_MODE == "queue" and WAVE_QUEUE_WORKERS > 0:
+        RUNTIME_WAVE_WORKERS.start()
+
+
+@app.on_event("shutdown")
+def shutdown_runtime_executors() -> None:
+    RUNTIME_WAVE_WORKERS.stop(timeout=5)
+    RUNTIME_EXECUTORS.shutdown(wait=False)
+
+
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -725,18 +767,7 @@ def _log_api_event(
 
 
 def _rate_limit_check(tenant_id: str, bucket: str, limit_per_min: int) -> bool:
-    if limit_per_min <= 0:
-        return True
-    now = time.time()
-    key = f"{tenant_id}:{bucket}"
-    with _RATE_LIMIT_LOCK:
-        q = _RATE_LIMIT_BUCKETS[key]
-        while q and (now - q[0]) > 60:
-            q.popleft()
-        if len(q) >= limit_per_min:
-            return False
-        q.append(now)
-        return True
+    return RUNTIME_RATE_LIMITER.check(tenant_id, bucket, limit_per_min)
 
 
 def _sha256_text(text: str) -> str:
@@ -907,6 +938,7 @@ def _insert_wave_row(
     wave_mutation_token_hash: str | None = None,
     wave_mutation_token_expires_at: str | None = None,
     wave_mutation_token_payload_json: str | None = None,
+    mutation_scope: dict[str, Any] | None = None,
 ) -> None:
     RUNTIME_WAVE_LIFECYCLE_STORE.insert_wave(
         conn,
@@ -932,6 +964,7 @@ def _insert_wave_row(
             wave_mutation_token_hash=wave_mutation_token_hash,
             wave_mutation_token_expires_at=wave_mutation_token_expires_at,
             wave_mutation_token_payload_json=wave_mutation_token_payload_json,
+            mutation_scope=mutation_scope,
         ),
     )
 
@@ -1131,7 +1164,121 @@ def _write_manifest(
     )
 
 
+def _build_wave_application_deps() -> WaveRunApplicationDeps:
+    return WaveRunApplicationDeps(
+        orchestrator=RUNTIME_WAVE_ORCHESTRATOR,
+        build_prep_deps=lambda _conn: WaveRunPreparationDeps(
+            load_policy_snapshot=_load_policy_manifest_snapshot,
+            log_decision=lambda _wave_id, _decision, _reason, _rule, _node, _tenant_id: _log_decision(
+                _conn, _wave_id, _decision, _reason, _rule, _node, tenant_id=_tenant_id
+            ),
+            resolve_connector_type=resolve_connector_type,
+            prepare_wave_context=prepare_wave_context,
+            normalize_repo_relative=_normalize_repo_relative,
+            is_under=_is_under,
+            prepare_connector_context=prepare_connector_context,
+            issue_wave_token=_issue_wave_token,
+            build_mutation_scope=_build_mutation_scope,
+            mint_wave_mutation_token=_mint_wave_mutation_token,
+            insert_wave_row=lambda **kwargs: _insert_wave_row(conn=_conn, **kwargs),
+            mkdir=lambda path: Path(path).mkdir(parents=True, exist_ok=True),
+            commit=_conn.commit,
+        ),
+        build_handler_deps=lambda _conn: DemoHandlerDeps(
+            project_root=PROJECT_ROOT,
+            ocean_proxy_http=lambda proxy_req: _ocean_proxy_http_core(_conn, proxy_req),
+            commit_output_write=lambda **kwargs: _commit_output_write(conn=_conn, **kwargs),
+            log_decision=lambda _wave_id, _decision, _reason, _rule, _node: _log_decision(
+                _conn, _wave_id, _decision, _reason, _rule, _node
+            ),
+            dispatch_connector_action=lambda **kwargs: dispatch_connector_action(
+                **kwargs,
+                proxy_executor=lambda proxy_req: _ocean_proxy_http_core(_conn, proxy_req),
+            ),
+            sha256_text=_sha256_text,
+            sha256_file=_sha256_file,
+            anthropic_module=anthropic,
+        ),
+        dispatch_template_handler=dispatch_template_handler,
+        write_manifest=lambda _conn, _wave_id, _workspace_dir, _req, _output_path, _evidence: _write_manifest(
+            _conn, _wave_id, _workspace_dir, _req, _output_path, _evidence
+        ),
+        update_wave_status=lambda _conn, _wave_id, _status, _error_code, _error_message, _error_node: RUNTIME_WAVE_LIFECYCLE_STORE.update_wave_status(
+            _conn,
+            wave_id=_wave_id,
+            status=_status,
+            error_code=_error_code,
+            error_message=_error_message,
+            error_node=_error_node,
+        ),
+        log_decision=lambda _conn, _wave_id, _decision, _reason, _rule, _node: _log_decision(
+            _conn, _wave_id, _decision, _reason, _rule, _node
+        ),
+        sha256_file=_sha256_file,
+        record_prep_deny=lambda _conn, _wave_id, _req, _deny, _tenant_id, _snapshot: _record_prep_deny(
+            conn=_conn,
+            wave_id=_wave_id,
+            req=_req,
+            deny=_deny,
+            tenant_id=_tenant_id,
+            policy_manifest_hash=_snapshot["manifest_hash"],
+            policy_manifest_version=_snapshot["manifest_version"],
+            policy_manifest_json=_snapshot["manifest_json"],
+        ),
+        load_policy_snapshot=_load_policy_manifest_snapshot,
+        monotonic=time.monotonic,
+        wave_execution_error_type=WaveExecutionError,
+    )
+
+
+def _enqueue_wave_job(conn: sqlite3.Connection, job: WaveExecutionJob) -> None:
+    RUNTIME_WAVE_JOB_QUEUE.enqueue(conn, wave_id=job.wave_id, tenant_id=job.tenant_id, payload=job.to_payload())
+
+
+def _execute_queued_wave(conn: sqlite3.Connection, wave_id: str, payload: dict[str, Any]) -> str:
+    job = WaveExecutionJob.from_payload(payload, req_factory=lambda raw: WaveRunRequest(**raw))
+    result = RUNTIME_WAVE_APPLICATION_SERVICE.execute_job(job, conn, MAX_RUNTIME_SECONDS, _build_wave_application_deps())
+    return "failed" if result.payload.get("status") == "failed" else "complete"
+
+
+def _fail_queued_wave(conn: sqlite3.Connection, wave_id: str, error_code: str, message: str) -> None:
+    _log_decision(conn, wave_id, "DENY", message, error_code, "wave_worker")
+    RUNTIME_WAVE_LIFECYCLE_STORE.update_wave_status(
+        conn,
+        wave_id=wave_id,
+        status="failed",
+        error_code=error_code,
+        error_message=message,
+        error_node="wave_worker",
+    )
+    conn.commit()
+
+
+def _open_wave_worker_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, timeout=20)
+    conn.execute("PRAGMA busy_timeout = 20000")
+    conn.execute("PRAGMA journal_mode = WAL")
+    ensure_wave_tables(conn)
+    return conn
+
+
+RUNTIME_WAVE_WORKERS = WaveWorkerPool(
+    queue=RUNTIME_WAVE_JOB_QUEUE,
+    connect=_open_wave_worker_conn,
+    execute=_execute_queued_wave,
+    workers=WAVE_QUEUE_WORKERS,
+    on_failed=_fail_queued_wave,
+    stale_after_seconds=WAVE_QUEUE_STALE_AFTER_SECONDS,
+)
+
+
 @app.post("/api/waves/run")
+async def run_wave_route(req: WaveRunRequest, request: Request):
+    # Wave execution (handlers, proxy fetches, LLM calls, SQLite) is blocking end to end;
+    # run it on the wave pool so it never occupies the event loop or the shared threadpool.
+    return await RUNTIME_EXECUTORS.run_wave(run_wave, req, request)
+
+
 def run_wave(req: WaveRunRequest, request: Request = None):
     auth = _require_api_key(request)
     if isinstance(auth, JSONResponse):
@@ -1165,82 +1312,25 @@ def run_wave(req: WaveRunRequest, request: Request = None):
     ensure_wave_tables(conn)
     workspace_dir = str((RUNS_ROOT / wave_id).resolve())
     try:
-        result = RUNTIME_WAVE_APPLICATION_SERVICE.run_wave(
-            WaveRunApplicationRequest(
-                req=req,
-                tenant_id=tenant_id,
-                wave_id=wave_id,
-                conn=conn,
-                workspace_dir=workspace_dir,
-                market_intel_templates=MARKET_INTEL_TEMPLATES,
-                prod_config_target=PROD_CONFIG_TARGET,
-                max_runtime_seconds=MAX_RUNTIME_SECONDS,
-            ),
-            WaveRunApplicationDeps(
-                orchestrator=RUNTIME_WAVE_ORCHESTRATOR,
-                build_prep_deps=lambda _conn: WaveRunPreparationDeps(
-                    load_policy_snapshot=_load_policy_manifest_snapshot,
-                    log_decision=lambda _wave_id, _decision, _reason, _rule, _node, _tenant_id: _log_decision(
-                        _conn, _wave_id, _decision, _reason, _rule, _node, tenant_id=_tenant_id
-                    ),
-                    resolve_connector_type=resolve_connector_type,
-                    prepare_wave_context=prepare_wave_context,
-                    normalize_repo_relative=_normalize_repo_relative,
-                    is_under=_is_under,
-                    prepare_connector_context=prepare_connector_context,
-                    issue_wave_token=_issue_wave_token,
-                    build_mutation_scope=_build_mutation_scope,
-                    mint_wave_mutation_token=_mint_wave_mutation_token,
-                    insert_wave_row=lambda **kwargs: _insert_wave_row(conn=_conn, **kwargs),
-                    mkdir=lambda path: Path(path).mkdir(parents=True, exist_ok=True),
-                    commit=_conn.commit,
-                ),
-                build_handler_deps=lambda _conn: DemoHandlerDeps(
-                    project_root=PROJECT_ROOT,
-                    ocean_proxy_http=lambda proxy_req: _ocean_proxy_http_core(_conn, proxy_req),
-                    commit_output_write=lambda **kwargs: _commit_output_write(conn=_conn, **kwargs),
-                    log_decision=lambda _wave_id, _decision, _reason, _rule, _node: _log_decision(
-                        _conn, _wave_id, _decision, _reason, _rule, _node
-                    ),
-                    dispatch_connector_action=lambda **kwargs: dispatch_connector_action(
-                        **kwargs,
-                        proxy_executor=lambda proxy_req: _ocean_proxy_http_core(_conn, proxy_req),
-                    ),
-                    sha256_text=_sha256_text,
-                    sha256_file=_sha256_file,
-                    anthropic_module=anthropic,
-                ),
-                dispatch_template_handler=dispatch_template_handler,
-                write_manifest=lambda _conn, _wave_id, _workspace_dir, _req, _output_path, _evidence: _write_manifest(
-                    _conn, _wave_id, _workspace_dir, _req, _output_path, _evidence
-                ),
-                update_wave_status=lambda _conn, _wave_id, _status, _error_code, _error_message, _error_node: RUNTIME_WAVE_LIFECYCLE_STORE.update_wave_status(
-                    _conn,
-                    wave_id=_wave_id,
-                    status=_status,
-                    error_code=_error_code,
-                    error_message=_error_message,
-                    error_node=_error_node,
-                ),
-                log_decision=lambda _conn, _wave_id, _decision, _reason, _rule, _node: _log_decision(
-                    _conn, _wave_id, _decision, _reason, _rule, _node
-                ),
-                sha256_file=_sha256_file,
-                record_prep_deny=lambda _conn, _wave_id, _req, _deny, _tenant_id, _snapshot: _record_prep_deny(
-                    conn=_conn,
-                    wave_id=_wave_id,
-                    req=_req,
-                    deny=_deny,
-                    tenant_id=_tenant_id,
-                    policy_manifest_hash=_snapshot["manifest_hash"],
-                    policy_manifest_version=_snapshot["manifest_version"],
-                    policy_manifest_json=_snapshot["manifest_json"],
-                ),
-                load_policy_snapshot=_load_policy_manifest_snapshot,
-                monotonic=time.monotonic,
-                wave_execution_error_type=WaveExecutionError,
-            ),
+        app_request = WaveRunApplicationRequest(
+            req=req,
+            tenant_id=tenant_id,
+            wave_id=wave_id,
+            conn=conn,
+            workspace_dir=workspace_dir,
+            market_intel_templates=MARKET_INTEL_TEMPLATES,
+            prod_config_target=PROD_CONFIG_TARGET,
+            max_runtime_seconds=MAX_RUNTIME_SECONDS,
         )
+        if WAVE_EXECUTION_MODE == "queue":
+            result = RUNTIME_WAVE_APPLICATION_SERVICE.enqueue_wave(
+                app_request,
+                _build_wave_application_deps(),
+                enqueue=_enqueue_wave_job,
+            )
+            RUNTIME_WAVE_WORKERS.notify()
+        else:
+            result = RUNTIME_WAVE_APPLICATION_SERVICE.run_wave(app_request, _build_wave_application_deps())
         if result.http_status is not None and result.http_status != 200:
             return JSONResponse(status_code=result.http_status, content=result.payload)
         return result.payload
@@ -1620,36 +1710,48 @@ def _ocean_proxy_http_core(
     )
 
 
+def _record_rate_limit_event(tenant_id: str, node: str) -> None:
+    conn = sqlite3.connect(DB_PATH)
+    ensure_wave_tables(conn)
+    try:
+        _log_api_event(
+            conn,
+            tenant_id=tenant_id,
+            event_type="rate_limit",
+            reason_code="RATE_LIMIT_EXCEEDED",
+            node=node,
+            status="deny",
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _open_proxy_conn() -> sqlite3.Connection:
+    # The async proxy path hands this connection between DB-executor threads;
+    # calls on it are strictly sequential, so thread affinity is not required.
+    conn = sqlite3.connect(DB_PATH, timeout=20, check_same_thread=False)
+    conn.execute("PRAGMA busy_timeout = 20000")
+    ensure_wave_tables(conn)
+    return conn
+
+
 @app.post("/ocean/proxy/http")
-def ocean_proxy_http(req: OceanProxyHttpRequest, request: Request = None):
+async def ocean_proxy_http(req: OceanProxyHttpRequest, request: Request = None):
     auth = _require_api_key(request)
     if isinstance(auth, JSONResponse):
         return auth
     _, tenant_id = auth
-    if not _rate_limit_check(tenant_id, "proxy_request", RATE_LIMIT_PROXY_PER_MIN):
-        conn = sqlite3.connect(DB_PATH)
-        ensure_wave_tables(conn)
-        try:
-            _log_api_event(
-                conn,
-                tenant_id=tenant_id,
-                event_type="rate_limit",
-                reason_code="RATE_LIMIT_EXCEEDED",
-                node="ocean.proxy.http",
-                status="deny",
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    allowed = await RUNTIME_EXECUTORS.run_db(_rate_limit_check, tenant_id, "proxy_request", RATE_LIMIT_PROXY_PER_MIN)
+    if not allowed:
+        await RUNTIME_EXECUTORS.run_db(_record_rate_limit_event, tenant_id, "ocean.proxy.http")
         return JSONResponse(
             status_code=429,
             content={"reason_code": "RATE_LIMIT_EXCEEDED", "message": "Tenant proxy rate limit exceeded."},
         )
-    conn = sqlite3.connect(DB_PATH, timeout=20)
-    conn.execute("PRAGMA busy_timeout = 20000")
-    ensure_wave_tables(conn)
+    conn = await RUNTIME_EXECUTORS.run_db(_open_proxy_conn)
     try:
-        status_code, payload = _ocean_proxy_http_core(
+        status_code, payload = await RUNTIME_MUTATION_BOUNDARY.proxy_http_async(
             conn,
             {
                 "method": req.method,
@@ -1660,11 +1762,14 @@ def ocean_proxy_http(req: OceanProxyHttpRequest, request: Request = None):
                 "wave_mutation_token": req.wave_mutation_token,
                 "governance_context": req.governance_context,
             },
+            log_decision=_log_decision,
+            run_db=RUNTIME_EXECUTORS.run_db,
+            run_io=RUNTIME_EXECUTORS.run_io,
             api_tenant_id=tenant_id,
         )
         return JSONResponse(status_code=status_code, content=payload)
     finally:
-        conn.close()
+        await RUNTIME_EXECUTORS.run_db(conn.close)
 
 
 @app.post("/ocean/mutate_config")
@@ -2078,6 +2183,17 @@ def readyz() -> JSONResponse:
     )
 
 
+@app.get("/api/metrics/runtime")
+def metrics_runtime(request: Request):
+    auth = _require_api_key(request)
+    if isinstance(auth, JSONResponse):
+        return auth
+    return {
+        "token_cache": RUNTIME_MUTATION_BOUNDARY.token_cache_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 @app.get("/api/metrics/summary")
 def metrics_summary(
     request: Request,
@@ -0,0 +1,242 @@
+"""
+SurFit V1 — Batch Runner
+Executes many SAW runs at once (e.g. one board-metrics run per business
+unit at month-end close) instead of calling run_saw in a loop on one
+shared connection.
+
+  - Runs are spread over a thread or process pool. Every worker opens its
+    own connection to the same WAL-mode SQLite file, so readers never
+    block the writer and commits queue on the busy timeout.
+  - Cacheable tool calls (tools.TOOL_CACHE_POLICY) are deduplicated across
+    the batch: identical calls already in flight in another run are
+    waited on rather than repeated, and finished ones are served from the
+    tool cache. With processes, this sharing is per worker process plus
+    whatever has reached the DB's tool_cache table.
+  - The report carries each run's RunSummary (in job order) and aggregate
+    throughput / latency stats.
+
+Usage:
+    report = run_batch([(SAW_SPEC, RunContext(...)), ...], "surfit_runs.db", workers=8)
+    print(report.stats)
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from engine import CompiledSaw, RunSummary, run_saw
+from logger import init_db
+from models import RunContext
+from tool_cache import ToolCache
+
+BUSY_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass
+class BatchReport:
+    """Outcome of run_batch."""
+    summaries: list[RunSummary | None] = field(default_factory=list)  # job order; None if the run raised
+    errors: dict[int, str] = field(default_factory=dict)              # job index -> exception
+    stats: dict = field(default_factory=dict)
+
+
+def prepare_batch_db(db_path: Path | str) -> None:
+    """Create/upgrade the schema and switch the file to WAL (persistent per DB file)."""
+    conn = init_db(Path(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    finally:
+        conn.close()
+
+
+def connect_worker(db_path: Path | str) -> sqlite3.Connection:
+    """
+    A worker's own connection: waits on locks instead of failing, relaxed
+    fsync under WAL. Only its worker uses it; check_same_thread is off so
+    the batch can close it once the pool has drained.
+    """
+    conn = sqlite3.connect(str(db_path), timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _batch_stats(
+    summaries: list[RunSummary | None],
+    errors: dict[int, str],
+    wall_ms: float,
+    cache_stats: dict,
+) -> dict:
+    finished = [s for s in summaries if s is not None]
+    latencies = sorted(s.wall_time_ms for s in finished)
+    statuses: dict[str, int] = {}
+    for s in finished:
+        statuses[s.status] = statuses.get(s.status, 0) + 1
+    return {
+        "runs": len(summaries),
+        "statuses": statuses,
+        "errors": len(errors),
+        "wall_ms": round(wall_ms, 2),
+        "runs_per_second": round(len(finished) / (wall_ms / 1000), 2) if wall_ms > 0 else 0.0,
+        "run_latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": latencies[-1] if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        },
+        "system_time_ms": round(sum(s.system_time_ms for s in finished), 2),
+        "tool_calls_shared": cache_stats.get("shared", 0),
+        "tool_cache_hits": cache_stats.get("hits", 0),
+    }
+
+
+# ── Process workers ───────────────────────────────────────────────
+# Each process keeps one connection and one tool cache for its lifetime.
+
+_worker_conn: sqlite3.Connection | None = None
+_worker_cache: ToolCache | None = None
+
+
+def _init_process_worker(db_path: str, dedupe: bool) -> None:
+    global _worker_conn, _worker_cache
+    _worker_conn = connect_worker(db_path)
+    _worker_cache = ToolCache(share_in_flight=True) if dedupe else ToolCache(policy={})
+
+
+def _run_in_process(
+    index: int,
+    saw_spec: dict,
+    ctx: RunContext,
+    max_parallel: int,
+    input_resolver: Callable | None,
+) -> tuple[int, RunSummary | None, str | None, int, dict]:
+    try:
+        summary = run_saw(
+            saw_spec, ctx, _worker_conn,
+            input_resolver=input_resolver,
+            max_parallel=max_parallel,
+            tool_cache=_worker_cache,
+        )
+        error = None
+    except Exception as e:
+        summary, error = None, f"{type(e).__name__}: {e}"
+    return index, summary, error, os.getpid(), _worker_cache.stats()
+
+
+# ── Entry point ───────────────────────────────────────────────────
+
+def run_batch(
+    jobs: list[tuple[dict | CompiledSaw, RunContext]],
+    db_path: Path | str,
+    workers: int = 4,
+    executor: str = "thread",
+    max_parallel: int = 1,
+    dedupe_reads: bool = True,
+    input_resolver: Callable | None = None,
+) -> BatchReport:
+    """
+    Run every (saw_spec, ctx) job and return a BatchReport.
+
+    Args:
+        jobs:          (SAW spec or CompiledSaw, RunContext) pairs; run ids
+                       must be unique.
+        db_path:       SQLite file shared by all workers (":memory:" cannot be shared).
+        workers:       Runs executing at once.
+        executor:      "thread" or "process". Processes sidestep the GIL for
+                       CPU-heavy tools; input_resolver must then be picklable.
+        max_parallel:  Per-run branch parallelism, passed to run_saw.
+        dedupe_reads:  Share identical cacheable tool calls across runs.
+
+    A run that raises is recorded in report.errors (and left "incomplete"
+    in the DB by the engine); the rest of the batch carries on.
+    """
+    if str(db_path) == ":memory:":
+        raise ValueError("run_batch needs a database file; ':memory:' is private to one connection")
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor '{executor}' (expected 'thread' or 'process')")
+    prepare_batch_db(db_path)
+
+    summaries: list[RunSummary | None] = [None] * len(jobs)
+    errors: dict[int, str] = {}
+    t0 = time.perf_counter()
+
+    if executor == "thread":
+        cache = ToolCache(share_in_flight=True) if dedupe_reads else ToolCache(policy={})
+        local = threading.local()
+        conns: list[sqlite3.Connection] = []
+        conns_lock = threading.Lock()
+
+        def run_job(index: int) -> None:
+            conn = getattr(local, "conn", None)
+            if conn is None:
+                conn = local.conn = connect_worker(db_path)
+                with conns_lock:
+                    conns.append(conn)
+            saw_spec, ctx = jobs[index]
+            try:
+                summaries[index] = run_saw(
+                    saw_spec, ctx, conn,
+                    input_resolver=input_resolver,
+                    max_parallel=max_parallel,
+                    tool_cache=cache,
+                )
+            except Exception as e:
+                errors[index] = f"{type(e).__name__}: {e}"
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="saw-batch") as pool:
+                list(pool.map(run_job, range(len(jobs))))
+        finally:
+            for conn in conns:
+                conn.close()
+        cache_stats = cache.stats()
+    else:
+        worker_stats: dict[int, dict] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_process_worker,
+            initargs=(str(db_path), dedupe_reads),
+        ) as pool:
+            futures = [
+                # Plans don't pickle; workers recompile (once each) from the spec.
+                pool.submit(
+                    _run_in_process, index,
+                    saw_spec.spec if isinstance(saw_spec, CompiledSaw) else saw_spec,
+                    ctx, max_parallel, input_resolver,
+                )
+                for index, (saw_spec, ctx) in enumerate(jobs)
+            ]
+            for future in futures:
+                index, summary, error, pid, stats = future.result()
+                summaries[index] = summary
+                if error is not None:
+                    errors[index] = error
+                # Counters only grow, so a worker's largest values are its totals.
+                seen = worker_stats.setdefault(pid, {})
+                for key in ("shared", "hits"):
+                    seen[key] = max(seen.get(key, 0), stats[key])
+        cache_stats = {
+            key: sum(stats[key] for stats in worker_stats.values()) for key in ("shared", "hits")
+        }
+
+    wall_ms = (time.perf_counter() - t0) * 1000
+    return BatchReport(
+        summaries=summaries,
+        errors=errors,
+        stats=_batch_stats(summaries, errors, wall_ms, cache_stats),
+    )
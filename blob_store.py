@@ -0,0 +1,105 @@
+"""
+SurFit V1 — Blob Store
+Content-addressed payload storage in the run DB's `blobs` table. A blob is
+keyed by the sha256 of its exact bytes, so identical payloads (the same
+prompt input across runs, say) are stored once. Payloads above
+COMPRESS_MIN_BYTES are zlib-compressed when that makes them smaller.
+
+Readers either load a blob whole (get_blob) or stream it (iter_blob):
+streaming reads the stored bytes through SQLite incremental blob I/O and
+decompresses chunk by chunk, so large payloads never sit in memory whole.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import zlib
+from typing import Iterator
+
+COMPRESS_MIN_BYTES = 256
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _as_bytes(payload: bytes | str) -> bytes:
+    return payload.encode("utf-8") if isinstance(payload, str) else payload
+
+
+def blob_hash(payload: bytes | str) -> str:
+    return hashlib.sha256(_as_bytes(payload)).hexdigest()
+
+
+def put_blob(conn: sqlite3.Connection, payload: bytes | str) -> str:
+    """Store payload if new (no commit). Returns its hash."""
+    raw = _as_bytes(payload)
+    digest = hashlib.sha256(raw).hexdigest()
+    encoding, stored = "raw", raw
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) < len(raw):
+            encoding, stored = "zlib", compressed
+    conn.execute(
+        "INSERT OR IGNORE INTO blobs (hash, encoding, size, data) VALUES (?, ?, ?, ?)",
+        (digest, encoding, len(raw), stored),
+    )
+    return digest
+
+
+def get_blob(conn: sqlite3.Connection, digest: str) -> bytes | None:
+    """Whole payload, or None if the hash is unknown."""
+    row = conn.execute("SELECT encoding, data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+    if row is None:
+        return None
+    encoding, stored = row
+    return zlib.decompress(stored) if encoding == "zlib" else bytes(stored)
+
+
+def get_blob_text(conn: sqlite3.Connection, digest: str) -> str | None:
+    payload = get_blob(conn, digest)
+    return payload.decode("utf-8") if payload is not None else None
+
+
+def iter_blob(
+    conn: sqlite3.Connection,
+    digest: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Yield the payload in chunks. Raises KeyError for an unknown hash.
+    Chunk sizes of compressed blobs vary with the compression ratio.
+    """
+    row = conn.execute("SELECT rowid, encoding FROM blobs WHERE hash = ?", (digest,)).fetchone()
+    if row is None:
+        raise KeyError(digest)
+    rowid, encoding = row
+    decompressor = zlib.decompressobj() if encoding == "zlib" else None
+
+    if hasattr(conn, "blobopen"):
+        with conn.blobopen("blobs", "data", rowid, readonly=True) as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                out = decompressor.decompress(chunk) if decompressor else chunk
+                if out:
+                    yield out
+    else:  # Python < 3.11: no incremental blob I/O
+        stored = conn.execute("SELECT data FROM blobs WHERE rowid = ?", (rowid,)).fetchone()[0]
+        for start in range(0, len(stored), chunk_size):
+            chunk = bytes(stored[start:start + chunk_size])
+            out = decompressor.decompress(chunk) if decompressor else chunk
+            if out:
+                yield out
+
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+
+def blob_stats(conn: sqlite3.Connection) -> dict:
+    """Count plus logical vs stored bytes, for sizing the store."""
+    count, logical, stored = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+    ).fetchone()
+    return {"blobs": count, "logical_bytes": logical, "stored_bytes": stored}
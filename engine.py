@@ -1,35 +1,77 @@
 """
 SurFit V1 — SAW Engine (Graph Walker)
 
-Takes a SAW spec dict + RunContext, walks the linear execution graph,
-calls policy_check before each tool, handles approval gates, logs
-everything, and returns a RunSummary.
-
-V1 constraints:
-  - Linear graph only (each node has 0 or 1 outgoing edge).
-  - One start node, one end node.
-  - Branching raises NotImplementedError.
+Takes a SAW spec dict + RunContext, walks the execution DAG, calls
+policy_check before each tool, handles approval gates, logs everything,
+and returns a RunSummary.
+
+Scheduling:
+  - Nodes are committed (state updated, log row written) one at a time in
+    a deterministic topological order: ties break by position in the
+    spec's node list, so a linear graph logs exactly as before.
+  - Read-only tool nodes whose predecessors have all committed are started
+    early on a bounded thread pool, so independent branches overlap.
+    Policy checks, input resolution and all SQLite writes stay on the
+    calling thread.
+  - Write actions never run ahead of their turn, and nothing downstream of
+    an approval gate can start before the gate commits.
+  - One start node, one end node; cycles raise ValueError.
+
+Checkpoints:
+  - Each successful tool node's output is checkpointed (content-hashed,
+    stored once) alongside its log row. resume_saw(run_id, ...) replays
+    finished nodes from checkpoints and continues from the first node that
+    has not gone through, e.g. an approval gate granted hours later.
+
+Compiled specs:
+  - compile_saw(spec) validates the graph and precomputes everything a run
+    needs from the spec (execution order, policy sets, policy hash and
+    snapshot, execution policies). Plans are cached by spec content hash;
+    run_saw/resume_saw accept either a spec dict or a CompiledSaw.
+
+Execution policies:
+  - Tool nodes may declare a timeout, retries with jittered backoff and a
+    per-tool circuit breaker (see resilience.py). Every attempt gets its
+    own log row; RunSummary.node_timings splits each node's time into the
+    successful call, failed attempts and backoff.
 """
 
 from __future__ import annotations
 
 import sqlite3
+import threading
 import time
 import json
 import hashlib
+import heapq
+from collections import OrderedDict
+from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from models import Decision, LogEntry, RunContext, ToolResult
 from policy import policy_check, policy_from_spec, INFRA_TOOLS
 from tools import TOOL_REGISTRY
+from tool_cache import ToolCache
+from resilience import (
+    CIRCUIT_BREAKERS,
+    Attempt,
+    CircuitBreakerRegistry,
+    ExecutionPolicy,
+    NodeExecution,
+    execution_policy_for,
+    run_tool,
+)
 from logger import (
-    write_log,
+    RunLogWriter,
     upsert_run_start,
-    update_run_approval,
     update_run_status,
-    write_llm_invocation,
+    get_run_record,
+    get_checkpoints,
+    get_allowed_nodes,
 )
 
 
@@ -47,6 +89,13 @@ class RunSummary:
     node_results: dict[str, Any] = field(default_factory=dict)
     final_outputs: dict[str, Any] = field(default_factory=dict)
     denial_reason: str | None = None
+    critical_path_ms: float = 0.0        # longest latency-weighted path through committed nodes
+    critical_path: list[str] = field(default_factory=list)
+    wall_time_ms: float = 0.0
+    resumed_nodes: list[str] = field(default_factory=list)  # restored from checkpoints, not re-run
+    retry_wait_ms: float = 0.0           # backoff slept between attempts
+    failed_attempt_ms: float = 0.0       # time spent in attempts that timed out or raised
+    node_timings: dict[str, dict] = field(default_factory=dict)  # per tool node: attempts, tool/failed/backoff ms
 
 def compute_policy_hash(policy_bundle: dict) -> str:
     canonical = json.dumps(policy_bundle, sort_keys=True, separators=(",", ":"))
@@ -55,16 +104,18 @@ def compute_policy_hash(policy_bundle: dict) -> str:
 # ── Log helper ─────────────────────────────────────────────────────
 
 def _log_event(
-    conn: sqlite3.Connection,
+    log: RunLogWriter,
     ctx: RunContext,
     node_id: str,
     decision: str,
     tool_name: str = "",
     latency_ms: float = 0.0,
     error: str | None = None,
+    cache_hit: bool = False,
+    attempt: int = 1,
 ) -> None:
-    """Write a fully-populated LogEntry. Used for start/end/approval/errors."""
-    write_log(conn, LogEntry(
+    """Buffer a fully-populated LogEntry on the run's writer."""
+    log.append(LogEntry(
         run_id=ctx.run_id,
         saw_id=ctx.saw_id,
         node_id=node_id,
@@ -72,36 +123,80 @@ def _log_event(
         decision=decision,
         latency_ms=latency_ms,
         error=error,
+        cache_hit=cache_hit,
+        attempt=attempt,
     ))
 
 
 # ── Graph helpers ──────────────────────────────────────────────────
 
-def _build_graph(saw_spec: dict) -> tuple[dict[str, dict], dict[str, str]]:
+def _build_graph(saw_spec: dict) -> tuple[dict[str, dict], dict[str, list[str]], dict[str, list[str]]]:
     """
     Returns:
-        node_map:  {node_id: node_dict}
-        adjacency: {from_node_id: to_node_id}  (exactly one outgoing edge)
+        node_map:     {node_id: node_dict}
+        successors:   {node_id: [to_node_id, ...]}
+        predecessors: {node_id: [from_node_id, ...]}
 
-    Raises NotImplementedError if any node has >1 outgoing edge.
+    Raises ValueError on edges to unknown nodes.
     """
     nodes = saw_spec["graph"]["nodes"]
     edges = saw_spec["graph"]["edges"]
 
     node_map: dict[str, dict] = {n["id"]: n for n in nodes}
+    successors: dict[str, list[str]] = {nid: [] for nid in node_map}
+    predecessors: dict[str, list[str]] = {nid: [] for nid in node_map}
 
-    adjacency: dict[str, str] = {}
     for edge in edges:
         src = edge["from"]
         dst = edge["to"]
-        if src in adjacency:
-            raise NotImplementedError(
-                f"Node '{src}' has >1 outgoing edge. "
-                f"Branching graphs are not supported in V1."
-            )
-        adjacency[src] = dst
+        for nid in (src, dst):
+            if nid not in node_map:
+                raise ValueError(f"Edge {src} -> {dst} references unknown node '{nid}'")
+        successors[src].append(dst)
+        predecessors[dst].append(src)
+
+    return node_map, successors, predecessors
+
 
-    return node_map, adjacency
+def _topological_order(
+    node_map: dict[str, dict],
+    successors: dict[str, list[str]],
+    predecessors: dict[str, list[str]],
+    start_id: str,
+) -> list[str]:
+    """
+    Kahn's algorithm over the nodes reachable from start, breaking ties by
+    spec position so the commit (and log) order is deterministic.
+
+    Raises ValueError if the reachable graph has a cycle.
+    """
+    reachable = {start_id}
+    stack = [start_id]
+    while stack:
+        for nxt in successors[stack.pop()]:
+            if nxt not in reachable:
+                reachable.add(nxt)
+                stack.append(nxt)
+
+    position = {nid: idx for idx, nid in enumerate(node_map)}
+    remaining = {
+        nid: sum(1 for p in predecessors[nid] if p in reachable) for nid in reachable
+    }
+    ready = [(position[nid], nid) for nid, count in remaining.items() if count == 0]
+    heapq.heapify(ready)
+    order: list[str] = []
+    while ready:
+        _, nid = heapq.heappop(ready)
+        order.append(nid)
+        for nxt in successors[nid]:
+            remaining[nxt] -= 1
+            if remaining[nxt] == 0:
+                heapq.heappush(ready, (position[nxt], nxt))
+
+    if len(order) != len(reachable):
+        stuck = sorted(set(reachable) - set(order), key=position.get)
+        raise ValueError(f"SAW graph has a cycle through: {stuck}")
+    return order
 
 
 def _find_start_node(node_map: dict[str, dict]) -> str:
@@ -112,6 +207,36 @@ def _find_start_node(node_map: dict[str, dict]) -> str:
     return starts[0]
 
 
+def _critical_path(
+    order: list[str],
+    predecessors: dict[str, list[str]],
+    latencies: dict[str, float],
+) -> tuple[float, list[str]]:
+    """Longest latency-weighted path through the committed nodes."""
+    finish: dict[str, float] = {}
+    via: dict[str, str | None] = {}
+    for nid in order:
+        if nid not in latencies:
+            continue
+        best_prev = None
+        best = 0.0
+        for prev in predecessors[nid]:
+            if prev in finish and (best_prev is None or finish[prev] > best):
+                best_prev, best = prev, finish[prev]
+        finish[nid] = best + latencies[nid]
+        via[nid] = best_prev
+    if not finish:
+        return 0.0, []
+    # Latest node on ties, so zero-latency tails (e.g. the end node) are kept.
+    tail = max(reversed(list(finish)), key=lambda nid: finish[nid])
+    path = []
+    node: str | None = tail
+    while node is not None:
+        path.append(node)
+        node = via[node]
+    return round(finish[tail], 2), path[::-1]
+
+
 # ── Default input resolver (Board Metrics golden path) ─────────────
 
 def default_input_resolver(
@@ -127,7 +252,7 @@ def default_input_resolver(
     if node_id == "n_salesforce_pull":
         return {"date_range": "2025-Q1", "segment": "enterprise"}
 
-    if node_id == "n_stripe_pull" and "n_salesforce_pull" in ctx.state:
+    if node_id == "n_stripe_pull":
         return {"date_range": "2025-Q1", "currency": "usd"}
 
     if node_id == "n_reconcile" and "n_salesforce_pull" in ctx.state:
@@ -228,69 +353,72 @@ def _handle_approval_gate(
 
 # ── Node executor ──────────────────────────────────────────────────
 
-def _execute_tool_node(
-    conn: sqlite3.Connection,
+def _check_tool_node(
     ctx: RunContext,
     node: dict,
     policy: dict,
-) -> tuple[ToolResult, float]:
+) -> str | None:
     """
-    Policy check → tool execution → log.
-
-    Returns (ToolResult, latency_ms).
-    On policy deny or missing tool, latency_ms is 0.0.
+    Policy check + registry lookup for a tool node whose inputs have been
+    stashed in ctx.state. Returns an error message, or None if it may run.
     """
     tool_name = node["tool"]
-    node_id = node["id"]
-    is_write = node.get("write_action", False)
-
-    # Resolve tool inputs from accumulated state
-    tool_inputs = ctx.state.get(f"_inputs_{node_id}", {})
+    tool_inputs = ctx.state.get(f"_inputs_{node['id']}", {})
 
     # ── Policy check (skip infra tools) ───────────────────────────
     if tool_name not in INFRA_TOOLS:
         pd = policy_check(
             tool_name, tool_inputs, ctx,
-            is_write=is_write, policy=policy,
+            is_write=node.get("write_action", False), policy=policy,
         )
         if pd.decision == Decision.DENY:
-            error_msg = f"Policy denied: {'; '.join(pd.reasons)}"
-            _log_event(
-                conn, ctx, node_id,
-                decision="deny",
-                tool_name=tool_name,
-                latency_ms=0.0,
-                error=error_msg,
-            )
-            return (
-                ToolResult(tool_name=tool_name, success=False, error=error_msg),
-                0.0,
-            )
+            return f"Policy denied: {'; '.join(pd.reasons)}"
 
     # ── Resolve tool function ─────────────────────────────────────
     if tool_name not in TOOL_REGISTRY:
-        error_msg = f"Tool '{tool_name}' not found in TOOL_REGISTRY"
+        return f"Tool '{tool_name}' not found in TOOL_REGISTRY"
+    return None
+
+
+def _invoke_tool(
+    node: dict,
+    exec_policy: ExecutionPolicy,
+    tool_inputs: dict,
+    ctx: RunContext,
+    breakers: CircuitBreakerRegistry = CIRCUIT_BREAKERS,
+) -> NodeExecution:
+    """Run one tool under its execution policy. Safe to call from a worker thread (no DB access)."""
+    tool_name = node["tool"]
+    return run_tool(TOOL_REGISTRY[tool_name], tool_name, tool_inputs, ctx, exec_policy, breakers=breakers)
+
+
+def _record_tool_node(
+    log: RunLogWriter,
+    ctx: RunContext,
+    node: dict,
+    execution: NodeExecution,
+    cache_hit: bool = False,
+) -> None:
+    """LLM invocation record (if any) + one log row per attempt for a tool node that ran or hit the cache."""
+    tool_name = node["tool"]
+    node_id = node["id"]
+    result = execution.result
+    attempts = execution.attempts or [Attempt(1, execution.total_ms, "ok", result.error)]
+    for attempt in attempts[:-1]:
         _log_event(
-            conn, ctx, node_id,
-            decision="deny",
+            log, ctx, node_id,
+            decision="allow",
             tool_name=tool_name,
-            latency_ms=0.0,
-            error=error_msg,
-        )
-        return (
-            ToolResult(tool_name=tool_name, success=False, error=error_msg),
-            0.0,
+            latency_ms=attempt.latency_ms,
+            error=attempt.error,
+            attempt=attempt.number,
         )
+    final = attempts[-1]
 
-    # ── Execute tool ──────────────────────────────────────────────
-    t0 = time.perf_counter()
-    result = TOOL_REGISTRY[tool_name](tool_inputs, ctx)
-    if result.success and tool_name == "tool_generate_summary_llm":
+    if result.success and not cache_hit and tool_name == "tool_generate_summary_llm":
         data = result.data if isinstance(result.data, dict) else {}
         llm_meta = data.get("llm_meta", {})
-        write_llm_invocation(
-            conn=conn,
-            run_id=ctx.run_id,
+        log.llm_invocation(
             node_id=node_id,
             invoked_at=datetime.now(timezone.utc).isoformat(),
             provider=llm_meta.get("provider"),
@@ -302,50 +430,183 @@ def _execute_tool_node(
             sanitized_prompt_input=data.get("sanitized_prompt_input", {}),
             llm_output_text=data.get("llm_output_text", ""),
         )
-    latency_ms = round((time.perf_counter() - t0) * 1000, 2)
 
-    # ── Log ───────────────────────────────────────────────────────
     _log_event(
-        conn, ctx, node_id,
-        decision="allow",
+        log, ctx, node_id,
+        decision="deny" if final.outcome == "circuit_open" else "allow",
         tool_name=tool_name,
-        latency_ms=latency_ms,
+        latency_ms=final.latency_ms,
         error=result.error,
+        cache_hit=cache_hit,
+        attempt=final.number,
     )
-    return result, latency_ms
+
+
+def _execute_tool_node(
+    log: RunLogWriter,
+    ctx: RunContext,
+    node: dict,
+    policy: dict,
+    exec_policy: ExecutionPolicy | None = None,
+) -> tuple[ToolResult, float]:
+    """
+    Policy check → tool execution → log, on the calling thread (timed
+    attempts run on the resilience worker pool).
+
+    Returns (ToolResult, latency_ms), latency including retries and backoff.
+    On policy deny or missing tool, latency_ms is 0.0.
+    """
+    error_msg = _check_tool_node(ctx, node, policy)
+    if error_msg is not None:
+        _log_event(
+            log, ctx, node["id"],
+            decision="deny",
+            tool_name=node["tool"],
+            latency_ms=0.0,
+            error=error_msg,
+        )
+        return ToolResult(tool_name=node["tool"], success=False, error=error_msg), 0.0
+
+    execution = _invoke_tool(
+        node, exec_policy or ExecutionPolicy(), ctx.state.get(f"_inputs_{node['id']}", {}), ctx,
+    )
+    _record_tool_node(log, ctx, node, execution)
+    return execution.result, execution.total_ms
+
+
+# ── Compiled SAW ───────────────────────────────────────────────────
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+@dataclass(frozen=True)
+class CompiledSaw:
+    """
+    Everything a run derives from its spec, computed once. Treat every
+    field as read-only: plans are shared between runs and threads.
+    """
+    spec: dict
+    spec_json: str                       # canonical JSON, stored on runs.saw_spec
+    spec_hash: str                       # sha256 of spec_json; the plan cache key
+    node_map: dict[str, dict]
+    successors: dict[str, list[str]]
+    predecessors: dict[str, list[str]]
+    start_id: str
+    order: tuple[str, ...]               # commit order (topological, ties by spec position)
+    policy: Mapping[str, Any]            # policy_from_spec, allow/deny lists frozen
+    policy_hash: str
+    policy_version: str
+    policy_snapshot: str
+    exec_policies: dict[str, ExecutionPolicy]
+
+    @property
+    def saw_id(self) -> str:
+        return self.spec.get("saw_id", "")
+
+
+_COMPILED_CACHE_SIZE = 128
+_compiled_cache: OrderedDict[str, CompiledSaw] = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def _compile(spec: dict, spec_json: str, spec_hash: str) -> CompiledSaw:
+    node_map, successors, predecessors = _build_graph(spec)
+    start_id = _find_start_node(node_map)
+    order = _topological_order(node_map, successors, predecessors, start_id)
+
+    policy = policy_from_spec(spec)
+    policy["tool_allowlist"] = frozenset(policy["tool_allowlist"])
+    policy["tool_denylist"] = frozenset(policy["tool_denylist"])
+
+    policy_bundle = spec.get("policy_bundle", {})
+    policy_snapshot = _canonical_json(policy_bundle)
+    return CompiledSaw(
+        spec=spec,
+        spec_json=spec_json,
+        spec_hash=spec_hash,
+        node_map=node_map,
+        successors=successors,
+        predecessors=predecessors,
+        start_id=start_id,
+        order=tuple(order),
+        policy=MappingProxyType(policy),
+        # Same canonical form as compute_policy_hash, hashed once.
+        policy_hash=hashlib.sha256(policy_snapshot.encode("utf-8")).hexdigest(),
+        policy_version=policy_bundle.get("policy_id", "unknown"),
+        policy_snapshot=policy_snapshot,
+        exec_policies={
+            node_id: execution_policy_for(spec, node)
+            for node_id, node in node_map.items()
+            if node["type"] == "tool_call"
+        },
+    )
+
+
+def compile_saw(saw_spec: dict | CompiledSaw) -> CompiledSaw:
+    """
+    Validate a SAW spec and precompute its run plan. Plans are cached by
+    spec content hash, so recompiling an identical spec costs one
+    canonical dump + hash. Raises ValueError on an invalid graph.
+    """
+    if isinstance(saw_spec, CompiledSaw):
+        return saw_spec
+    spec_json = _canonical_json(saw_spec)
+    spec_hash = hashlib.sha256(spec_json.encode("utf-8")).hexdigest()
+    with _compiled_lock:
+        plan = _compiled_cache.get(spec_hash)
+        if plan is not None:
+            _compiled_cache.move_to_end(spec_hash)
+            return plan
+
+    # The plan keeps its own copy, so later edits to the caller's dict can't leak in.
+    plan = _compile(json.loads(spec_json), spec_json, spec_hash)
+    with _compiled_lock:
+        _compiled_cache[spec_hash] = plan
+        while len(_compiled_cache) > _COMPILED_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    return plan
 
 
 # ── Engine ─────────────────────────────────────────────────────────
 
 def run_saw(
-    saw_spec: dict,
+    saw_spec: dict | CompiledSaw,
     ctx: RunContext,
     conn: sqlite3.Connection,
     input_resolver: callable | None = None,
+    max_parallel: int = 4,
+    tool_cache: ToolCache | None = None,
+    circuit_breakers: CircuitBreakerRegistry | None = None,
 ) -> RunSummary:
     """
-    Walk the SAW graph linearly, executing each node.
+    Walk the SAW DAG, executing each node.
 
     Args:
-        saw_spec:       Parsed SAW spec dict.
+        saw_spec:       Parsed SAW spec dict, or a CompiledSaw from
+                        compile_saw() (skips validation/hashing per run).
         ctx:            RunContext (mutable — accumulates state).
         conn:           SQLite connection for logging.
         input_resolver: Optional callable(node_id, node, ctx) -> dict
                         that returns tool inputs for a given node.
                         If None, uses default_input_resolver (Board Metrics
-                        golden path wiring).
+                        golden path wiring). Always called on this thread,
+                        after all of the node's predecessors have committed.
+        max_parallel:   Tool calls allowed in flight at once. 1 runs every
+                        node inline, in commit order.
+        tool_cache:     Memoization for tools opted in via
+                        tools.TOOL_CACHE_POLICY. Defaults to a cache backed
+                        only by this connection's DB; pass a long-lived
+                        ToolCache to add an in-process tier, or
+                        ToolCache(policy={}) to disable caching.
+        circuit_breakers: Breaker registry for nodes whose execution_policy
+                        declares a circuit_breaker. Defaults to the
+                        process-wide resilience.CIRCUIT_BREAKERS.
 
     Returns:
         RunSummary with timing, outputs, and status.
     """
-    node_map, adjacency = _build_graph(saw_spec)
-    policy = policy_from_spec(saw_spec)
-    start_id = _find_start_node(node_map)
-    resolver = input_resolver if input_resolver is not None else default_input_resolver
-    policy_bundle = saw_spec.get("policy_bundle", {})
-    policy_hash = compute_policy_hash(policy_bundle)
-    policy_version = policy_bundle.get("policy_id", "unknown")
-    policy_snapshot = json.dumps(policy_bundle, sort_keys=True, separators=(",", ":"))
+    plan = compile_saw(saw_spec)  # validate before recording the run
 
     upsert_run_start(
         conn=conn,
@@ -353,10 +614,92 @@ def run_saw(
         saw_id=ctx.saw_id,
         started_at=datetime.now(timezone.utc).isoformat(),
         status="running",
-        policy_hash=policy_hash,
-        policy_version=policy_version,
-        policy_snapshot=policy_snapshot,
+        policy_hash=plan.policy_hash,
+        policy_version=plan.policy_version,
+        policy_snapshot=plan.policy_snapshot,
+        saw_spec=plan.spec_json,
     )
+    return _execute_saw(plan, ctx, conn, input_resolver, max_parallel, tool_cache, circuit_breakers, restored={})
+
+
+def resume_saw(
+    run_id: str,
+    conn: sqlite3.Connection,
+    state: dict[str, Any] | None = None,
+    saw_spec: dict | CompiledSaw | None = None,
+    input_resolver: callable | None = None,
+    max_parallel: int = 4,
+    tool_cache: ToolCache | None = None,
+    circuit_breakers: CircuitBreakerRegistry | None = None,
+) -> RunSummary:
+    """
+    Continue a run that stopped before its end node (denied at an approval
+    gate, failed, or interrupted).
+
+    Nodes the log records as allowed are not re-run: tool nodes get their
+    outputs back from the run's checkpoints, and the walk picks up at the
+    first node that had not gone through (typically the approval gate, now
+    re-evaluated with `state`, e.g. {"_approval_granted": True}). New log
+    rows extend the run's existing hash chain.
+
+    Args:
+        run_id:    Run to resume.
+        conn:      SQLite connection holding the run.
+        state:     Extra ctx.state for the resumed walk (approval flags etc.).
+        saw_spec:  Spec to resume with; defaults to the one stored at run start.
+    """
+    record = get_run_record(conn, run_id)
+    if record is None:
+        raise ValueError(f"Unknown run '{run_id}'")
+    if record["status"] == "completed":
+        raise ValueError(f"Run '{run_id}' already completed")
+    if saw_spec is None:
+        if not record.get("saw_spec"):
+            raise ValueError(f"Run '{run_id}' has no stored SAW spec; pass saw_spec")
+        saw_spec = json.loads(record["saw_spec"])
+
+    plan = compile_saw(saw_spec)
+    node_map = plan.node_map
+    checkpoints = get_checkpoints(conn, run_id)
+    restored: dict[str, tuple[dict, float]] = {}
+    for node_id in get_allowed_nodes(conn, run_id):
+        node = node_map.get(node_id)
+        if node is None or node["type"] == "approval_gate":
+            continue  # gates are always re-decided on resume
+        if node["type"] == "tool_call":
+            if node_id not in checkpoints:
+                continue
+            restored[node_id] = checkpoints[node_id]
+        else:
+            restored[node_id] = ({}, 0.0)
+
+    ctx = RunContext(run_id=run_id, saw_id=record["saw_id"], state=dict(state or {}))
+    update_run_status(conn, run_id, "running")
+    return _execute_saw(plan, ctx, conn, input_resolver, max_parallel, tool_cache, circuit_breakers, restored=restored)
+
+
+def _execute_saw(
+    plan: CompiledSaw,
+    ctx: RunContext,
+    conn: sqlite3.Connection,
+    input_resolver: callable | None,
+    max_parallel: int,
+    tool_cache: ToolCache | None,
+    circuit_breakers: CircuitBreakerRegistry | None,
+    restored: dict[str, tuple[dict, float]],
+) -> RunSummary:
+    """Shared walk for run_saw/resume_saw. `restored` nodes are replayed from checkpoints."""
+    node_map, successors, predecessors = plan.node_map, plan.successors, plan.predecessors
+    policy = plan.policy
+    order = plan.order
+    exec_policies = plan.exec_policies
+    resolver = input_resolver if input_resolver is not None else default_input_resolver
+    cache = tool_cache if tool_cache is not None else ToolCache(max_memory_entries=0)
+    breakers = circuit_breakers if circuit_breakers is not None else CIRCUIT_BREAKERS
+
+    # Log rows, checkpoints and run updates are buffered and committed at
+    # approval gates and at run end; until then the run record says "running".
+    log = RunLogWriter(conn, ctx.run_id)
 
     summary = RunSummary(
         run_id=ctx.run_id,
@@ -364,93 +707,237 @@ def run_saw(
         status="running",
     )
 
-    current_id = start_id
+    wall_t0 = time.perf_counter()
+    committed: set[str] = set()
+    latencies: dict[str, float] = {}
+    # node_id -> Future[NodeExecution] or a policy/registry error string
+    launched: dict[str, Future | str] = {}
+    cache_hits: set[str] = set()
     last_tool_result: ToolResult | None = None
+    pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix=f"saw-{ctx.run_id}") if max_parallel > 1 else None
+
+    def prepare(node_id: str) -> str | None:
+        """Resolve inputs + policy check; returns an error or None."""
+        node = node_map[node_id]
+        ctx.state[f"_inputs_{node_id}"] = resolver(node_id, node, ctx)
+        return _check_tool_node(ctx, node, policy)
+
+    def from_cache(node_id: str) -> Future | None:
+        """Completed future for a memoized tool result, or None on a miss."""
+        node = node_map[node_id]
+        t0 = time.perf_counter()
+        data = cache.get(conn, node["tool"], ctx.state[f"_inputs_{node_id}"])
+        if data is None:
+            return None
+        cache_hits.add(node_id)
+        hit: Future = Future()
+        hit.set_result(NodeExecution(
+            ToolResult(tool_name=node["tool"], success=True, data=data),
+            total_ms=round((time.perf_counter() - t0) * 1000, 3),
+        ))
+        return hit
+
+    def execute(node_id: str) -> NodeExecution:
+        """Run a prepared tool node; an identical call already in flight in another run may be shared."""
+        node = node_map[node_id]
+        tool_inputs = ctx.state[f"_inputs_{node_id}"]
+        execution, shared = cache.run_once(
+            node["tool"], tool_inputs,
+            lambda: _invoke_tool(node, exec_policies[node_id], tool_inputs, ctx, breakers),
+            shareable=lambda e: e.result.success,
+        )
+        if not shared:
+            return execution
+        cache_hits.add(node_id)
+        return NodeExecution(
+            ToolResult(tool_name=node["tool"], success=True, data=deepcopy(execution.result.data)),
+            total_ms=execution.total_ms,
+        )
 
-    while True:
-        node = node_map[current_id]
-        node_type = node["type"]
-
-        # ── START ─────────────────────────────────────────────────
-        if node_type == "start":
-            _log_event(conn, ctx, current_id, decision="allow")
-
-        # ── END ───────────────────────────────────────────────────
-        elif node_type == "end":
-            _log_event(conn, ctx, current_id, decision="allow")
-            summary.status = "completed"
-            if last_tool_result and last_tool_result.success:
-                summary.final_outputs = last_tool_result.data
-            break
-
-        # ── APPROVAL GATE ─────────────────────────────────────────
-        elif node_type == "approval_gate":
-            approved, wait_ms, error = _handle_approval_gate(ctx, node, saw_spec)
-            approved_by = ctx.state.get("_approved_by")
-            approval_note = ctx.state.get("_approval_note")
-            approved_at = datetime.now(timezone.utc).isoformat() if approved else None
-
-            update_run_approval(
-                conn=conn,
-                run_id=ctx.run_id,
-                approved_by=approved_by,
-                approved_at=approved_at,
-                approval_note=approval_note,
-            )
-
-            summary.human_wait_time_ms += wait_ms
-
-            _log_event(
-                conn, ctx, current_id,
-                decision="allow" if approved else "deny",
-                latency_ms=wait_ms,
-                error=error,
-            )
-
-            if not approved:
-                summary.status = "denied"
-                summary.denial_reason = error or "Approval denied"
+    def launch_ready(after: int) -> None:
+        """Start read-only tool nodes later in the order whose inputs are final."""
+        in_flight = sum(1 for f in launched.values() if isinstance(f, Future) and not f.done())
+        for node_id in order[after + 1:]:
+            if in_flight >= max_parallel:
+                return
+            node = node_map[node_id]
+            if (
+                node_id in launched
+                or node_id in restored
+                or node["type"] != "tool_call"
+                or node.get("write_action", False)
+                or not all(p in committed for p in predecessors[node_id])
+            ):
+                continue
+            error_msg = prepare(node_id)
+            if error_msg is not None:
+                launched[node_id] = error_msg
+                continue
+            hit = from_cache(node_id)
+            if hit is not None:
+                launched[node_id] = hit
+                continue
+            launched[node_id] = pool.submit(execute, node_id)
+            in_flight += 1
+
+    try:
+        for idx, current_id in enumerate(order):
+            node = node_map[current_id]
+            node_type = node["type"]
+
+            # ── ALREADY DONE (resume) ─────────────────────────────
+            if current_id in restored:
+                data, latency_ms = restored[current_id]
+                if node_type == "tool_call":
+                    ctx.state[current_id] = data
+                    summary.node_results[current_id] = data
+                    last_tool_result = ToolResult(tool_name=node["tool"], success=True, data=data)
+                    summary.system_time_ms += latency_ms
+                summary.resumed_nodes.append(current_id)
+                latencies[current_id] = latency_ms
+
+            # ── START ─────────────────────────────────────────────
+            elif node_type == "start":
+                _log_event(log, ctx, current_id, decision="allow")
+                latencies[current_id] = 0.0
+
+            # ── END ───────────────────────────────────────────────
+            elif node_type == "end":
+                _log_event(log, ctx, current_id, decision="allow")
+                latencies[current_id] = 0.0
+                summary.status = "completed"
+                if last_tool_result and last_tool_result.success:
+                    summary.final_outputs = last_tool_result.data
                 break
 
-        # ── TOOL CALL ─────────────────────────────────────────────
-        elif node_type == "tool_call":
-            # Resolve inputs via resolver → stash for _execute_tool_node
-            ctx.state[f"_inputs_{current_id}"] = resolver(current_id, node, ctx)
-
-            result, latency_ms = _execute_tool_node(conn, ctx, node, policy)
-            summary.node_results[current_id] = (
-                result.data if result.success else result.error
-            )
+            # ── APPROVAL GATE ─────────────────────────────────────
+            elif node_type == "approval_gate":
+                approved, wait_ms, error = _handle_approval_gate(ctx, node, plan.spec)
+                approved_by = ctx.state.get("_approved_by")
+                approval_note = ctx.state.get("_approval_note")
+                approved_at = datetime.now(timezone.utc).isoformat() if approved else None
+
+                log.update_approval(
+                    approved_by=approved_by,
+                    approved_at=approved_at,
+                    approval_note=approval_note,
+                )
 
-            if not result.success:
-                summary.status = "denied"
-                summary.denial_reason = result.error
-                break
+                summary.human_wait_time_ms += wait_ms
+                latencies[current_id] = wait_ms
 
-            # Accumulate outputs + system time
-            ctx.state[current_id] = result.data
-            last_tool_result = result
-            summary.system_time_ms += latency_ms
+                _log_event(
+                    log, ctx, current_id,
+                    decision="allow" if approved else "deny",
+                    latency_ms=wait_ms,
+                    error=error,
+                )
+                # Make everything up to the human decision durable.
+                log.flush()
+
+                if not approved:
+                    summary.status = "denied"
+                    summary.denial_reason = error or "Approval denied"
+                    break
+
+            # ── TOOL CALL ─────────────────────────────────────────
+            elif node_type == "tool_call":
+                pending = launched.pop(current_id, None)
+                if pending is None:
+                    pending = prepare(current_id)
+                    if pending is None:
+                        pending = from_cache(current_id)
+                if isinstance(pending, str):
+                    _log_event(
+                        log, ctx, current_id,
+                        decision="deny",
+                        tool_name=node["tool"],
+                        latency_ms=0.0,
+                        error=pending,
+                    )
+                    result, latency_ms = ToolResult(tool_name=node["tool"], success=False, error=pending), 0.0
+                else:
+                    if pending is None:
+                        execution = execute(current_id)
+                    else:
+                        execution = pending.result()
+                    result, latency_ms = execution.result, execution.total_ms
+                    cache_hit = current_id in cache_hits
+                    _record_tool_node(log, ctx, node, execution, cache_hit=cache_hit)
+                    attempts = execution.attempts
+                    timing = {
+                        "attempts": len(attempts),
+                        "tool_ms": attempts[-1].latency_ms if attempts else 0.0,
+                        "failed_attempts_ms": round(sum(a.latency_ms for a in attempts[:-1]), 2),
+                        "backoff_ms": round(sum(a.backoff_ms for a in attempts), 2),
+                        "total_ms": latency_ms,
+                        "cache_hit": cache_hit,
+                    }
+                    summary.node_timings[current_id] = timing
+                    summary.failed_attempt_ms += timing["failed_attempts_ms"]
+                    summary.retry_wait_ms += timing["backoff_ms"]
+                    if result.success and not cache_hit and cache.cacheable(node["tool"]):
+                        cache.remember(node["tool"], ctx.state[f"_inputs_{current_id}"], result.data)
+                        log.defer(
+                            cache.put,
+                            tool_name=node["tool"],
+                            tool_inputs=ctx.state[f"_inputs_{current_id}"],
+                            data=result.data,
+                        )
+
+                summary.node_results[current_id] = (
+                    result.data if result.success else result.error
+                )
 
-        else:
-            raise ValueError(
-                f"Unknown node type '{node_type}' at node '{current_id}'"
-            )
+                if not result.success:
+                    gave_up = not isinstance(pending, str) and execution.gave_up
+                    summary.status = "error" if gave_up else "denied"
+                    summary.denial_reason = result.error
+                    break
+
+                # Accumulate outputs + system time
+                log.checkpoint(current_id, result.data, latency_ms)
+                ctx.state[current_id] = result.data
+                last_tool_result = result
+                summary.system_time_ms += latency_ms
+                latencies[current_id] = latency_ms
+
+            else:
+                raise ValueError(
+                    f"Unknown node type '{node_type}' at node '{current_id}'"
+                )
 
-        # ── Advance to next node ──────────────────────────────────
-        if current_id not in adjacency:
-            if node_type != "end":
+            committed.add(current_id)
+            if not successors[current_id]:
                 summary.status = "error"
                 summary.denial_reason = (
                     f"No outgoing edge from node '{current_id}'"
                 )
-            break
-        current_id = adjacency[current_id]
-
+                break
+            if pool is not None:
+                launch_ready(idx)
+    except BaseException:
+        # Keep what was logged so far; the run stays visibly incomplete.
+        log.update_status("incomplete")
+        try:
+            log.flush()
+        except sqlite3.Error:
+            pass
+        raise
+    finally:
+        if pool is not None:
+            # Work started ahead of a failure is discarded, never logged.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    summary.wall_time_ms = round((time.perf_counter() - wall_t0) * 1000, 2)
+    summary.critical_path_ms, summary.critical_path = _critical_path(order, predecessors, latencies)
     summary.system_time_ms = round(summary.system_time_ms, 2)
     summary.human_wait_time_ms = round(summary.human_wait_time_ms, 2)
+    summary.retry_wait_ms = round(summary.retry_wait_ms, 2)
+    summary.failed_attempt_ms = round(summary.failed_attempt_ms, 2)
     summary.total_time_ms = round(
         summary.system_time_ms + summary.human_wait_time_ms, 2
     )
-    update_run_status(conn, ctx.run_id, summary.status)
+    log.update_status(summary.status)
+    log.flush()
     return summary
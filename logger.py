@@ -10,6 +10,7 @@ import json
 import hashlib
 from pathlib import Path
 
+from blob_store import get_blob_text, put_blob
 from models import LogEntry
 
 DEFAULT_DB_PATH = Path("surfit_runs.db")
@@ -42,11 +43,15 @@ CREATE TABLE IF NOT EXISTS execution_log (
     latency_ms      REAL    NOT NULL DEFAULT 0.0,
     prev_hash       TEXT    NOT NULL DEFAULT 'GENESIS',
     event_hash      TEXT    NOT NULL DEFAULT '',
-    error           TEXT
+    error           TEXT,
+    cache_hit       INTEGER NOT NULL DEFAULT 0,
+    attempt         INTEGER NOT NULL DEFAULT 1
 );
 
 CREATE INDEX IF NOT EXISTS idx_run_id ON execution_log(run_id);
+CREATE INDEX IF NOT EXISTS idx_run_chain ON execution_log(run_id, timestamp_iso, id);
 CREATE INDEX IF NOT EXISTS idx_saw_id ON execution_log(saw_id);
+CREATE INDEX IF NOT EXISTS idx_tool_latency ON execution_log(tool_name, latency_ms);
 
 CREATE TABLE IF NOT EXISTS runs (
     run_id           TEXT PRIMARY KEY,
@@ -58,7 +63,8 @@ CREATE TABLE IF NOT EXISTS runs (
     policy_snapshot  TEXT,
     approved_by      TEXT,
     approved_at      TEXT,
-    approval_note    TEXT
+    approval_note    TEXT,
+    saw_spec         TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
@@ -76,14 +82,49 @@ CREATE TABLE IF NOT EXISTS llm_invocations (
     raw_tool_input_hash          TEXT,
     sanitized_prompt_input_hash  TEXT,
     llm_output_text_hash         TEXT,
-    raw_tool_input_preview       TEXT,
-    llm_output_preview           TEXT
+    raw_tool_input_preview       TEXT,                -- legacy rows only; full payloads are blobs
+    llm_output_preview           TEXT,
+    raw_tool_input_blob          TEXT,                -- blobs.hash of the canonical raw tool input
+    sanitized_prompt_input_blob  TEXT,
+    llm_output_blob              TEXT
 );
 
 CREATE INDEX IF NOT EXISTS idx_llm_run_id ON llm_invocations(run_id);
 CREATE INDEX IF NOT EXISTS idx_llm_node_id ON llm_invocations(node_id);
 CREATE INDEX IF NOT EXISTS idx_llm_invoked_at ON llm_invocations(invoked_at);
 
+-- Content-addressed payloads (blob_store); zlib-compressed when that helps.
+CREATE TABLE IF NOT EXISTS blobs (
+    hash      TEXT PRIMARY KEY,
+    encoding  TEXT    NOT NULL,
+    size      INTEGER NOT NULL,
+    data      BLOB    NOT NULL
+);
+
+-- Content-addressed tool outputs; identical outputs are stored once.
+CREATE TABLE IF NOT EXISTS node_outputs (
+    content_hash  TEXT PRIMARY KEY,
+    data_json     TEXT NOT NULL
+);
+
+-- Memoized tool results (tool_cache.ToolCache); outputs live in node_outputs.
+CREATE TABLE IF NOT EXISTS tool_cache (
+    cache_key     TEXT PRIMARY KEY,
+    tool_name     TEXT NOT NULL,
+    content_hash  TEXT NOT NULL,
+    created_at    REAL NOT NULL,
+    expires_at    REAL
+);
+
+CREATE TABLE IF NOT EXISTS run_checkpoints (
+    run_id        TEXT NOT NULL,
+    node_id       TEXT NOT NULL,
+    content_hash  TEXT NOT NULL,
+    latency_ms    REAL NOT NULL DEFAULT 0.0,
+    created_at    TEXT NOT NULL,
+    PRIMARY KEY (run_id, node_id)
+);
+
 """
 
 def _ensure_runs_columns(conn: sqlite3.Connection) -> None:
@@ -98,6 +139,7 @@ def _ensure_runs_columns(conn: sqlite3.Connection) -> None:
         "approved_by": "TEXT",
         "approved_at": "TEXT",
         "approval_note": "TEXT",
+        "saw_spec": "TEXT",
     }
     for col, sql_type in required.items():
         if col not in cols:
@@ -107,23 +149,67 @@ def _ensure_execution_log_columns(conn: sqlite3.Connection) -> None:
     required = {
         "prev_hash": "TEXT NOT NULL DEFAULT 'GENESIS'",
         "event_hash": "TEXT NOT NULL DEFAULT ''",
+        "cache_hit": "INTEGER NOT NULL DEFAULT 0",
+        "attempt": "INTEGER NOT NULL DEFAULT 1",
     }
     for col, sql_type in required.items():
         if col not in cols:
             conn.execute(f"ALTER TABLE execution_log ADD COLUMN {col} {sql_type}")
 
+def _ensure_llm_invocation_columns(conn: sqlite3.Connection) -> None:
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(llm_invocations)").fetchall()}
+    for col in ("raw_tool_input_blob", "sanitized_prompt_input_blob", "llm_output_blob"):
+        if col not in cols:
+            conn.execute(f"ALTER TABLE llm_invocations ADD COLUMN {col} TEXT")
+
 def init_db(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
     """Create DB + table if needed. Returns connection."""
     conn = sqlite3.connect(str(db_path))
     conn.executescript(SCHEMA_SQL)
     _ensure_runs_columns(conn)
     _ensure_execution_log_columns(conn)
+    _ensure_llm_invocation_columns(conn)
     conn.commit()
     return conn
 
 
-def write_log(conn: sqlite3.Connection, entry: LogEntry) -> None:
-    """Insert one log row with per-run hash chain."""
+_INSERT_LOG_SQL = """
+INSERT INTO execution_log
+    (timestamp_iso, run_id, saw_id, node_id, tool_name, decision, latency_ms, prev_hash, event_hash, error, cache_hit, attempt)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _canonical_event(
+    run_id: str,
+    node_id: str,
+    tool_name: str,
+    decision: str,
+    latency_ms: float,
+    error: str | None,
+    timestamp_iso: str,
+    cache_hit: bool,
+    attempt: int = 1,
+) -> str:
+    event = {
+        "run_id": run_id,
+        "node_id": node_id,
+        "tool_name": tool_name,
+        "decision": decision,
+        "latency_ms": float(latency_ms),
+        "error": error or "",
+        "timestamp": timestamp_iso,
+    }
+    # Optional fields are only present when set, so rows written before
+    # they existed keep their original hashes.
+    if cache_hit:
+        event["cache_hit"] = True
+    if attempt != 1:
+        event["attempt"] = int(attempt)
+    return canonical_json(event)
+
+
+def _chain_head(conn: sqlite3.Connection, run_id: str) -> str:
     prev_row = conn.execute(
         """
         SELECT event_hash
@@ -132,43 +218,37 @@ def write_log(conn: sqlite3.Connection, entry: LogEntry) -> None:
         ORDER BY timestamp_iso DESC, id DESC
         LIMIT 1
         """,
-        (entry.run_id,),
+        (run_id,),
     ).fetchone()
+    return prev_row[0] if prev_row and prev_row[0] else "GENESIS"
+
 
-    prev_hash = prev_row[0] if prev_row and prev_row[0] else "GENESIS"
-
-    canonical_event = canonical_json(
-        {
-            "run_id": entry.run_id,
-            "node_id": entry.node_id,
-            "tool_name": entry.tool_name,
-            "decision": entry.decision,
-	    "latency_ms": float(entry.latency_ms),
-            "error": entry.error or "",
-            "timestamp": entry.timestamp_iso,
-        }
+def _chained_row(entry: LogEntry, prev_hash: str) -> tuple:
+    """execution_log row for entry, chained onto prev_hash. event_hash is index 8."""
+    canonical_event = _canonical_event(
+        entry.run_id, entry.node_id, entry.tool_name, entry.decision,
+        entry.latency_ms, entry.error, entry.timestamp_iso, entry.cache_hit, entry.attempt,
     )
     event_hash = sha256_hex(prev_hash + canonical_event)
-
-    conn.execute(
-        """
-        INSERT INTO execution_log
-            (timestamp_iso, run_id, saw_id, node_id, tool_name, decision, latency_ms, prev_hash, event_hash, error)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            entry.timestamp_iso,
-            entry.run_id,
-            entry.saw_id,
-            entry.node_id,
-            entry.tool_name,
-            entry.decision,
-            entry.latency_ms,
-            prev_hash,
-            event_hash,
-            entry.error,
-        ),
+    return (
+        entry.timestamp_iso,
+        entry.run_id,
+        entry.saw_id,
+        entry.node_id,
+        entry.tool_name,
+        entry.decision,
+        entry.latency_ms,
+        prev_hash,
+        event_hash,
+        entry.error,
+        int(entry.cache_hit),
+        entry.attempt,
     )
+
+
+def write_log(conn: sqlite3.Connection, entry: LogEntry) -> None:
+    """Insert one log row with per-run hash chain."""
+    conn.execute(_INSERT_LOG_SQL, _chained_row(entry, _chain_head(conn, entry.run_id)))
     conn.commit()
 
 def upsert_run_start(
@@ -180,23 +260,27 @@ def upsert_run_start(
     policy_hash: str,
     policy_version: str,
     policy_snapshot: str,
+    saw_spec: str | None = None,
+    commit: bool = True,
 ) -> None:
     conn.execute(
         """
         INSERT INTO runs
-            (run_id, saw_id, started_at, status, policy_hash, policy_version, policy_snapshot)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
+            (run_id, saw_id, started_at, status, policy_hash, policy_version, policy_snapshot, saw_spec)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(run_id) DO UPDATE SET
             saw_id = excluded.saw_id,
             started_at = excluded.started_at,
             status = excluded.status,
             policy_hash = excluded.policy_hash,
             policy_version = excluded.policy_version,
-            policy_snapshot = excluded.policy_snapshot
+            policy_snapshot = excluded.policy_snapshot,
+            saw_spec = excluded.saw_spec
         """,
-        (run_id, saw_id, started_at, status, policy_hash, policy_version, policy_snapshot),
+        (run_id, saw_id, started_at, status, policy_hash, policy_version, policy_snapshot, saw_spec),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def update_run_approval(
@@ -205,6 +289,7 @@ def update_run_approval(
     approved_by: str | None,
     approved_at: str | None,
     approval_note: str | None,
+    commit: bool = True,
 ) -> None:
     conn.execute(
         """
@@ -214,15 +299,17 @@ def update_run_approval(
         """,
         (approved_by, approved_at, approval_note, run_id),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
-def update_run_status(conn: sqlite3.Connection, run_id: str, status: str) -> None:
+def update_run_status(conn: sqlite3.Connection, run_id: str, status: str, commit: bool = True) -> None:
     conn.execute(
         "UPDATE runs SET status = ? WHERE run_id = ?",
         (status, run_id),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def get_run_record(conn: sqlite3.Connection, run_id: str) -> dict | None:
@@ -246,7 +333,13 @@ def write_llm_invocation(
     raw_tool_input: dict,
     sanitized_prompt_input: dict,
     llm_output_text: str,
+    commit: bool = True,
 ) -> None:
+    """
+    One ledger row per LLM call. The *_hash columns are the audit hashes of
+    the normalized payloads; the full payloads go to the blob store and the
+    row references them, so calls can be replayed exactly.
+    """
     raw_json = canonical_json(raw_tool_input or {})
     sanitized_json = canonical_json(sanitized_prompt_input or {})
     output_text = llm_output_text or ""
@@ -260,8 +353,8 @@ def write_llm_invocation(
         INSERT INTO llm_invocations
             (run_id, node_id, invoked_at, provider, model_name, model_version, temperature, max_tokens,
              raw_tool_input_hash, sanitized_prompt_input_hash, llm_output_text_hash,
-             raw_tool_input_preview, llm_output_preview)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             raw_tool_input_blob, sanitized_prompt_input_blob, llm_output_blob)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
         (
             run_id,
@@ -275,11 +368,141 @@ def write_llm_invocation(
             raw_hash,
             sanitized_hash,
             output_hash,
-            _normalize_text(raw_json)[:300],
-            _normalize_text(output_text)[:300],
+            put_blob(conn, raw_json),
+            put_blob(conn, sanitized_json),
+            put_blob(conn, output_text),
         ),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+
+
+def store_output(conn: sqlite3.Connection, data: dict) -> str:
+    """Content-addressed insert into node_outputs (no commit). Returns the hash."""
+    data_json = canonical_json(data or {})
+    content_hash = sha256_hex(data_json)
+    conn.execute(
+        "INSERT OR IGNORE INTO node_outputs (content_hash, data_json) VALUES (?, ?)",
+        (content_hash, data_json),
+    )
+    return content_hash
+
+
+def write_checkpoint(
+    conn: sqlite3.Connection,
+    run_id: str,
+    node_id: str,
+    data: dict,
+    latency_ms: float,
+    commit: bool = True,
+) -> str:
+    """Persist a successful node's output (deduplicated by content hash). Returns the hash."""
+    content_hash = store_output(conn, data)
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO run_checkpoints (run_id, node_id, content_hash, latency_ms, created_at)
+        VALUES (?, ?, ?, ?, datetime('now'))
+        """,
+        (run_id, node_id, content_hash, latency_ms),
+    )
+    if commit:
+        conn.commit()
+    return content_hash
+
+
+def get_checkpoints(conn: sqlite3.Connection, run_id: str) -> dict[str, tuple[dict, float]]:
+    """{node_id: (data, latency_ms)} for every checkpointed node of a run."""
+    rows = conn.execute(
+        """
+        SELECT c.node_id, o.data_json, c.latency_ms
+        FROM run_checkpoints c JOIN node_outputs o ON o.content_hash = c.content_hash
+        WHERE c.run_id = ?
+        """,
+        (run_id,),
+    )
+    return {node_id: (json.loads(data_json), latency_ms) for node_id, data_json, latency_ms in rows}
+
+
+def get_allowed_nodes(conn: sqlite3.Connection, run_id: str) -> set[str]:
+    """Nodes the run's log records as having gone through (decision 'allow')."""
+    rows = conn.execute(
+        "SELECT DISTINCT node_id FROM execution_log WHERE run_id = ? AND decision = 'allow'",
+        (run_id,),
+    )
+    return {row[0] for row in rows}
+
+
+# ── Run-scoped buffered writer ─────────────────────────────────────
+
+class RunLogWriter:
+    """
+    Buffers one run's log rows and run-record updates and writes them in a
+    single transaction per flush(), instead of one commit per node.
+
+    The chain head is read once and then kept in memory, so rows are
+    hashed as they are appended. Buffered rows are inserted with
+    executemany in append order, which is the order verify_run_integrity
+    walks them. If a flush fails, the transaction is rolled back, the run
+    is marked "incomplete" (best effort, in its own commit) and the error
+    is re-raised; the buffer is kept so nothing is silently dropped.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, run_id: str):
+        self.conn = conn
+        self.run_id = run_id
+        self.head = _chain_head(conn, run_id)
+        self._rows: list[tuple] = []
+        self._ops: list[tuple] = []  # (function, kwargs) run after the log rows
+        self.flushes = 0
+
+    def append(self, entry: LogEntry) -> str:
+        """Buffer one log row; returns its event_hash."""
+        row = _chained_row(entry, self.head)
+        self._rows.append(row)
+        self.head = row[8]
+        return self.head
+
+    def update_approval(self, **kwargs) -> None:
+        self._ops.append((update_run_approval, {"run_id": self.run_id, **kwargs}))
+
+    def update_status(self, status: str) -> None:
+        self._ops.append((update_run_status, {"run_id": self.run_id, "status": status}))
+
+    def llm_invocation(self, **kwargs) -> None:
+        self._ops.append((write_llm_invocation, {"run_id": self.run_id, **kwargs}))
+
+    def defer(self, fn, **kwargs) -> None:
+        """Run fn(conn=..., commit=False, **kwargs) inside the next flush."""
+        self._ops.append((fn, kwargs))
+
+    def checkpoint(self, node_id: str, data: dict, latency_ms: float) -> None:
+        self._ops.append((write_checkpoint, {
+            "run_id": self.run_id, "node_id": node_id, "data": data, "latency_ms": latency_ms,
+        }))
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows) + len(self._ops)
+
+    def flush(self) -> None:
+        if not self._rows and not self._ops:
+            return
+        try:
+            if self._rows:
+                self.conn.executemany(_INSERT_LOG_SQL, self._rows)
+            for fn, kwargs in self._ops:
+                fn(conn=self.conn, commit=False, **kwargs)
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            try:
+                update_run_status(self.conn, self.run_id, "incomplete")
+            except sqlite3.Error:
+                pass
+            raise
+        self._rows.clear()
+        self._ops.clear()
+        self.flushes += 1
 
 
 def get_llm_invocations(conn: sqlite3.Connection, run_id: str) -> list[dict]:
@@ -291,27 +514,59 @@ def get_llm_invocations(conn: sqlite3.Connection, run_id: str) -> list[dict]:
     return [dict(zip(cols, row)) for row in cur.fetchall()]
 
 
+def load_llm_invocation(conn: sqlite3.Connection, invocation_id: int) -> dict | None:
+    """
+    A ledger row plus its full payloads, for replaying the call:
+    raw_tool_input / sanitized_prompt_input (dicts) and llm_output_text.
+    payload_verified is True when every payload still matches its audit
+    hash. Rows written before the blob store have only previews, so their
+    payloads are None and payload_verified is False.
+    """
+    cur = conn.execute("SELECT * FROM llm_invocations WHERE id = ?", (invocation_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+    record = dict(zip([d[0] for d in cur.description], row))
+
+    raw_json = get_blob_text(conn, record["raw_tool_input_blob"]) if record["raw_tool_input_blob"] else None
+    sanitized_json = (
+        get_blob_text(conn, record["sanitized_prompt_input_blob"]) if record["sanitized_prompt_input_blob"] else None
+    )
+    output_text = get_blob_text(conn, record["llm_output_blob"]) if record["llm_output_blob"] else None
+
+    record["raw_tool_input"] = json.loads(raw_json) if raw_json is not None else None
+    record["sanitized_prompt_input"] = json.loads(sanitized_json) if sanitized_json is not None else None
+    record["llm_output_text"] = output_text
+    record["payload_verified"] = (
+        raw_json is not None
+        and sanitized_json is not None
+        and output_text is not None
+        and normalized_payload_hash(raw_json) == record["raw_tool_input_hash"]
+        and normalized_payload_hash(sanitized_json) == record["sanitized_prompt_input_hash"]
+        and normalized_payload_hash(output_text) == record["llm_output_text_hash"]
+    )
+    return record
+
+
 def verify_run_integrity(conn: sqlite3.Connection, run_id: str) -> dict:
+    """
+    Re-hash a run's chain. Rows are streamed from the cursor in chain order
+    (served by idx_run_chain without a sort), so memory stays flat however
+    long the run is.
+    """
     cur = conn.execute(
         """
-        SELECT id, timestamp_iso, run_id, node_id, tool_name, decision, latency_ms, error, prev_hash, event_hash
+        SELECT id, timestamp_iso, run_id, node_id, tool_name, decision, latency_ms, error, prev_hash, event_hash, cache_hit, attempt
         FROM execution_log
         WHERE run_id = ?
         ORDER BY timestamp_iso, id
         """,
         (run_id,),
     )
-    rows = cur.fetchall()
-    if not rows:
-        return {
-            "valid": True,
-            "first_mismatch_index": None,
-            "expected_hash": None,
-            "found_hash": None,
-        }
 
     prev = "GENESIS"
-    for idx, row in enumerate(rows):
+    rows_checked = 0
+    for idx, row in enumerate(cur):
         (
             _id,
             timestamp_iso,
@@ -323,27 +578,24 @@ def verify_run_integrity(conn: sqlite3.Connection, run_id: str) -> dict:
             error,
             stored_prev,
             stored_event,
+            cache_hit,
+            attempt,
         ) = row
 
-        canonical_event = canonical_json(
-            {
-                "run_id": row_run_id,
-                "node_id": node_id,
-                "tool_name": tool_name,
-                "decision": decision,
-		"latency_ms": float(latency_ms),
-                "error": error or "",
-                "timestamp": timestamp_iso,
-            }
+        canonical_event = _canonical_event(
+            row_run_id, node_id, tool_name, decision, latency_ms, error, timestamp_iso, bool(cache_hit), attempt,
         )
         expected_event = sha256_hex(prev + canonical_event)
+        rows_checked = idx + 1
 
         if stored_prev != prev or stored_event != expected_event:
+            cur.close()
             return {
                 "valid": False,
                 "first_mismatch_index": idx,
                 "expected_hash": expected_event,
                 "found_hash": stored_event,
+                "rows_checked": rows_checked,
             }
 
         prev = stored_event
@@ -353,6 +605,7 @@ def verify_run_integrity(conn: sqlite3.Connection, run_id: str) -> dict:
         "first_mismatch_index": None,
         "expected_hash": None,
         "found_hash": None,
+        "rows_checked": rows_checked,
     }
 
 
@@ -371,18 +624,11 @@ def get_run_logs(
 def get_cycle_time_breakdown(
     conn: sqlite3.Connection, run_id: str
 ) -> dict:
-    """Compute system_time_ms and human_wait_time_ms for a run."""
-    rows = get_run_logs(conn, run_id)
-    system_ms = 0.0
-    human_ms = 0.0
-    for row in rows:
-        if row["node_id"] == "n_approval":
-            human_ms += row["latency_ms"]
-        else:
-            system_ms += row["latency_ms"]
-    return {
-        "run_id": run_id,
-        "system_time_ms": round(system_ms, 2),
-        "human_wait_time_ms": round(human_ms, 2),
-        "total_ms": round(system_ms + human_ms, 2),
-    }
+    """
+    Compute system_time_ms and human_wait_time_ms for a run, aggregated in
+    SQL. Human time is whatever the run's approval gates logged (see
+    analytics.py for multi-run reports).
+    """
+    from analytics import cycle_time_breakdown
+
+    return cycle_time_breakdown(conn, run_id)
@@ -67,3 +67,5 @@ class LogEntry:
     decision: str = ""  # "allow" | "deny"
     latency_ms: float = 0.0
     error: str | None = None
+    cache_hit: bool = False  # output served from the tool cache, tool not invoked
+    attempt: int = 1         # 1-based; retried tool calls log one row per attempt
@@ -0,0 +1,304 @@
+"""
+SurFit V1 — Node Execution Policies
+Timeout, retry and circuit-breaker settings for tool nodes, declared in the
+SAW spec as spec-wide defaults and overridden per node under the same key:
+
+    "execution_policy": {
+        "timeout_seconds": 10,
+        "max_retries": 2,
+        "backoff_base_seconds": 0.2,
+        "backoff_max_seconds": 2.0,
+        "circuit_breaker": {"failure_threshold": 5, "reset_seconds": 30}
+    }
+
+Nodes without a policy call their tool directly on the calling thread,
+exactly as before. Otherwise:
+  - Attempts with a timeout run on a shared worker pool and are abandoned
+    (not killed) when the deadline passes.
+  - Attempts that time out or raise are retried with full-jitter
+    exponential backoff. A ToolResult with success=False is the tool's
+    answer and is never retried.
+  - Write actions only retry when the node itself sets max_retries; the
+    spec-wide default does not apply to them. A write attempt that times
+    out may still land, so it is recorded as outcome "unknown" and never
+    retried.
+  - Breakers are kept per tool in a process-wide registry, so every run
+    sees an upstream that is already failing and fails fast instead of
+    waiting out its timeouts.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Callable
+
+from models import RunContext, ToolResult
+
+
+_POLICY_KEYS = {
+    "timeout_seconds",
+    "max_retries",
+    "backoff_base_seconds",
+    "backoff_max_seconds",
+    "circuit_breaker",
+}
+
+
+@dataclass(frozen=True)
+class ExecutionPolicy:
+    """Effective execution settings for one tool node."""
+    timeout_seconds: float | None = None
+    max_retries: int = 0
+    backoff_base_seconds: float = 0.2
+    backoff_max_seconds: float = 5.0
+    breaker_failure_threshold: int | None = None   # None = no breaker
+    breaker_reset_seconds: float = 30.0
+    write_action: bool = False
+
+    @property
+    def managed(self) -> bool:
+        """False when nothing is configured, i.e. the plain direct call."""
+        return (
+            self.timeout_seconds is not None
+            or self.max_retries > 0
+            or self.breaker_failure_threshold is not None
+        )
+
+    def backoff_seconds(self, retry: int, rng: random.Random) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2^(retry-1))]."""
+        cap = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (retry - 1)))
+        return rng.uniform(0.0, max(cap, 0.0))
+
+
+def execution_policy_for(saw_spec: dict, node: dict) -> ExecutionPolicy:
+    """Merge the spec-wide execution_policy with the node's own. Raises ValueError on unknown keys."""
+    defaults = dict(saw_spec.get("execution_policy") or {})
+    own = dict(node.get("execution_policy") or {})
+    for source, where in ((defaults, "spec"), (own, f"node '{node.get('id')}'")):
+        unknown = set(source) - _POLICY_KEYS
+        if unknown:
+            raise ValueError(f"Unknown execution_policy keys in {where}: {sorted(unknown)}")
+    if node.get("write_action", False):
+        defaults.pop("max_retries", None)
+
+    merged = {**defaults, **own}
+    breaker = merged.get("circuit_breaker") or {}
+    timeout = merged.get("timeout_seconds")
+    return ExecutionPolicy(
+        timeout_seconds=float(timeout) if timeout is not None else None,
+        max_retries=max(0, int(merged.get("max_retries", 0))),
+        backoff_base_seconds=float(merged.get("backoff_base_seconds", 0.2)),
+        backoff_max_seconds=float(merged.get("backoff_max_seconds", 5.0)),
+        breaker_failure_threshold=(
+            max(1, int(breaker["failure_threshold"])) if "failure_threshold" in breaker else None
+        ),
+        breaker_reset_seconds=float(breaker.get("reset_seconds", 30.0)),
+        write_action=bool(node.get("write_action", False)),
+    )
+
+
+# ── Circuit breakers ───────────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    closed → open after failure_threshold consecutive failures; open →
+    half_open once reset_seconds have passed, letting a single trial call
+    through; the trial's outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if self.clock() - self.opened_at < self.reset_seconds:
+                    return False
+                self.state = "half_open"
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = self.clock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+class CircuitBreakerRegistry:
+    """One breaker per tool name, created on first use with that node's settings."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, tool_name: str, failure_threshold: int, reset_seconds: float) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(tool_name)
+            if breaker is None:
+                breaker = CircuitBreaker(failure_threshold, reset_seconds, clock=self.clock)
+                self._breakers[tool_name] = breaker
+            return breaker
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.snapshot() for name, breaker in breakers.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+CIRCUIT_BREAKERS = CircuitBreakerRegistry()
+
+
+# ── Attempt execution ─────────────────────────────────────────────
+
+@dataclass
+class Attempt:
+    """One call (or refused call) of a tool."""
+    number: int
+    latency_ms: float
+    outcome: str                  # "ok" | "failed" | "error" | "timeout" | "unknown" | "circuit_open"
+    error: str | None = None
+    backoff_ms: float = 0.0       # slept after this attempt, before the next
+
+
+@dataclass
+class NodeExecution:
+    """Final result of a tool node plus every attempt that led to it."""
+    result: ToolResult
+    attempts: list[Attempt] = field(default_factory=list)
+    total_ms: float = 0.0         # first attempt start → final result, backoff included
+
+    @property
+    def gave_up(self) -> bool:
+        """True when the node failed for lack of a tool answer (timeout, exception, open circuit)."""
+        return bool(self.attempts) and self.attempts[-1].outcome in ("error", "timeout", "unknown", "circuit_open")
+
+
+class AttemptTimeout(Exception):
+    pass
+
+
+_ATTEMPT_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="saw-attempt")
+_RNG = random.Random()
+
+
+def _call(tool_fn, tool_inputs: dict, ctx: RunContext, timeout: float | None) -> ToolResult:
+    if timeout is None:
+        return tool_fn(tool_inputs, ctx)
+    future = _ATTEMPT_POOL.submit(tool_fn, tool_inputs, ctx)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        if future.done():
+            raise  # the tool itself raised TimeoutError
+        future.cancel()
+        raise AttemptTimeout(f"Timed out after {timeout:g}s") from None
+
+
+def run_tool(
+    tool_fn: Callable[[dict, RunContext], ToolResult],
+    tool_name: str,
+    tool_inputs: dict,
+    ctx: RunContext,
+    policy: ExecutionPolicy,
+    breakers: CircuitBreakerRegistry = CIRCUIT_BREAKERS,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: random.Random = _RNG,
+) -> NodeExecution:
+    """
+    Call tool_fn under `policy`. Safe to call from a worker thread (no DB
+    access). An unmanaged policy makes exactly one direct call and lets
+    exceptions propagate, as the engine always has.
+    """
+    t_start = time.perf_counter()
+    if not policy.managed:
+        result = tool_fn(tool_inputs, ctx)
+        latency_ms = round((time.perf_counter() - t_start) * 1000, 2)
+        outcome = "ok" if result.success else "failed"
+        return NodeExecution(result, [Attempt(1, latency_ms, outcome, result.error)], latency_ms)
+
+    breaker = None
+    if policy.breaker_failure_threshold is not None:
+        breaker = breakers.get(tool_name, policy.breaker_failure_threshold, policy.breaker_reset_seconds)
+
+    attempts: list[Attempt] = []
+    total_attempts = policy.max_retries + 1
+    for number in range(1, total_attempts + 1):
+        if breaker is not None and not breaker.allow():
+            error = f"Circuit open for tool '{tool_name}'"
+            attempts.append(Attempt(number, 0.0, "circuit_open", error))
+            result = ToolResult(tool_name=tool_name, success=False, error=error)
+            break
+
+        t0 = time.perf_counter()
+        try:
+            result = _call(tool_fn, tool_inputs, ctx, policy.timeout_seconds)
+            outcome, error = ("ok" if result.success else "failed"), result.error
+        except AttemptTimeout as e:
+            if policy.write_action:
+                # The abandoned attempt keeps running; retrying could write twice.
+                outcome, error = "unknown", f"{e}; the write may still complete"
+            else:
+                outcome, error = "timeout", str(e)
+        except Exception as e:
+            outcome, error = "error", f"{type(e).__name__}: {e}"
+        attempt = Attempt(number, round((time.perf_counter() - t0) * 1000, 2), outcome, error)
+        attempts.append(attempt)
+
+        if outcome in ("ok", "failed"):
+            if breaker is not None:
+                breaker.record_success()  # the upstream answered
+            break
+
+        if breaker is not None:
+            breaker.record_failure()
+        result = ToolResult(
+            tool_name=tool_name,
+            success=False,
+            error=f"{error} (attempt {number}/{total_attempts})",
+        )
+        if outcome == "unknown":
+            break
+        if number < total_attempts:
+            delay = policy.backoff_seconds(number, rng)
+            attempt.backoff_ms = round(delay * 1000, 2)
+            sleep(delay)
+
+    return NodeExecution(result, attempts, round((time.perf_counter() - t_start) * 1000, 2))
@@ -18,7 +18,8 @@ SAW_SPEC = {
         ],
         "edges": [
             {"from": "n_start",           "to": "n_salesforce_pull"},
-            {"from": "n_salesforce_pull",  "to": "n_stripe_pull"},
+            {"from": "n_start",           "to": "n_stripe_pull"},
+            {"from": "n_salesforce_pull",  "to": "n_reconcile"},
             {"from": "n_stripe_pull",      "to": "n_reconcile"},
             {"from": "n_reconcile",        "to": "n_generate_summary"},
             {"from": "n_generate_summary", "to": "n_approval"},
@@ -36,6 +37,10 @@ SAW_SPEC = {
         "egress": {"allow_external_http": False, "allowed_domains": [], "allow_email_send": False, "allow_slack_dm": False},
         "write_restrictions": {"tool_slides_update_template": {"allowed_template_ids": ["TEMPLATE_DECK_V1"], "allow_create_new_decks": False}},
     },
+    "execution_policy": {
+        "timeout_seconds": 10, "max_retries": 2, "backoff_base_seconds": 0.2, "backoff_max_seconds": 2.0,
+        "circuit_breaker": {"failure_threshold": 5, "reset_seconds": 30},
+    },
 }
 
 def demo_run(approval_granted=True, wait_ms=500):
@@ -50,6 +55,8 @@ def demo_run(approval_granted=True, wait_ms=500):
     print(f"  System time:     {result.system_time_ms} ms")
     print(f"  Human wait time: {result.human_wait_time_ms} ms")
     print(f"  Total time:      {result.total_time_ms} ms")
+    print(f"  Critical path:   {result.critical_path_ms} ms ({' -> '.join(result.critical_path)})")
+    print(f"  Retry overhead:  {result.failed_attempt_ms} ms failed attempts, {result.retry_wait_ms} ms backoff")
     if result.denial_reason:
         print(f"  Denial reason:   {result.denial_reason}")
     breakdown = get_cycle_time_breakdown(conn, ctx.run_id)
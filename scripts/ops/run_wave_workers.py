@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run queued wave workers outside the API process")
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads in this process")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between empty-queue polls")
+    parser.add_argument(
+        "--requeue-stale-after",
+        type=int,
+        default=None,
+        help="Requeue running jobs whose heartbeat is older than this many seconds (crashed workers); "
+        "default SURFIT_WAVE_QUEUE_STALE_AFTER_SECONDS. Keep it well below the mutation token TTL.",
+    )
+    parser.add_argument("--reap-interval", type=float, default=30.0, help="Seconds between stale-job sweeps")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    import api
+    from surfit.runtime.wave_job_queue import WaveWorkerPool
+
+    stale_after = args.requeue_stale_after if args.requeue_stale_after is not None else api.WAVE_QUEUE_STALE_AFTER_SECONDS
+    if stale_after >= api.WAVE_MUTATION_TOKEN_TTL_SECONDS:
+        parser.error("--requeue-stale-after must be below the mutation token TTL "
+                     f"({api.WAVE_MUTATION_TOKEN_TTL_SECONDS}s) or requeued jobs can never run")
+
+    pool = WaveWorkerPool(
+        queue=api.RUNTIME_WAVE_JOB_QUEUE,
+        connect=api._open_wave_worker_conn,
+        execute=api._execute_queued_wave,
+        workers=args.workers,
+        poll_interval_seconds=args.poll_interval,
+        on_failed=api._fail_queued_wave,
+        stale_after_seconds=stale_after,
+        reap_interval_seconds=args.reap_interval,
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    pool.start()
+    print(f"wave_workers_started={args.workers}")
+    stop.wait()
+    pool.stop(timeout=30)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
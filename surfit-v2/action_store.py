@@ -0,0 +1,214 @@
+"""
+SURFIT V2 — Action Store
+Durable SQLite (WAL) storage for evaluated actions and pending approvals,
+with a bounded in-memory cache of the most recent action records.
+"""
+
+from collections import OrderedDict
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ActionStore:
+    """
+    Actions are kept in insertion order (seq) and looked up by id through the
+    primary key, so approving or rejecting is an indexed lookup regardless of
+    history size. The newest `hot_size` action records are also held in
+    memory; record dicts returned from the store are copies owned by the
+    caller, and changes are persisted with save_action/save_pending.
+    """
+
+    def __init__(self, db_path: str, hot_size: int = 500):
+        self.db_path = db_path
+        self.hot_size = max(0, int(hot_size))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._hot: "OrderedDict[str, str]" = OrderedDict()  # id -> record_json, newest last
+        self._ensure_schema()
+        self._warm()
+
+    def _ensure_schema(self) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS actions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                timestamp TEXT,
+                status TEXT,
+                tenant_id TEXT,
+                record_json TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pending_actions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL,
+                timestamp TEXT,
+                record_json TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pending_actions_status ON pending_actions(status, seq);
+            """
+        )
+
+    def _warm(self) -> None:
+        if not self.hot_size:
+            return
+        rows = self._conn.execute(
+            "SELECT id, record_json FROM actions ORDER BY seq DESC LIMIT ?", (self.hot_size,)
+        ).fetchall()
+        for action_id, record_json in reversed(rows):
+            self._hot[action_id] = record_json
+
+    def _remember(self, action_id: str, record_json: str, *, new: bool) -> None:
+        if not self.hot_size:
+            return
+        if new:
+            self._hot[action_id] = record_json
+            while len(self._hot) > self.hot_size:
+                self._hot.popitem(last=False)
+        elif action_id in self._hot:
+            # Updates keep the record's position; only the content changes.
+            self._hot[action_id] = record_json
+
+    # ── Actions ──
+
+    def add_action(self, record: Dict[str, Any]) -> None:
+        record_json = json.dumps(record, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO actions (id, timestamp, status, tenant_id, record_json) VALUES (?, ?, ?, ?, ?)",
+                (record["id"], record.get("timestamp"), record.get("status"), record.get("tenant_id"), record_json),
+            )
+            self._remember(record["id"], record_json, new=True)
+
+    def add_actions(self, records: List[Dict[str, Any]]) -> None:
+        """Insert many records in one transaction (oldest first)."""
+        rows = [
+            (r["id"], r.get("timestamp"), r.get("status"), r.get("tenant_id"), json.dumps(r, default=str))
+            for r in records
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO actions (id, timestamp, status, tenant_id, record_json) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for row in rows:
+                self._remember(row[0], row[4], new=True)
+
+    def save_action(self, record: Dict[str, Any]) -> None:
+        record_json = json.dumps(record, default=str)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE actions SET status = ?, record_json = ? WHERE id = ?",
+                (record.get("status"), record_json, record["id"]),
+            )
+            self._remember(record["id"], record_json, new=False)
+
+    def get_action(self, action_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record_json = self._hot.get(action_id)
+            if record_json is None:
+                row = self._conn.execute("SELECT record_json FROM actions WHERE id = ?", (action_id,)).fetchone()
+                record_json = row[0] if row else None
+        return json.loads(record_json) if record_json else None
+
+    def list_actions(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Newest first."""
+        with self._lock:
+            if offset + limit <= len(self._hot):
+                hot = list(self._hot.values())
+                end = len(hot) - offset
+                page = hot[max(0, end - limit):end][::-1]
+            else:
+                page = [
+                    row[0] for row in self._conn.execute(
+                        "SELECT record_json FROM actions ORDER BY seq DESC LIMIT ? OFFSET ?", (limit, offset)
+                    )
+                ]
+        return [json.loads(r) for r in page]
+
+    def iter_actions(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Oldest first, read in batches so exports do not load the whole log."""
+        last_seq = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT seq, record_json FROM actions WHERE seq > ? ORDER BY seq LIMIT ?", (last_seq, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for seq, record_json in rows:
+                yield json.loads(record_json)
+            last_seq = rows[-1][0]
+
+    def count_actions(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM actions").fetchone()[0])
+
+    # ── Pending approvals ──
+
+    def add_pending(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pending_actions (id, status, timestamp, record_json) VALUES (?, ?, ?, ?)",
+                (record["id"], record["status"], record.get("timestamp"), json.dumps(record, default=str)),
+            )
+
+    def save_pending(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending_actions SET status = ?, record_json = ? WHERE id = ?",
+                (record["status"], json.dumps(record, default=str), record["id"]),
+            )
+
+    def get_pending(self, action_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT record_json FROM pending_actions WHERE id = ?", (action_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def claim_pending(self, action_id: str, status: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically move a pending action to `status`. Returns the record, or
+        None if it does not exist or was already resolved (so two operators
+        cannot both approve the same action).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record_json FROM pending_actions WHERE id = ? AND status = 'pending'", (action_id,)
+            ).fetchone()
+            if not row:
+                return None
+            record = json.loads(row[0])
+            record["status"] = status
+            self._conn.execute(
+                "UPDATE pending_actions SET status = ?, record_json = ? WHERE id = ? AND status = 'pending'",
+                (status, json.dumps(record, default=str), action_id),
+            )
+        return record
+
+    def list_pending(self, status: str = "pending", limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record_json FROM pending_actions WHERE status = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (status, limit, offset),
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def count_pending(self, status: str = "pending") -> int:
+        with self._lock:
+            return int(self._conn.execute(
+                "SELECT COUNT(*) FROM pending_actions WHERE status = ?", (status,)
+            ).fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,237 @@
+"""
+SURFIT V2 — Slack Event Ingestion
+Slack event callbacks are acknowledged as soon as they are queued. A single
+worker drains the queue in micro-batches so evaluation and persistence run
+once per batch instead of once per event, and event ids already seen within
+the TTL window are dropped so Slack's retries are never evaluated twice.
+"""
+
+from collections import OrderedDict, deque
+import logging
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLSet:
+    """Insertion-ordered set whose members expire after ttl_seconds."""
+
+    def __init__(self, ttl_seconds: float = 3600.0, max_entries: int = 100000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, int(max_entries))
+        self.clock = clock
+        self._entries: "OrderedDict[str, float]" = OrderedDict()  # key -> expires_at, oldest first
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                return
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        self._expire(self.clock())
+        return key in self._entries
+
+    def add(self, key: str) -> None:
+        now = self.clock()
+        self._entries[key] = now + self.ttl_seconds
+        self._entries.move_to_end(key)
+        self._expire(now)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EventIngestPipeline:
+    """
+    Bounded queue + one batching worker.
+
+    submit(key, item) returns "queued", "duplicate" or "full". A key is only
+    remembered once its item is accepted, so an event turned away while the
+    queue is full is processed when Slack retries it. process_batch(items)
+    receives up to max_batch items, waiting at most max_delay_seconds after
+    the first one arrives.
+
+    When process_batch raises, the whole batch is retried up to
+    max_batch_retries times, retry_delay_seconds apart (growing per attempt),
+    which rides out transient failures. If it still fails, it is split in
+    halves that are processed on their own, recursively, so only events that
+    fail by themselves are dropped. Slack was already acknowledged for them,
+    so a dropped event is gone: its key is logged, and forgotten so that a
+    manual resubmission is accepted.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], None],
+        *,
+        max_batch: int = 200,
+        max_delay_seconds: float = 0.05,
+        max_queue: int = 10000,
+        dedup_ttl_seconds: float = 3600.0,
+        dedup_max_entries: int = 100000,
+        max_batch_retries: int = 2,
+        retry_delay_seconds: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.process_batch = process_batch
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay_seconds = max_delay_seconds
+        self.max_queue = max(1, int(max_queue))
+        self.max_batch_retries = max(0, int(max_batch_retries))
+        self.retry_delay_seconds = retry_delay_seconds
+        self.clock = clock
+        self._seen = TTLSet(dedup_ttl_seconds, dedup_max_entries, clock=clock)
+        self._cv = threading.Condition()
+        self._queue: Deque[Tuple[Optional[str], Any]] = deque()  # (key, item)
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._counts = {"queued": 0, "duplicate": 0, "full": 0, "processed": 0, "batches": 0,
+                        "errors": 0, "retried": 0, "dropped": 0}
+
+    def start(self) -> None:
+        with self._cv:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="slack-event-ingest", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after draining whatever is already queued."""
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def claim(self, key: str) -> bool:
+        """Record key as seen; False if it already was (for callers that process inline)."""
+        with self._cv:
+            if key in self._seen:
+                self._counts["duplicate"] += 1
+                return False
+            self._seen.add(key)
+            return True
+
+    def submit(self, key: Optional[str], item: Any) -> str:
+        with self._cv:
+            if key is not None and key in self._seen:
+                self._counts["duplicate"] += 1
+                return "duplicate"
+            if len(self._queue) >= self.max_queue:
+                self._counts["full"] += 1
+                return "full"
+            if key is not None:
+                self._seen.add(key)
+            self._queue.append((key, item))
+            self._counts["queued"] += 1
+            self._cv.notify()
+            return "queued"
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far has been processed."""
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cv:
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - self.clock()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cv.wait(remaining)
+            return True
+
+    def _take_batch(self) -> Optional[List[Tuple[Optional[str], Any]]]:
+        with self._cv:
+            while not self._queue:
+                if self._stopping:
+                    return None
+                self._cv.wait()
+            # Give a burst a moment to fill the batch before flushing it.
+            flush_at = self.clock() + self.max_delay_seconds
+            while len(self._queue) < self.max_batch and not self._stopping:
+                remaining = flush_at - self.clock()
+                if remaining <= 0:
+                    break
+                self._cv.wait(remaining)
+            count = min(self.max_batch, len(self._queue))
+            batch = [self._queue.popleft() for _ in range(count)]
+            self._in_flight = count
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            for attempt in range(self.max_batch_retries + 1):
+                if attempt:
+                    time.sleep(self.retry_delay_seconds * attempt)
+                    with self._cv:
+                        self._counts["retried"] += len(batch)
+                if self._process(batch):
+                    break
+            else:
+                if len(batch) > 1:
+                    self._split(batch)
+                else:
+                    self._drop(batch[0][0])
+            with self._cv:
+                self._in_flight = 0
+                self._cv.notify_all()
+
+    def _process(self, batch: List[Tuple[Optional[str], Any]]) -> bool:
+        try:
+            self.process_batch([item for _, item in batch])
+        except Exception:
+            logger.warning("event batch of %d failed", len(batch), exc_info=True)
+            with self._cv:
+                self._counts["errors"] += 1
+            return False
+        with self._cv:
+            self._counts["processed"] += len(batch)
+            self._counts["batches"] += 1
+        return True
+
+    def _split(self, batch: List[Tuple[Optional[str], Any]]) -> None:
+        """Process halves separately until each failing event is on its own."""
+        mid = len(batch) // 2
+        for half in (batch[:mid], batch[mid:]):
+            if self._process(half):
+                continue
+            if len(half) > 1:
+                self._split(half)
+            else:
+                self._drop(half[0][0])
+
+    def _drop(self, key: Optional[str]) -> None:
+        logger.error("dropping event %s: it fails on its own", key or "<no key>")
+        with self._cv:
+            self._counts["dropped"] += 1
+            if key is not None:
+                self._seen.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cv:
+            return {**self._counts, "queue_depth": len(self._queue), "dedup_keys": len(self._seen)}
+
+
+def slack_event_key(payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Dedup key for an Events API callback. Slack retries reuse the envelope's
+    event_id; older payloads without one fall back to team/channel/ts.
+    """
+    if payload.get("event_id"):
+        return payload["event_id"]
+    event = payload.get("event") or {}
+    if event.get("ts"):
+        return f"{payload.get('team_id', '')}:{event.get('channel', '')}:{event['ts']}"
+    return None
@@ -0,0 +1,80 @@
+"""
+SURFIT V2 — Fake Slack Web API
+A local stand-in for chat.postMessage so delivery can be exercised without a
+workspace. Point the server at it with SLACK_API_BASE=http://127.0.0.1:8099/api.
+
+Run: python fake_slack.py [--port 8099]
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import threading
+import time
+from typing import Any, Dict, List, Tuple, Union
+
+
+class FakeSlack:
+    """
+    Records every chat.postMessage call. Queue scripted responses with
+    script(status, body, headers); once they run out, posts succeed.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.posts: List[Dict[str, Any]] = []
+        self._script: List[Tuple[int, Dict[str, Any], Dict[str, str]]] = []
+        self._lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body, headers = fake._respond(self.path, payload)
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def api_base(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def script(self, status: int, body: Union[Dict[str, Any], bytes], headers: Dict[str, str] = None) -> None:
+        with self._lock:
+            self._script.append((status, body, headers or {}))
+
+    def _respond(self, path: str, payload: Dict[str, Any]):
+        with self._lock:
+            self.posts.append({"path": path, "at": time.time(), **payload})
+            if self._script:
+                return self._script.pop(0)
+        return 200, {"ok": True, "channel": payload.get("channel"), "ts": f"{time.time():.6f}"}, {}
+
+    def start(self) -> "FakeSlack":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Slack chat.postMessage endpoint")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    fake = FakeSlack(port=args.port)
+    print(f"Fake Slack listening on {fake.api_base}")
+    fake.server.serve_forever()
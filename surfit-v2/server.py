@@ -7,12 +7,12 @@ Surfit now CONTROLS execution, not just evaluates.
 - dashboard approve → triggers real Slack post
 
 Run: python server.py
-Env: SLACK_SIGNING_SECRET, SLACK_BOT_TOKEN
+Env: SLACK_SIGNING_SECRET, SLACK_BOT_TOKEN, SURFIT_POLICY_DIR (optional per-tenant policies)
 """
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
@@ -21,11 +21,25 @@ from urllib.parse import unquote_plus
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from surfit_wave.engine import WaveEngine
-from surfit_wave.models import EvaluateRequest, ResourceInfo, ContextInfo, ContentMetadata
+from surfit_wave.registry import PolicyRegistry
+from action_store import ActionStore
+from slack_delivery import DeliveryTicket, SlackDeliveryQueue, SlackWebClient
+from event_ingest import EventIngestPipeline, slack_event_key
+from surfit_wave.models import EvaluateRequest, ResourceInfo, ContextInfo, ContentMetadata, WaveDecision
 
 # ── Config ──
 SLACK_SIGNING_SECRET = os.environ.get("SLACK_SIGNING_SECRET", "")
 SLACK_BOT_TOKEN = os.environ.get("SLACK_BOT_TOKEN", "")
+SLACK_API_BASE = os.environ.get("SLACK_API_BASE", "https://slack.com/api")  # e.g. fake_slack.py for tests
+SLACK_DELIVERY_WORKERS = int(os.environ.get("SLACK_DELIVERY_WORKERS", "4"))
+SLACK_APPROVE_WAIT_SECONDS = float(os.environ.get("SLACK_APPROVE_WAIT_SECONDS", "0"))
+SLACK_EVENT_BATCH_SIZE = int(os.environ.get("SLACK_EVENT_BATCH_SIZE", "200"))
+SLACK_EVENT_BATCH_DELAY_MS = float(os.environ.get("SLACK_EVENT_BATCH_DELAY_MS", "50"))
+SLACK_EVENT_DEDUP_TTL_SECONDS = float(os.environ.get("SLACK_EVENT_DEDUP_TTL_SECONDS", "3600"))
+POLICY_DIR = os.environ.get("SURFIT_POLICY_DIR", "")  # <tenant_id>.json per tenant
+MAX_RESIDENT_TENANTS = int(os.environ.get("SURFIT_MAX_RESIDENT_TENANTS", "64"))
+ACTION_DB_PATH = os.environ.get("SURFIT_ACTION_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "surfit_actions.db"))
+ACTION_HOT_SIZE = int(os.environ.get("SURFIT_ACTION_HOT_SIZE", "500"))
 
 app = FastAPI(title="SurfitAI Wave Engine", version="2.3.0")
 app.add_middleware(CORSMiddleware,
@@ -33,36 +47,60 @@ app.add_middleware(CORSMiddleware,
     allow_methods=["*"], allow_headers=["*"])
 
 engine = WaveEngine()
-action_log: List[dict] = []
-pending_actions: List[dict] = []
+policy_registry = PolicyRegistry(POLICY_DIR or None, default_engine=engine, max_resident=MAX_RESIDENT_TENANTS)
+action_store = ActionStore(ACTION_DB_PATH, hot_size=ACTION_HOT_SIZE)
 
 
 # ============================================================
 # SLACK WEB API — Post messages to Slack
 # ============================================================
 
-def slack_post_message(channel_id: str, text: str, surfit_prefix: bool = True) -> dict:
-    """Actually post a message to a Slack channel using the Bot Token."""
-    if not SLACK_BOT_TOKEN:
-        return {"ok": False, "error": "no_bot_token", "note": "Set SLACK_BOT_TOKEN to enable real posting"}
-
-    import urllib.request
-    post_text = f"[Surfit] {text}" if surfit_prefix else text
-    payload = json.dumps({"channel": channel_id, "text": post_text}).encode("utf-8")
-    req = urllib.request.Request(
-        "https://slack.com/api/chat.postMessage",
-        data=payload,
-        headers={
-            "Content-Type": "application/json; charset=utf-8",
-            "Authorization": f"Bearer {SLACK_BOT_TOKEN}",
-        },
-    )
-    try:
-        with urllib.request.urlopen(req) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
-            return result
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
+slack_client = SlackWebClient(SLACK_BOT_TOKEN, api_base=SLACK_API_BASE)
+
+
+def record_delivery(ticket: DeliveryTicket) -> None:
+    """Write a finished delivery back to its action (and pending) record."""
+    executed = ticket.status == "delivered"
+    record = action_store.get_action(ticket.action_id)
+    if not record:
+        return
+    delivery = record.setdefault("delivery", {})
+    delivery.update(ticket.to_dict())
+    record["proof"]["executed"] = executed
+    record["proof"]["slack_ts"] = ticket.result.get("ts")
+    if delivery.get("kind") == "approval":
+        pending = action_store.get_pending(ticket.action_id)
+        if pending:
+            pending["status"] = "approved_executed" if executed else "approved_failed"
+            action_store.save_pending(pending)
+    else:
+        record["status"] = "executed" if executed else "execution_failed"
+    action_store.save_action(record)
+
+
+def queue_slack_post(record: dict, kind: str, channel_id: str, text: str) -> DeliveryTicket:
+    """
+    Save the record and hand the post to the delivery workers. The record is
+    persisted first because a worker may finish before the caller returns.
+    The action id is the idempotency key.
+    """
+    workspace = (record.get("slack_metadata") or {}).get("team_id") or "default"
+    record["delivery"] = {"kind": kind, "status": "queued", "workspace": workspace}
+    action_store.save_action(record)
+    return delivery_queue.enqueue(record["id"], channel_id, f"[Surfit] {text}", workspace=workspace)
+
+
+delivery_queue = SlackDeliveryQueue(slack_client, workers=SLACK_DELIVERY_WORKERS, on_update=record_delivery)
+
+
+@app.on_event("startup")
+def start_slack_delivery():
+    delivery_queue.start()
+
+
+@app.on_event("shutdown")
+def stop_slack_delivery():
+    delivery_queue.stop(timeout=10)
 
 
 # ============================================================
@@ -172,8 +210,8 @@ def normalize_real_slack_command(form_data: dict) -> dict:
 # ACTION LOGGING
 # ============================================================
 
-def log_action(result, channel, content_text, source="slack_ingestion", slack_metadata=None, channel_id=None):
-    action_id = f"slack-{uuid.uuid4().hex[:8]}"
+def build_action_record(result, channel, content_text, source="slack_ingestion", slack_metadata=None, channel_id=None, request=None):
+    action_id = f"slack-{uuid.uuid4().hex}"
     now = datetime.now(timezone.utc).isoformat()
 
     record = {
@@ -186,10 +224,10 @@ def log_action(result, channel, content_text, source="slack_ingestion", slack_me
         "wave_label": result.wave_label,
         "handling": result.handling,
         "destination_class": result.destination_class_resolved,
-        "reasons": result.reasons,
+        "reasons": list(getattr(result, "reasons", ())),
         "contributing_factors": [
             {"source": f.source, "key": f.key, "modifier": f.modifier, "description": f.description}
-            for f in result.contributing_factors
+            for f in getattr(result, "contributing_factors", ())
         ],
         "status": "pending_approval" if result.handling in ("approve", "check") else "completed",
         "decided_by": None if result.handling in ("approve", "check") else "system",
@@ -205,17 +243,74 @@ def log_action(result, channel, content_text, source="slack_ingestion", slack_me
             "source": source,
         },
     }
+    if isinstance(result, WaveDecision):
+        # Unexplained batch decision: keep the factor codes so reasons can be rendered later.
+        record["factor_codes"] = list(result.factor_codes)
+    if request is not None:
+        # Lets surfit_wave.simulator replay this decision under other policies.
+        record["request"] = request.to_dict()
+        record["tenant_id"] = request.tenant_id
     if slack_metadata:
         record["slack_metadata"] = slack_metadata
         record["proof"]["user"] = slack_metadata.get("user_name")
+    return record
 
-    action_log.insert(0, record)
-    if len(action_log) > 100:
-        action_log.pop()
 
+def log_action(result, channel, content_text, source="slack_ingestion", slack_metadata=None, channel_id=None, request=None):
+    record = build_action_record(result, channel, content_text, source=source, slack_metadata=slack_metadata,
+                                 channel_id=channel_id, request=request)
+    action_store.add_action(record)
     return record
 
 
+def evaluate_and_log_batch(items: List[Dict[str, Any]], explain: bool = False) -> List[dict]:
+    """
+    Evaluate queued events with one WaveEngine batch per tenant and persist
+    all of their action records in a single transaction. Each item carries
+    the EvaluateRequest under "request", the log_action arguments, and an
+    optional "extra" dict merged into the record.
+
+    Records are built from the batch's own scores, handlings and factor
+    codes; explain=True also renders reasons and contributing factors (for
+    callers that show them), still without scoring anything twice.
+    """
+    by_tenant: Dict[Optional[str], List[int]] = {}
+    for idx, item in enumerate(items):
+        by_tenant.setdefault(item["request"].tenant_id, []).append(idx)
+
+    records: List[Optional[dict]] = [None] * len(items)
+    for tenant_id, indexes in by_tenant.items():
+        batch = policy_registry.engine_for(tenant_id).evaluate_batch([items[i]["request"] for i in indexes])
+        for pos, idx in enumerate(indexes):
+            item = items[idx]
+            result = batch.result(pos) if explain else batch.decision(pos)
+            record = build_action_record(result, item["channel"], item.get("content_text"),
+                                         source=item.get("source", "slack_ingestion"),
+                                         channel_id=item.get("channel_id"), request=item["request"])
+            record.update(item.get("extra") or {})
+            records[idx] = record
+    action_store.add_actions(records)
+    return records
+
+
+event_pipeline = EventIngestPipeline(
+    evaluate_and_log_batch,
+    max_batch=SLACK_EVENT_BATCH_SIZE,
+    max_delay_seconds=SLACK_EVENT_BATCH_DELAY_MS / 1000.0,
+    dedup_ttl_seconds=SLACK_EVENT_DEDUP_TTL_SECONDS,
+)
+
+
+@app.on_event("startup")
+def start_event_pipeline():
+    event_pipeline.start()
+
+
+@app.on_event("shutdown")
+def stop_event_pipeline():
+    event_pipeline.stop(timeout=10)
+
+
 # ============================================================
 # SLACK SLASH COMMAND — WITH EXECUTION GATE
 # ============================================================
@@ -243,7 +338,7 @@ async def slack_command(request: Request):
 
     normalized = normalize_real_slack_command(form_data)
     eval_req = normalize_slack_event(normalized)
-    result = engine.evaluate(eval_req)
+    result = policy_registry.engine_for(eval_req.tenant_id).evaluate(eval_req)
 
     channel_name = form_data.get("channel_name", "unknown")
     channel_id = form_data.get("channel_id", "")
@@ -252,26 +347,24 @@ async def slack_command(request: Request):
 
     record = log_action(result, channel_name, content_text,
                         source="real_slack", slack_metadata=normalized.get("slack_metadata"),
-                        channel_id=channel_id)
+                        channel_id=channel_id, request=eval_req)
 
     # ── EXECUTION GATE ──
 
     if result.handling in ("auto", "log"):
-        # EXECUTE: Actually post the message to Slack
-        post_result = slack_post_message(channel_id, content_text)
-        executed = post_result.get("ok", False)
-        record["status"] = "executed" if executed else "execution_failed"
+        # EXECUTE: hand the post to the delivery workers so Slack latency
+        # never eats into the slash command's response budget.
         record["decided_by"] = "surfit_auto"
-        record["proof"]["executed"] = executed
-        record["proof"]["slack_ts"] = post_result.get("ts")
-
         emoji = "\u2705"
-        decision_text = f"*Allowed and executed* ({result.wave_label})"
-        if not executed:
+        if SLACK_BOT_TOKEN:
+            record["status"] = "executing"
+            queue_slack_post(record, "auto", channel_id, content_text)
+            decision_text = f"*Allowed* ({result.wave_label}) \u2014 posting now"
+        else:
+            record["status"] = "execution_failed"
+            record["proof"]["executed"] = False
             emoji = "\u26A0\uFE0F"
-            decision_text = f"*Allowed but execution failed* ({post_result.get('error', 'unknown')})"
-            if not SLACK_BOT_TOKEN:
-                decision_text = f"*Allowed* ({result.wave_label}) \u2014 Set SLACK_BOT_TOKEN to enable auto-posting"
+            decision_text = f"*Allowed* ({result.wave_label}) \u2014 Set SLACK_BOT_TOKEN to enable auto-posting"
 
     elif result.handling in ("check", "approve"):
         # HOLD: Do NOT post. Add to pending queue.
@@ -289,7 +382,7 @@ async def slack_command(request: Request):
             "timestamp": record["timestamp"],
             "status": "pending",
         }
-        pending_actions.insert(0, pending_record)
+        action_store.add_pending(pending_record)
         record["status"] = "pending_approval"
 
         emoji = "\u26A0\uFE0F" if result.handling == "approve" else "\U0001F50D"
@@ -302,6 +395,9 @@ async def slack_command(request: Request):
         emoji = "\U0001F6D1"
         decision_text = f"*Blocked* ({result.wave_label})\nThis action has been denied by Surfit policy."
 
+    if record["status"] != "executing":
+        action_store.save_action(record)
+
     slack_response = {
         "response_type": "ephemeral",
         "blocks": [
@@ -323,9 +419,15 @@ async def slack_command(request: Request):
 # ============================================================
 
 @app.get("/api/v1/pending")
-def get_pending():
-    """Return pending actions awaiting approval."""
-    return {"pending": [p for p in pending_actions if p["status"] == "pending"]}
+def get_pending(limit: int = 100, offset: int = 0):
+    """Return pending actions awaiting approval (newest first)."""
+    limit = max(1, min(limit, 1000))
+    return {
+        "pending": action_store.list_pending(limit=limit, offset=max(0, offset)),
+        "total": action_store.count_pending(),
+        "limit": limit,
+        "offset": offset,
+    }
 
 
 @app.post("/api/v1/pending/{action_id}/approve")
@@ -334,54 +436,64 @@ def approve_action(action_id: str):
     Approve a pending action.
     This triggers the REAL Slack post.
     """
-    target = None
-    for p in pending_actions:
-        if p["id"] == action_id and p["status"] == "pending":
-            target = p
-            break
-
+    target = action_store.claim_pending(action_id, "approving")
     if not target:
         return JSONResponse({"error": "Action not found or already resolved"}, status_code=404)
 
-    # Execute the held message
-    post_result = slack_post_message(target["channel_id"], target["content_text"])
-    executed = post_result.get("ok", False)
-
-    target["status"] = "approved_executed" if executed else "approved_failed"
     now = datetime.now(timezone.utc).isoformat()
-
-    # Update action log
-    for a in action_log:
-        if a["id"] == action_id:
-            a["status"] = "approved"
-            a["decided_by"] = "operator"
-            a["proof"]["approved_at"] = now
-            a["proof"]["executed"] = executed
-            a["proof"]["slack_ts"] = post_result.get("ts")
-            break
+    target["status"] = "approved_queued"
+    action_store.save_pending(target)
+
+    # Update action log, then queue the held message for delivery
+    a = action_store.get_action(action_id) or {"id": action_id, "proof": {}}
+    a["status"] = "approved"
+    a["decided_by"] = "operator"
+    a["proof"]["approved_at"] = now
+    ticket = queue_slack_post(a, "approval", target["channel_id"], target["content_text"])
+
+    # By default answer at once; the outcome lands on the action record when
+    # the worker finishes and can be polled via the delivery endpoint.
+    if SLACK_APPROVE_WAIT_SECONDS > 0:
+        ticket.wait(SLACK_APPROVE_WAIT_SECONDS)
+    executed = ticket.status == "delivered"
+    status = {"delivered": "approved_executed", "failed": "approved_failed"}.get(ticket.status, "approved_queued")
 
     return {
         "id": action_id,
-        "status": target["status"],
+        "status": status,
         "executed": executed,
-        "slack_result": {"ok": post_result.get("ok"), "ts": post_result.get("ts"), "error": post_result.get("error")},
+        "ticket_id": ticket.action_id,
+        "delivery": ticket.to_dict(),
+        "poll": f"/api/v1/deliveries/{ticket.action_id}",
+        "slack_result": {"ok": ticket.result.get("ok"), "ts": ticket.result.get("ts"), "error": ticket.result.get("error")},
         "approved_at": now,
     }
 
 
+@app.get("/api/v1/deliveries/{ticket_id}")
+def get_delivery(ticket_id: str):
+    """Delivery status for a queued post; the ticket id is its action id."""
+    ticket = delivery_queue.get(ticket_id)
+    if ticket is not None:
+        return {"ticket_id": ticket_id, **ticket.to_dict()}
+    # Finished tickets are eventually forgotten; the action record keeps the outcome.
+    record = action_store.get_action(ticket_id)
+    if not record or "delivery" not in record:
+        return JSONResponse({"error": "Delivery not found"}, status_code=404)
+    return {"ticket_id": ticket_id, **record["delivery"]}
+
+
 @app.post("/api/v1/pending/{action_id}/reject")
 def reject_action(action_id: str):
     """Reject a pending action. Message is never posted."""
-    for p in pending_actions:
-        if p["id"] == action_id and p["status"] == "pending":
-            p["status"] = "rejected"
-            for a in action_log:
-                if a["id"] == action_id:
-                    a["status"] = "rejected"
-                    a["decided_by"] = "operator"
-                    break
-            return {"id": action_id, "status": "rejected"}
-    return JSONResponse({"error": "Action not found or already resolved"}, status_code=404)
+    if not action_store.claim_pending(action_id, "rejected"):
+        return JSONResponse({"error": "Action not found or already resolved"}, status_code=404)
+    a = action_store.get_action(action_id)
+    if a:
+        a["status"] = "rejected"
+        a["decided_by"] = "operator"
+        action_store.save_action(a)
+    return {"id": action_id, "status": "rejected"}
 
 
 # ============================================================
@@ -413,9 +525,19 @@ async def slack_events(request: Request):
                 "content": {"text": event.get("text", "")},
                 "agent_id": f"slack-user-{event.get('user', 'unknown')}",
             }
-            eval_req = normalize_slack_event(normalized)
-            result = engine.evaluate(eval_req)
-            log_action(result, event.get("channel", "unknown"), event.get("text", ""), source="real_slack_event")
+            event_key = slack_event_key(data)
+            # Acknowledge now; the pipeline evaluates and logs in batches.
+            outcome = event_pipeline.submit(event_key, {
+                "request": normalize_slack_event(normalized),
+                "channel": event.get("channel", "unknown"),
+                "content_text": event.get("text", ""),
+                "source": "real_slack_event",
+                "extra": {"slack_event_id": event_key} if event_key else None,
+            })
+            if outcome == "full":
+                # Not remembered as seen, so Slack's retry gets another chance.
+                return JSONResponse({"ok": False, "error": "ingest_queue_full"}, status_code=503)
+            return JSONResponse({"ok": True, "ingest": outcome})
 
     return JSONResponse({"ok": True})
 
@@ -434,18 +556,41 @@ class SlackIngestPayload(BaseModel):
     content: Optional[Dict[str, Any]] = None
     agent_id: Optional[str] = None
     tenant_id: Optional[str] = None
+    event_id: Optional[str] = None  # optional dedup key (e.g. Slack event_id)
+
+class SlackIngestBatch(BaseModel):
+    events: List[SlackIngestPayload]
+    explain: bool = False  # include reasons and contributing factors in the records
+
+def _ingest_item(payload: SlackIngestPayload) -> Dict[str, Any]:
+    return {
+        "request": normalize_slack_event(payload.dict()),
+        "channel": (payload.resource or {}).get("channel_name", "unknown"),
+        "content_text": (payload.content or {}).get("text"),
+        "source": "simulated",
+        "extra": {"action": payload.action, "resource": payload.resource or {}, "context": payload.context or {}},
+    }
+
 
 @app.post("/api/v1/ingest/slack")
 def ingest_slack(payload: SlackIngestPayload):
-    eval_req = normalize_slack_event(payload.dict())
-    result = engine.evaluate(eval_req)
-    channel = (payload.resource or {}).get("channel_name", "unknown")
-    content_text = (payload.content or {}).get("text")
-    record = log_action(result, channel, content_text, source="simulated")
-    record["action"] = payload.action
-    record["resource"] = payload.resource or {}
-    record["context"] = payload.context or {}
-    return record
+    if payload.event_id and not event_pipeline.claim(payload.event_id):
+        return {"ok": True, "duplicate": True, "event_id": payload.event_id}
+    return evaluate_and_log_batch([_ingest_item(payload)], explain=True)[0]
+
+
+@app.post("/api/v1/ingest/slack/batch")
+def ingest_slack_batch(batch: SlackIngestBatch):
+    """Evaluate and persist many events in one pass; repeated event_ids are skipped."""
+    items = []
+    duplicates = 0
+    for payload in batch.events:
+        if payload.event_id and not event_pipeline.claim(payload.event_id):
+            duplicates += 1
+            continue
+        items.append(_ingest_item(payload))
+    records = evaluate_and_log_batch(items, explain=batch.explain) if items else []
+    return {"records": records, "count": len(records), "duplicates": duplicates}
 
 
 # ============================================================
@@ -484,7 +629,7 @@ def evaluate(req: EvalIn):
         ) if req.context else None,
         agent_id=req.agent_id, tenant_id=req.tenant_id,
     )
-    result = engine.evaluate(eval_req)
+    result = policy_registry.engine_for(eval_req.tenant_id).evaluate(eval_req)
     return result.to_dict()
 
 
@@ -493,8 +638,20 @@ def evaluate(req: EvalIn):
 # ============================================================
 
 @app.get("/api/v1/actions")
-def get_actions():
-    return {"actions": action_log}
+def get_actions(limit: int = 100, offset: int = 0):
+    limit = max(1, min(limit, 1000))
+    return {
+        "actions": action_store.list_actions(limit=limit, offset=max(0, offset)),
+        "total": action_store.count_actions(),
+        "limit": limit,
+        "offset": offset,
+    }
+
+@app.get("/api/v1/actions/export")
+def export_actions():
+    """Action log as JSONL, oldest first — input for python -m surfit_wave.simulator."""
+    lines = (json.dumps(record, default=str) + "\n" for record in action_store.iter_actions())
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 @app.get("/api/v1/health")
 def health():
@@ -503,18 +660,24 @@ def health():
         "slack_configured": bool(SLACK_SIGNING_SECRET),
         "slack_bot_token": bool(SLACK_BOT_TOKEN),
         "execution_gate": True,
-        "pending_actions": len([p for p in pending_actions if p["status"] == "pending"]),
+        "pending_actions": action_store.count_pending(),
+        "queued_deliveries": delivery_queue.pending_count(),
+        "event_ingest": event_pipeline.stats(),
         "endpoints": [
             "POST /api/v1/governance/evaluate",
             "POST /api/v1/ingest/slack",
+            "POST /api/v1/ingest/slack/batch",
             "POST /api/v1/slack/command",
             "POST /api/v1/slack/events",
             "GET  /api/v1/pending",
             "POST /api/v1/pending/{id}/approve",
             "POST /api/v1/pending/{id}/reject",
             "GET  /api/v1/actions",
+            "GET  /api/v1/actions/export",
         ],
-        "ingested_actions": len(action_log),
+        "ingested_actions": action_store.count_actions(),
+        "evaluation_cache": policy_registry.cache_stats(),
+        "policy_registry": policy_registry.stats(),
     }
 
 if __name__ == "__main__":
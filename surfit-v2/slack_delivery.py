@@ -0,0 +1,291 @@
+"""
+SURFIT V2 — Slack Delivery Worker
+Outbound chat.postMessage calls run on a small worker pool instead of inside
+request handlers. Deliveries are idempotent per action id, rate limited per
+workspace (honoring Slack's Retry-After), and retried with backoff.
+"""
+
+from dataclasses import dataclass, field
+from collections import OrderedDict
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Slack errors that will not succeed on retry.
+PERMANENT_ERRORS = frozenset({
+    "channel_not_found", "not_in_channel", "is_archived", "msg_too_long", "no_text",
+    "invalid_auth", "not_authed", "account_inactive", "token_revoked", "missing_scope",
+    "no_bot_token",
+})
+
+
+class SlackWebClient:
+    """Minimal chat.postMessage client. api_base can point at a fake Slack for tests."""
+
+    def __init__(self, token: str, api_base: str = "https://slack.com/api", timeout: float = 10.0):
+        self.token = token
+        self.api_base = api_base.rstrip("/")
+        self.timeout = timeout
+
+    def post_message(self, channel: str, text: str) -> Tuple[int, Dict[str, str], Dict[str, Any]]:
+        """
+        Returns (http_status, headers, body). Transport errors raise OSError;
+        an unreadable body comes back as error "invalid_response".
+        """
+        if not self.token:
+            return 200, {}, {"ok": False, "error": "no_bot_token", "note": "Set SLACK_BOT_TOKEN to enable real posting"}
+        req = urllib.request.Request(
+            f"{self.api_base}/chat.postMessage",
+            data=json.dumps({"channel": channel, "text": text}).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json; charset=utf-8",
+                "Authorization": f"Bearer {self.token}",
+            },
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                status, headers, raw = resp.status, dict(resp.headers), resp.read()
+        except urllib.error.HTTPError as e:
+            body = _parse_body(e.read())
+            body.setdefault("ok", False)
+            body.setdefault("error", f"http_{e.code}")
+            return e.code, dict(e.headers or {}), body
+        body = _parse_body(raw)
+        if not isinstance(body.get("ok"), bool):
+            body = {"ok": False, "error": "invalid_response"}
+        return status, headers, body
+
+
+def _parse_body(raw: bytes) -> Dict[str, Any]:
+    """JSON object body, or {} if it is not valid UTF-8 JSON."""
+    try:
+        body = json.loads(raw.decode("utf-8") or "{}")
+    except ValueError:  # includes UnicodeDecodeError
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+@dataclass
+class DeliveryTicket:
+    """Handle for one queued delivery; wait() blocks until it is final."""
+    action_id: str
+    workspace: str
+    channel: str
+    text: str
+    attempts: int = 0
+    status: str = "queued"          # queued / delivered / failed
+    result: Dict[str, Any] = field(default_factory=dict)
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "attempts": self.attempts,
+            "ok": self.result.get("ok"),
+            "ts": self.result.get("ts"),
+            "error": self.result.get("error"),
+        }
+
+
+class SlackDeliveryQueue:
+    """
+    Worker pool draining a time-ordered queue of DeliveryTickets.
+
+    Each workspace has its own heap of tickets ordered by (ready_at, seq).
+    A schedule heap holds one entry per non-empty workspace, keyed by when
+    its head ticket may go out (its ready_at, or later if the workspace is
+    rate limited), so a throttled workspace never holds up the others and
+    every dequeue is a heappop. Schedule entries go stale when a workspace's
+    head or limit changes; stale ones are skipped as they surface.
+
+    on_update(ticket) is called from a worker thread whenever a ticket reaches
+    a final state, so the caller can write delivery status back to its
+    action record.
+    """
+
+    def __init__(
+        self,
+        client: SlackWebClient,
+        *,
+        workers: int = 4,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: float = 60.0,
+        min_interval_seconds: float = 1.0,
+        on_update: Optional[Callable[[DeliveryTicket], None]] = None,
+        max_tracked: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.on_update = on_update
+        self.max_tracked = max(1, int(max_tracked))
+        self.clock = clock
+        self._cv = threading.Condition()
+        self._pending: Dict[str, list] = {}  # workspace -> heap of (ready_at, seq, ticket)
+        self._pending_total = 0
+        self._schedule: list = []  # (due, ready_at, seq, workspace)
+        self._scheduled: Dict[str, Tuple[float, float, int, str]] = {}  # workspace -> its live schedule entry
+        self._seq = itertools.count()
+        self._tickets: Dict[str, DeliveryTicket] = {}  # idempotency index
+        self._finished: "OrderedDict[str, None]" = OrderedDict()  # finished action ids, oldest first
+        self._workspace_ready_at: Dict[str, float] = {}
+        self._threads: list = []
+        self._stopping = False
+
+    def start(self) -> None:
+        with self._cv:
+            if self._threads:
+                return
+            self._stopping = False
+            for idx in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"slack-delivery-{idx}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cv:
+            self._stopping = True
+            self._cv.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, action_id: str, channel: str, text: str, workspace: str = "default") -> DeliveryTicket:
+        """Queue a post; a second enqueue for the same action id returns the existing ticket."""
+        with self._cv:
+            existing = self._tickets.get(action_id)
+            if existing is not None:
+                return existing
+            ticket = DeliveryTicket(action_id=action_id, workspace=workspace or "default", channel=channel, text=text)
+            self._tickets[action_id] = ticket
+            self._push(ticket, self.clock())
+            return ticket
+
+    def get(self, action_id: str) -> Optional[DeliveryTicket]:
+        with self._cv:
+            return self._tickets.get(action_id)
+
+    def pending_count(self) -> int:
+        with self._cv:
+            return self._pending_total
+
+    def _push(self, ticket: DeliveryTicket, ready_at: float) -> None:
+        """Queue ticket (caller holds the lock)."""
+        heapq.heappush(self._pending.setdefault(ticket.workspace, []), (ready_at, next(self._seq), ticket))
+        self._pending_total += 1
+        self._reschedule(ticket.workspace)
+        self._cv.notify()
+
+    def _reschedule(self, workspace: str) -> None:
+        """Point the schedule at the workspace's current head (caller holds the lock)."""
+        heap = self._pending.get(workspace)
+        if not heap:
+            self._pending.pop(workspace, None)
+            self._scheduled.pop(workspace, None)
+            return
+        ready_at, seq, _ = heap[0]
+        due = max(ready_at, self._workspace_ready_at.get(workspace, 0.0))
+        entry = (due, ready_at, seq, workspace)
+        if self._scheduled.get(workspace) != entry:
+            self._scheduled[workspace] = entry
+            heapq.heappush(self._schedule, entry)
+
+    def _next_ticket(self) -> Optional[DeliveryTicket]:
+        with self._cv:
+            while not self._stopping:
+                # Drop entries superseded by a newer head or rate limit.
+                while self._schedule and self._scheduled.get(self._schedule[0][3]) != self._schedule[0]:
+                    heapq.heappop(self._schedule)
+                if not self._schedule:
+                    self._cv.wait()
+                    continue
+                now = self.clock()
+                due = self._schedule[0][0]
+                if due > now:
+                    self._cv.wait(due - now)
+                    continue
+                workspace = heapq.heappop(self._schedule)[3]
+                del self._scheduled[workspace]
+                ticket = heapq.heappop(self._pending[workspace])[2]
+                self._pending_total -= 1
+                # Reserve the workspace's next send slot before releasing the lock.
+                self._workspace_ready_at[workspace] = now + self.min_interval_seconds
+                self._reschedule(workspace)
+                return ticket
+            return None
+
+    def _run(self) -> None:
+        while True:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            self.deliver_once(ticket)
+
+    def deliver_once(self, ticket: DeliveryTicket) -> None:
+        ticket.attempts += 1
+        try:
+            status_code, headers, body = self.client.post_message(ticket.channel, ticket.text)
+        except (OSError, ValueError) as e:
+            status_code, headers, body = 0, {}, {"ok": False, "error": str(e)}
+
+        if body.get("ok"):
+            self._finish(ticket, "delivered", body)
+            return
+
+        error = body.get("error") or f"http_{status_code}"
+        retry_after = None
+        if status_code == 429 or error == "ratelimited":
+            try:
+                retry_after = float(headers.get("Retry-After") or headers.get("retry-after") or 1)
+            except ValueError:
+                retry_after = 1.0
+        if error in PERMANENT_ERRORS or ticket.attempts >= self.max_attempts:
+            self._finish(ticket, "failed", body)
+            return
+
+        now = self.clock()
+        if retry_after is not None:
+            delay = retry_after
+        else:
+            delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (ticket.attempts - 1)))
+            delay *= 0.5 + random.random() / 2
+        ticket.result = body
+        with self._cv:
+            if retry_after is not None:
+                # Slack limits per workspace: hold every delivery for it.
+                self._workspace_ready_at[ticket.workspace] = max(
+                    self._workspace_ready_at.get(ticket.workspace, 0.0), now + retry_after
+                )
+            self._push(ticket, now + delay)
+
+    def _finish(self, ticket: DeliveryTicket, status: str, body: Dict[str, Any]) -> None:
+        ticket.status = status
+        ticket.result = body
+        if self.on_update is not None:
+            try:
+                self.on_update(ticket)
+            except Exception:
+                logger.exception("status update failed for %s", ticket.action_id)
+        ticket._done.set()
+        with self._cv:
+            # Forget the oldest finished tickets once the index is over budget.
+            self._finished[ticket.action_id] = None
+            while len(self._tickets) > self.max_tracked and self._finished:
+                self._tickets.pop(self._finished.popitem(last=False)[0], None)
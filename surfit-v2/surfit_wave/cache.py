@@ -0,0 +1,59 @@
+"""
+SURFIT Wave Engine — Evaluation Cache
+Bounded LRU of WaveResults keyed by the request fields that can affect the
+score. Results are frozen and shared between callers.
+"""
+
+from collections import OrderedDict
+import threading
+from typing import Any, Dict, Hashable, Optional
+
+from .models import WaveResult
+
+
+class EvaluationCache:
+    """Thread-safe LRU with hit/miss/eviction counters."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, WaveResult]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[WaveResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return result
+
+    def put(self, key: Hashable, result: WaveResult) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -4,13 +4,16 @@ WAVE = BASE SYSTEM RISK + ACTION TYPE MODIFIER + DESTINATION MODIFIER + CONTEXT
 Deterministic. Explainable. Configurable.
 """
 
-from typing import Optional
+from typing import Optional, Sequence, Union
 from .models import (
-    EvaluateRequest, WaveResult, ContributingFactor,
-    ResourceInfo, ContextInfo
+    EvaluateRequest, WaveResult, WaveDecision, ContributingFactor,
+    ResourceInfo, ContextInfo,
+    FACTOR_OVERRIDE, FACTOR_BASELINE, FACTOR_ACTION, FACTOR_DESTINATION, FACTOR_CONTEXT,
 )
-from .policy import CustomerPolicy, load_default_policy
+from .policy import CustomerPolicy, CompiledPolicy, load_default_policy
 from .classifier import DestinationClassifier
+from .batch import BatchResult, evaluate_batch
+from .cache import EvaluationCache
 
 
 class WaveEngine:
@@ -24,14 +27,65 @@ class WaveEngine:
     - Every contributing factor with its modifier value
     """
 
-    def __init__(self, policy: Optional[CustomerPolicy] = None):
-        self.policy = policy or load_default_policy()
-        self.classifier = DestinationClassifier(self.policy)
+    def __init__(self, policy: Optional[CustomerPolicy] = None, cache_size: int = 4096):
+        self.cache = EvaluationCache(cache_size)
+        self.set_policy(policy or load_default_policy())
 
-    def evaluate(self, request: EvaluateRequest) -> WaveResult:
+    def set_policy(self, policy: CustomerPolicy) -> None:
+        """Swap in a policy (or re-read an edited one); recompiles and clears the cache."""
+        self.policy = policy
+        self.compiled = CompiledPolicy(policy)
+        self.classifier = DestinationClassifier(policy, self.compiled)
+        self._compiled_for = policy
+        self._context_fields = tuple(dict.fromkeys(cm.field_name for cm in policy.context_modifiers))
+        self.cache.clear()
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+    def evaluate(self, request: EvaluateRequest, explain: bool = True) -> Union[WaveResult, WaveDecision]:
+        """
+        Evaluate an action request, serving repeated requests from the cache.
+        Only the fields that feed the score are part of the cache key.
+
+        explain=False returns a compact WaveDecision (no reason strings or
+        factor objects); pass it to explain() later if the reasons are needed.
+        """
+        if self.policy is not self._compiled_for:
+            self.set_policy(self.policy)
+        key = self._fingerprint(request)
+        if key is None:
+            decision = self._decide(request)
+            return self.explain(decision) if explain else decision
+        key = (key, explain)
+        result = self.cache.get(key)
+        if result is None:
+            decision = self._decide(request)
+            result = self.explain(decision) if explain else decision
+            self.cache.put(key, result)
+        return result
+
+    def _fingerprint(self, request: EvaluateRequest):
+        resource = request.resource or ResourceInfo()
+        context = request.context or ContextInfo()
+        key = (
+            request.system.lower(),
+            request.action.lower(),
+            resource.resource_id,
+            resource.resource_name,
+            resource.destination_class,
+            tuple(self._get_context_value(context, f) for f in self._context_fields),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None  # unhashable custom context value; skip the cache
+        return key
+
+    def _decide(self, request: EvaluateRequest) -> WaveDecision:
         """
-        Evaluate an action request and assign a wave.
-        
+        Score an action request without building any explanation.
+
         Logic:
         1. Check for forced overrides
         2. Start with system baseline
@@ -40,11 +94,7 @@ class WaveEngine:
         5. Apply context modifiers
         6. Clamp to 1-5
         7. Map to handling decision
-        8. Return full explanation
         """
-        factors = []
-        reasons = []
-        
         system = request.system.lower()
         action = request.action.lower()
         resource = request.resource or ResourceInfo()
@@ -52,30 +102,84 @@ class WaveEngine:
 
         # ── Step 0: Check overrides ──
         dest_class, dest_group = self.classifier.classify(system, resource)
-        override = self.policy.find_override(
-            system, action,
-            resource.resource_name,
-            dest_class
+        override = self.compiled.find_override(system, action, resource.resource_name, dest_class)
+        if override and override.forced_wave is not None and override.forced_handling is not None:
+            return WaveDecision(
+                wave_score=override.forced_wave,
+                handling=override.forced_handling,
+                destination_class_resolved=dest_class,
+                raw_score=None,
+                factor_codes=(FACTOR_OVERRIDE,),
+                system=system,
+                action=action,
+                override=override,
+            )
+
+        # ── Steps 1-3: baseline, action modifier, destination ──
+        codes = [FACTOR_BASELINE]
+        score = self.compiled.get_system_baseline(system)
+        action_mod = self.compiled.get_action_modifier(system, action)
+        if action_mod:
+            codes.append(FACTOR_ACTION)
+            score += action_mod.modifier
+        if dest_group:
+            codes.append(FACTOR_DESTINATION)
+            score += dest_group.risk_modifier
+
+        # ── Step 4: Context modifiers ──
+        for idx, cm in enumerate(self.policy.context_modifiers):
+            ctx_value = self._get_context_value(context, cm.field_name)
+            if ctx_value is not None and ctx_value == cm.trigger_value:
+                codes.append(FACTOR_CONTEXT + idx)
+                # Special case: approval_required_override forces wave 5
+                if cm.modifier >= 99:
+                    score = 99  # will clamp to 5
+                else:
+                    score += cm.modifier
+
+        # ── Steps 5-6: Clamp to 1-5, determine handling ──
+        wave = max(1, min(5, score))
+        return WaveDecision(
+            wave_score=wave,
+            handling=self.compiled.get_handling_for_wave(wave),
+            destination_class_resolved=dest_class,
+            raw_score=score,
+            factor_codes=tuple(codes),
+            system=system,
+            action=action,
+            group=dest_group,
         )
-        
-        if override:
-            if override.forced_wave is not None and override.forced_handling is not None:
-                wave = override.forced_wave
-                handling = override.forced_handling
-                reason = f"Override applied: {override.reason}" if override.reason else "Explicit override"
-                return WaveResult(
-                    wave_score=wave,
-                    wave_label=f"Wave {wave}",
-                    handling=handling,
-                    reasons=[reason],
-                    contributing_factors=[
-                        ContributingFactor("override", f"{system}/{action}", wave, reason)
-                    ],
-                    destination_class_resolved=dest_class,
-                )
-
-        # ── Step 1: System baseline ──
-        baseline = self.policy.get_system_baseline(system)
+
+    def explain(self, decision: WaveDecision, compiled: Optional[CompiledPolicy] = None) -> WaveResult:
+        """
+        Render the full explanation (reasons + contributing factors) for a
+        decision produced by this engine under its current policy, or under
+        `compiled` when the decision was scored against an earlier one.
+        """
+        compiled = compiled or self.compiled
+        system, action = decision.system, decision.action
+        dest_class = decision.destination_class_resolved
+        score = decision.wave_score
+        codes = decision.factor_codes
+
+        if codes and codes[0] == FACTOR_OVERRIDE:
+            override = decision.override
+            reason = f"Override applied: {override.reason}" if override.reason else "Explicit override"
+            return WaveResult(
+                wave_score=score,
+                wave_label=f"Wave {score}",
+                handling=decision.handling,
+                reasons=(reason,),
+                contributing_factors=(
+                    ContributingFactor("override", f"{system}/{action}", score, reason),
+                ),
+                destination_class_resolved=dest_class,
+            )
+
+        factors = []
+        reasons = []
+
+        baseline = compiled.get_system_baseline(system)
         factors.append(ContributingFactor(
             source="system_baseline",
             key=system,
@@ -83,10 +187,8 @@ class WaveEngine:
             description=f"System baseline: {system}={baseline}"
         ))
         reasons.append(f"System baseline: {system}={baseline}")
-        score = baseline
 
-        # ── Step 2: Action type modifier ──
-        action_mod = self.policy.get_action_modifier(system, action)
+        action_mod = compiled.get_action_modifier(system, action)
         if action_mod:
             factors.append(ContributingFactor(
                 source="action_modifier",
@@ -95,11 +197,10 @@ class WaveEngine:
                 description=f"Action modifier: {action}={action_mod.modifier:+d} ({action_mod.description})"
             ))
             reasons.append(f"Action modifier: {action}={action_mod.modifier:+d}")
-            score += action_mod.modifier
         else:
             reasons.append(f"Action modifier: {action}=+0 (no specific modifier)")
 
-        # ── Step 3: Destination classification ──
+        dest_group = decision.group
         if dest_group:
             factors.append(ContributingFactor(
                 source="destination_modifier",
@@ -108,57 +209,57 @@ class WaveEngine:
                 description=f"Destination: {dest_class}={dest_group.risk_modifier:+d} ({dest_group.description})"
             ))
             reasons.append(f"Destination: {dest_class}={dest_group.risk_modifier:+d}")
-            score += dest_group.risk_modifier
         elif dest_class:
             reasons.append(f"Destination: {dest_class}=+0 (no group config)")
 
-        # ── Step 4: Context modifiers ──
-        for cm in self.policy.context_modifiers:
-            ctx_value = self._get_context_value(context, cm.field_name)
-            if ctx_value is not None and ctx_value == cm.trigger_value:
-                # Special case: approval_required_override forces wave 5
-                if cm.modifier >= 99:
-                    score = 99  # will clamp to 5
-                    factors.append(ContributingFactor(
-                        source="context_modifier",
-                        key=f"{cm.field_name}={cm.trigger_value}",
-                        modifier=cm.modifier,
-                        description=f"Context override: {cm.description}"
-                    ))
-                    reasons.append(f"Context override: {cm.description}")
-                else:
-                    factors.append(ContributingFactor(
-                        source="context_modifier",
-                        key=f"{cm.field_name}={cm.trigger_value}",
-                        modifier=cm.modifier,
-                        description=f"Context: {cm.field_name}={cm.trigger_value} => {cm.modifier:+d} ({cm.description})"
-                    ))
-                    reasons.append(f"Context: {cm.field_name}={cm.trigger_value} => {cm.modifier:+d}")
-                    score += cm.modifier
-
-        # ── Step 5: Clamp to 1-5 ──
-        raw_score = score
-        score = max(1, min(5, score))
-
-        # ── Step 6: Determine handling ──
-        handling = self.policy.get_handling_for_wave(score)
+        for code in codes:
+            if code < FACTOR_CONTEXT:
+                continue
+            cm = compiled.policy.context_modifiers[code - FACTOR_CONTEXT]
+            if cm.modifier >= 99:
+                factors.append(ContributingFactor(
+                    source="context_modifier",
+                    key=f"{cm.field_name}={cm.trigger_value}",
+                    modifier=cm.modifier,
+                    description=f"Context override: {cm.description}"
+                ))
+                reasons.append(f"Context override: {cm.description}")
+            else:
+                factors.append(ContributingFactor(
+                    source="context_modifier",
+                    key=f"{cm.field_name}={cm.trigger_value}",
+                    modifier=cm.modifier,
+                    description=f"Context: {cm.field_name}={cm.trigger_value} => {cm.modifier:+d} ({cm.description})"
+                ))
+                reasons.append(f"Context: {cm.field_name}={cm.trigger_value} => {cm.modifier:+d}")
 
         # If action modifier suggested specific handling, note it
         if action_mod and action_mod.default_handling:
             reasons.append(f"Action suggests: {action_mod.default_handling} (wave threshold takes precedence)")
 
-        reasons.append(f"Final: Wave {score} => {handling}")
+        reasons.append(f"Final: Wave {score} => {decision.handling}")
 
         return WaveResult(
             wave_score=score,
             wave_label=f"Wave {score}",
-            handling=handling,
-            reasons=reasons,
-            contributing_factors=factors,
+            handling=decision.handling,
+            reasons=tuple(reasons),
+            contributing_factors=tuple(factors),
             destination_class_resolved=dest_class,
-            raw_score=raw_score,
+            raw_score=decision.raw_score,
         )
 
+    def evaluate_batch(self, requests: Sequence[EvaluateRequest]) -> BatchResult:
+        """
+        Evaluate many requests at once.
+        Scores match evaluate() row for row; reasons are only built when
+        BatchResult.result(i) or to_dicts(explain=True) is called, without
+        scoring the request again.
+        """
+        if self.policy is not self._compiled_for:
+            self.set_policy(self.policy)
+        return evaluate_batch(self, requests)
+
     def _get_context_value(self, context: ContextInfo, field_name: str):
         """Extract a value from context by field name."""
         if hasattr(context, field_name):
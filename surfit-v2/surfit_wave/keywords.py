@@ -0,0 +1,76 @@
+"""
+SURFIT Wave Engine — Keyword Matcher
+Aho–Corasick automaton over all heuristic keyword lists of a system, so
+name-based classification costs O(len(name)) however many keywords are
+configured.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Matches a name against prioritized (destination_class, keyword) pairs.
+
+    When several keywords occur in the name, the class with the lowest
+    priority value wins; ties go to the class registered first.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, str, Iterable[str]]]):
+        # Node 0 is the root. _best[node] is the winning (priority, order, class)
+        # of every keyword ending at that node or any of its suffix links.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[Tuple[int, int, str]]] = [None]
+
+        for order, (priority, dest_class, keywords) in enumerate(entries):
+            for kw in keywords:
+                kw = kw.lower()
+                if kw:
+                    self._add(kw, (priority, order, dest_class))
+        self._link()
+
+    def _add(self, keyword: str, label: Tuple[int, int, str]) -> None:
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = nxt
+        current = self._best[node]
+        if current is None or label < current:
+            self._best[node] = label
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited < self._best[child]):
+                    self._best[child] = inherited
+
+    def match(self, name: str) -> Optional[str]:
+        """Destination class of the highest-priority keyword found in name."""
+        goto, fail, best_at = self._goto, self._fail, self._best
+        node = 0
+        best = None
+        for ch in name.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            label = best_at[node]
+            if label is not None and (best is None or label < best):
+                best = label
+        return best[2] if best else None
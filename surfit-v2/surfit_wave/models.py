@@ -3,8 +3,8 @@ SURFIT Wave Engine — Data Models
 Deterministic, explainable, configurable wave assignment.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Any
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Dict, Any, Tuple
 from enum import Enum
 
 
@@ -40,7 +40,7 @@ class DestinationClass(str, Enum):
 # INPUT MODELS
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ResourceInfo:
     """Describes the target resource/destination of an action."""
     resource_id: Optional[str] = None
@@ -48,7 +48,7 @@ class ResourceInfo:
     destination_class: Optional[str] = None  # Will be resolved if not provided
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextInfo:
     """Contextual modifiers that affect risk scoring."""
     env: str = "prod"                    # prod / staging / dev
@@ -61,7 +61,7 @@ class ContextInfo:
     custom: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentMetadata:
     """Optional secondary signal. NOT the primary classifier."""
     message_type: Optional[str] = None
@@ -70,7 +70,7 @@ class ContentMetadata:
     estimated_reach: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluateRequest:
     """Full input to the wave engine."""
     system: str
@@ -81,12 +81,31 @@ class EvaluateRequest:
     agent_id: Optional[str] = None
     tenant_id: Optional[str] = None
 
+    def to_dict(self) -> dict:
+        """JSON-safe form, stored in action logs so they can be replayed."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EvaluateRequest":
+        resource = data.get("resource")
+        context = data.get("context")
+        content = data.get("content_metadata")
+        return cls(
+            system=data["system"],
+            action=data["action"],
+            resource=ResourceInfo(**resource) if resource else None,
+            context=ContextInfo(**context) if context else None,
+            content_metadata=ContentMetadata(**content) if content else None,
+            agent_id=data.get("agent_id"),
+            tenant_id=data.get("tenant_id"),
+        )
+
 
 # ============================================================
 # OUTPUT MODELS
 # ============================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ContributingFactor:
     """One factor that contributed to the wave score."""
     source: str         # e.g., "system_baseline", "action_modifier", "context_modifier"
@@ -95,14 +114,14 @@ class ContributingFactor:
     description: str    # human-readable explanation
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WaveResult:
-    """Complete output of wave evaluation."""
+    """Complete output of wave evaluation. Immutable: cached results are shared."""
     wave_score: int
     wave_label: str
     handling: str
-    reasons: List[str]
-    contributing_factors: List[ContributingFactor]
+    reasons: Tuple[str, ...]
+    contributing_factors: Tuple[ContributingFactor, ...]
     destination_class_resolved: Optional[str] = None
     raw_score: Optional[int] = None  # before clamping to 1-5
 
@@ -111,10 +130,50 @@ class WaveResult:
             "wave_score": self.wave_score,
             "wave_label": self.wave_label,
             "handling": self.handling,
-            "reasons": self.reasons,
+            "reasons": list(self.reasons),
             "contributing_factors": [
                 {"source": f.source, "key": f.key, "modifier": f.modifier, "description": f.description}
                 for f in self.contributing_factors
             ],
             "destination_class_resolved": self.destination_class_resolved,
         }
+
+
+# Factor codes carried by WaveDecision. Context modifiers are encoded as
+# FACTOR_CONTEXT + their index in CustomerPolicy.context_modifiers.
+FACTOR_OVERRIDE = 0
+FACTOR_BASELINE = 1
+FACTOR_ACTION = 2
+FACTOR_DESTINATION = 3
+FACTOR_CONTEXT = 16
+
+
+@dataclass(frozen=True, slots=True)
+class WaveDecision:
+    """
+    Compact evaluation output (explain=False): score, handling and factor
+    codes, with no reason strings. WaveEngine.explain renders the full
+    WaveResult on demand.
+    """
+    wave_score: int
+    handling: str
+    destination_class_resolved: Optional[str]
+    raw_score: Optional[int]
+    factor_codes: Tuple[int, ...]
+    system: str = field(default="", repr=False)
+    action: str = field(default="", repr=False)
+    group: Any = field(default=None, repr=False, compare=False)     # matched ResourceGroup
+    override: Any = field(default=None, repr=False, compare=False)  # applied Override
+
+    @property
+    def wave_label(self) -> str:
+        return f"Wave {self.wave_score}"
+
+    def to_dict(self) -> dict:
+        return {
+            "wave_score": self.wave_score,
+            "wave_label": self.wave_label,
+            "handling": self.handling,
+            "destination_class_resolved": self.destination_class_resolved,
+            "factor_codes": list(self.factor_codes),
+        }
@@ -4,10 +4,12 @@ Customer-editable policy that drives all wave assignment logic.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import json
 import os
 
+from .keywords import KeywordMatcher
+
 
 @dataclass
 class SystemConfig:
@@ -64,6 +66,14 @@ class Override:
     reason: str = ""
 
 
+@dataclass
+class KeywordClass:
+    """Name keywords that classify an unlisted resource (lowest priority wins)."""
+    destination_class: str
+    keywords: List[str] = field(default_factory=list)
+    priority: int = 100
+
+
 @dataclass
 class CustomerPolicy:
     """Complete customer policy configuration."""
@@ -87,6 +97,9 @@ class CustomerPolicy:
     # Specific overrides
     overrides: List[Override] = field(default_factory=list)
 
+    # Name-keyword heuristics per system, used when no explicit group matches
+    keyword_classes: Dict[str, List[KeywordClass]] = field(default_factory=dict)
+
     def get_system_baseline(self, system: str) -> int:
         cfg = self.systems.get(system)
         return cfg.base_risk if cfg else 2  # default moderate
@@ -126,6 +139,99 @@ class CustomerPolicy:
         return None
 
 
+
+_DEFAULT_HANDLING = {1: "auto", 2: "log", 3: "check", 4: "approve", 5: "approve"}
+
+
+class CompiledPolicy:
+    """
+    Read-only lookup tables built once from a CustomerPolicy.
+
+    Answers the same questions as the CustomerPolicy helpers with hash lookups
+    instead of scanning member lists, thresholds and overrides. First-match
+    order is preserved everywhere, so results are identical. Recompile after
+    editing the source policy.
+    """
+
+    def __init__(self, policy: CustomerPolicy):
+        self.policy = policy
+        self.baselines: Dict[str, int] = {k: v.base_risk for k, v in policy.systems.items()}
+        self.action_modifiers: Dict[Tuple[str, str], ActionModifier] = {
+            (system, action): mod
+            for system, actions in policy.action_modifiers.items()
+            for action, mod in actions.items()
+        }
+
+        self.groups_by_member: Dict[Tuple[str, str], ResourceGroup] = {}
+        self.groups_by_class: Dict[Tuple[str, str], ResourceGroup] = {}
+        for system, groups in policy.resource_groups.items():
+            for group in groups.values():
+                self.groups_by_class.setdefault((system, group.destination_class), group)
+                for member in group.members:
+                    self.groups_by_member.setdefault((system, member), group)
+
+        self.keyword_matchers: Dict[str, KeywordMatcher] = {
+            system: KeywordMatcher((kc.priority, kc.destination_class, kc.keywords) for kc in classes)
+            for system, classes in policy.keyword_classes.items()
+        }
+
+        self.handling_by_wave: Dict[int, str] = dict(_DEFAULT_HANDLING)
+        seen_waves = set()
+        for t in policy.handling_thresholds:
+            if t.wave not in seen_waves:
+                seen_waves.add(t.wave)
+                self.handling_by_wave[t.wave] = t.handling
+
+        # Overrides indexed by (system, action); action=None entries are
+        # wildcards merged into every specific action's list in policy order.
+        specific: Dict[Tuple[str, str], List[Tuple[int, Override]]] = {}
+        wildcard: Dict[str, List[Tuple[int, Override]]] = {}
+        for idx, o in enumerate(policy.overrides):
+            if o.action:
+                specific.setdefault((o.system, o.action), []).append((idx, o))
+            else:
+                wildcard.setdefault(o.system, []).append((idx, o))
+        self._wildcard_overrides: Dict[str, Tuple[Override, ...]] = {
+            system: tuple(o for _, o in entries) for system, entries in wildcard.items()
+        }
+        self._overrides: Dict[Tuple[str, str], Tuple[Override, ...]] = {
+            key: tuple(o for _, o in sorted(entries + wildcard.get(key[0], []), key=lambda e: e[0]))
+            for key, entries in specific.items()
+        }
+
+    def get_system_baseline(self, system: str) -> int:
+        return self.baselines.get(system, 2)
+
+    def get_action_modifier(self, system: str, action: str) -> Optional[ActionModifier]:
+        return self.action_modifiers.get((system, action))
+
+    def get_handling_for_wave(self, wave: int) -> str:
+        return self.handling_by_wave.get(wave, "check")
+
+    def find_override(self, system: str, action: str, resource_name: Optional[str], dest_class: Optional[str]) -> Optional[Override]:
+        candidates = self._overrides.get((system, action))
+        if candidates is None:
+            candidates = self._wildcard_overrides.get(system, ())
+        for o in candidates:
+            if o.resource_name and o.resource_name != resource_name:
+                continue
+            if o.destination_class and o.destination_class != dest_class:
+                continue
+            return o
+        return None
+
+    def classify_resource(self, system: str, resource_name: Optional[str]) -> Optional[ResourceGroup]:
+        if not resource_name:
+            return None
+        return self.groups_by_member.get((system, resource_name))
+
+    def find_group_by_class(self, system: str, dest_class: str) -> Optional[ResourceGroup]:
+        return self.groups_by_class.get((system, dest_class))
+
+    def match_keywords(self, system: str, name: str) -> Optional[str]:
+        matcher = self.keyword_matchers.get(system)
+        return matcher.match(name) if matcher else None
+
 def load_default_policy() -> CustomerPolicy:
     """Load the default policy configuration."""
     return CustomerPolicy(
@@ -248,6 +354,17 @@ def load_default_policy() -> CustomerPolicy:
         ],
         
         overrides=[],
+
+        keyword_classes={
+            "slack": [
+                KeywordClass(destination_class="company_announcement", priority=10,
+                             keywords=["announcement", "all-hands", "company-", "exec-", "leadership"]),
+                KeywordClass(destination_class="external_shared_channel", priority=20,
+                             keywords=["external", "shared-", "partner-", "client-"]),
+                KeywordClass(destination_class="sensitive_channel", priority=30,
+                             keywords=["security", "legal", "hr-", "confidential", "incident"]),
+            ],
+        },
     )
 
 
@@ -274,5 +391,23 @@ def load_policy_from_json(path: str) -> CustomerPolicy:
     if "overrides" in data:
         for o in data["overrides"]:
             policy.overrides.append(Override(**o))
+
+    # A keyword class for an existing destination_class replaces its keywords
+    # and keeps its priority unless one is given; new classes are added after
+    # the defaults unless a priority is given.
+    if "keyword_classes" in data:
+        for sys_key, classes in data["keyword_classes"].items():
+            existing = policy.keyword_classes.setdefault(sys_key, [])
+            for kc_data in classes:
+                kc = KeywordClass(**kc_data)
+                replaced = next((e for e in existing if e.destination_class == kc.destination_class), None)
+                if "priority" not in kc_data:
+                    if replaced is not None:
+                        kc.priority = replaced.priority
+                    else:
+                        kc.priority = max((e.priority for e in existing), default=0) + 10
+                if replaced is not None:
+                    existing.remove(replaced)
+                existing.append(kc)
     
     return policy
@@ -0,0 +1,153 @@
+"""
+SURFIT Wave Engine — Tenant Policy Registry
+Routes evaluations to a per-tenant WaveEngine loaded from
+<policy_dir>/<tenant_id>.json, compiled once and hot-swapped when the file
+changes.
+"""
+
+from collections import OrderedDict
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .engine import WaveEngine
+from .policy import load_policy_from_json
+
+_TENANT_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+
+class PolicyRegistry:
+    """
+    LRU of resident tenant engines.
+
+    Each tenant's file is re-stat'ed at most once per check_interval_seconds;
+    a changed mtime/size loads and compiles a fresh engine off to the side and
+    swaps it in under the lock, so in-flight evaluations keep using the old
+    one. Unknown tenants, invalid tenant ids and unreadable policies fall back
+    to the default engine (or the last good engine for that tenant).
+    """
+
+    def __init__(
+        self,
+        policy_dir: Optional[str],
+        *,
+        default_engine: Optional[WaveEngine] = None,
+        max_resident: int = 64,
+        check_interval_seconds: float = 2.0,
+        cache_size: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy_dir = policy_dir
+        self.default_engine = default_engine or WaveEngine(cache_size=cache_size)
+        self.max_resident = max(1, int(max_resident))
+        self.check_interval_seconds = check_interval_seconds
+        self.cache_size = cache_size
+        self.clock = clock
+        self._lock = threading.Lock()
+        # tenant_id -> (engine, file signature, last check time)
+        self._engines: "OrderedDict[str, Tuple[WaveEngine, Tuple[int, int], float]]" = OrderedDict()
+        self._loads = 0
+        self._reloads = 0
+        self._load_errors = 0
+        self._evictions = 0
+        # Counters of tenant engines that were reloaded or evicted, so totals stay cumulative.
+        self._retired_cache = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def engine_for(self, tenant_id: Optional[str]) -> WaveEngine:
+        if not self.policy_dir or not tenant_id or not _TENANT_ID_RE.match(tenant_id):
+            return self.default_engine
+        now = self.clock()
+        with self._lock:
+            entry = self._engines.get(tenant_id)
+            if entry is not None:
+                self._engines.move_to_end(tenant_id)
+                if now - entry[2] < self.check_interval_seconds:
+                    return entry[0]
+
+        path = os.path.join(self.policy_dir, f"{tenant_id}.json")
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                removed = self._engines.pop(tenant_id, None)
+                if removed is not None:
+                    self._retire(removed[0])
+            return self.default_engine
+        signature = (st.st_mtime_ns, st.st_size)
+        if entry is not None and entry[1] == signature:
+            with self._lock:
+                self._store(tenant_id, (entry[0], signature, now))
+            return entry[0]
+
+        try:
+            engine = WaveEngine(load_policy_from_json(path), cache_size=self.cache_size)
+        except (OSError, ValueError, TypeError, AttributeError):
+            with self._lock:
+                self._load_errors += 1
+                if entry is not None:
+                    # Keep serving the last good policy; retry after the interval.
+                    self._store(tenant_id, (entry[0], entry[1], now))
+                    return entry[0]
+                # Serve the default until this broken file changes.
+                self._store(tenant_id, (self.default_engine, signature, now))
+            return self.default_engine
+
+        with self._lock:
+            if entry is None:
+                self._loads += 1
+            else:
+                self._reloads += 1
+            self._store(tenant_id, (engine, signature, now))
+        return engine
+
+    def _store(self, tenant_id: str, entry: Tuple[WaveEngine, Tuple[int, int], float]) -> None:
+        previous = self._engines.get(tenant_id)
+        if previous is not None and previous[0] is not entry[0]:
+            self._retire(previous[0])
+        self._engines[tenant_id] = entry
+        self._engines.move_to_end(tenant_id)
+        while len(self._engines) > self.max_resident:
+            _, (evicted, _, _) = self._engines.popitem(last=False)
+            self._retire(evicted)
+            self._evictions += 1
+
+    def _retire(self, engine: WaveEngine) -> None:
+        if engine is self.default_engine:
+            return
+        stats = engine.cache_stats()
+        for key in self._retired_cache:
+            self._retired_cache[key] += stats[key]
+
+    def cache_stats(self) -> Dict[str, object]:
+        """
+        Evaluation cache stats for the default engine and each resident
+        tenant engine, plus totals across all of them (hits, misses and
+        evictions include tenant engines since reloaded or evicted).
+        """
+        with self._lock:
+            tenants = {tid: entry[0] for tid, entry in self._engines.items() if entry[0] is not self.default_engine}
+            retired = dict(self._retired_cache)
+        default = self.default_engine.cache_stats()
+        per_tenant = {tid: engine.cache_stats() for tid, engine in tenants.items()}
+
+        total = {"size": 0, "max_entries": 0, **retired}
+        for stats in [default, *per_tenant.values()]:
+            for key in ("size", "max_entries", "hits", "misses", "evictions"):
+                total[key] += stats[key]
+        lookups = total["hits"] + total["misses"]
+        total["hit_ratio"] = round(total["hits"] / lookups, 4) if lookups else 0.0
+        return {"total": total, "default": default, "tenants": per_tenant}
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "policy_dir": self.policy_dir,
+                "resident_tenants": len(self._engines),
+                "max_resident": self.max_resident,
+                "loads": self._loads,
+                "reloads": self._reloads,
+                "load_errors": self._load_errors,
+                "evictions": self._evictions,
+            }
@@ -0,0 +1,221 @@
+"""
+SURFIT Wave Engine — Replay / What-If Simulator
+Re-scores historical action-log records (JSONL) under a candidate policy and
+reports how wave scores and handling decisions would move.
+
+    python -m surfit_wave.simulator --log actions.jsonl --policy candidate.json
+
+Records are streamed in chunks to worker processes; at most a few chunks per
+worker are in flight, so memory stays flat regardless of log size.
+"""
+
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections import Counter
+from dataclasses import dataclass, field
+import itertools
+import json
+import os
+from typing import Iterable, Iterator, List, Optional
+
+from .engine import WaveEngine
+from .models import EvaluateRequest, ResourceInfo, ContextInfo
+from .policy import CustomerPolicy, load_policy_from_json
+
+_BOOL_TEXT = {"True": True, "False": False, "true": True, "false": False}
+
+
+def request_from_record(record: dict) -> Optional[EvaluateRequest]:
+    """
+    Rebuild the evaluated request from an action-log record.
+
+    Records written with the request attached replay exactly. Older records
+    fall back to the logged resource/context, then to the channel fields plus
+    the context values named in the logged context-modifier factors.
+    """
+    if record.get("request"):
+        return EvaluateRequest.from_dict(record["request"])
+    if not record.get("system") or not record.get("action"):
+        return None
+
+    resource = record.get("resource") or {}
+    context = record.get("context")
+    if context is None:
+        context = {}
+        for factor in record.get("contributing_factors") or []:
+            if factor.get("source") != "context_modifier" or "=" not in factor.get("key", ""):
+                continue
+            name, value = factor["key"].split("=", 1)
+            context[name] = _BOOL_TEXT.get(value, value)
+    known = ContextInfo.__dataclass_fields__
+    return EvaluateRequest(
+        system=record["system"],
+        action=record["action"],
+        resource=ResourceInfo(
+            resource_id=resource.get("channel_id") or record.get("channel_id"),
+            resource_name=resource.get("channel_name") or record.get("channel_name") or resource.get("channel_id"),
+            destination_class=resource.get("destination_class"),
+        ),
+        context=ContextInfo(
+            **{k: v for k, v in context.items() if k in known and k != "custom"},
+            custom={k: v for k, v in context.items() if k not in known},
+        ),
+        tenant_id=record.get("tenant_id"),
+    )
+
+
+@dataclass
+class SimulationReport:
+    """Aggregated transitions between the baseline and candidate decisions."""
+    records: int = 0
+    scored: int = 0
+    skipped: int = 0
+    changed: int = 0
+    wave_transitions: Counter = field(default_factory=Counter)
+    handling_transitions: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "SimulationReport") -> None:
+        self.records += other.records
+        self.scored += other.scored
+        self.skipped += other.skipped
+        self.changed += other.changed
+        self.wave_transitions.update(other.wave_transitions)
+        self.handling_transitions.update(other.handling_transitions)
+
+    def to_dict(self) -> dict:
+        return {
+            "records": self.records,
+            "scored": self.scored,
+            "skipped": self.skipped,
+            "changed": self.changed,
+            "wave_transitions": {
+                f"{old}->{new}": n for (old, new), n in sorted(self.wave_transitions.items(), key=lambda kv: str(kv[0]))
+            },
+            "handling_transitions": {
+                f"{old}->{new}": n for (old, new), n in sorted(self.handling_transitions.items(), key=lambda kv: str(kv[0]))
+            },
+        }
+
+
+# Per-process engines, set once by _init_worker (or directly when running in-process).
+_CANDIDATE: Optional[WaveEngine] = None
+_BASELINE: Optional[WaveEngine] = None
+
+
+def _init_worker(candidate: CustomerPolicy, baseline: Optional[CustomerPolicy]) -> None:
+    global _CANDIDATE, _BASELINE
+    _CANDIDATE = WaveEngine(candidate, cache_size=0)
+    _BASELINE = WaveEngine(baseline, cache_size=0) if baseline is not None else None
+
+
+def _score_chunk(lines: List[str]) -> SimulationReport:
+    report = SimulationReport(records=len(lines))
+    records: List[dict] = []
+    requests: List[EvaluateRequest] = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            request = request_from_record(record)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            request = None
+        if request is None or (_BASELINE is None and record.get("wave_score") is None):
+            report.skipped += 1
+            continue
+        records.append(record)
+        requests.append(request)
+    if not requests:
+        return report
+
+    new = _CANDIDATE.evaluate_batch(requests)
+    if _BASELINE is not None:
+        old = _BASELINE.evaluate_batch(requests)
+        old_waves, old_handlings = old.wave_scores, old.handlings
+    else:
+        old_waves = [r["wave_score"] for r in records]
+        old_handlings = [r.get("handling") for r in records]
+
+    report.scored = len(requests)
+    for i in range(len(requests)):
+        wave_key = (old_waves[i], new.wave_scores[i])
+        handling_key = (old_handlings[i], new.handlings[i])
+        report.wave_transitions[wave_key] += 1
+        report.handling_transitions[handling_key] += 1
+        if wave_key[0] != wave_key[1] or handling_key[0] != handling_key[1]:
+            report.changed += 1
+    return report
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = (line for line in lines if line.strip())
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def simulate(
+    lines: Iterable[str],
+    candidate: CustomerPolicy,
+    baseline: Optional[CustomerPolicy] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 5000,
+) -> SimulationReport:
+    """
+    Replay JSONL action-log lines under `candidate`.
+
+    Without `baseline`, each record's logged wave_score/handling is the
+    "before" side; with it, both sides are re-scored so only the policy
+    difference shows up. workers=1 runs in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = SimulationReport()
+    chunks = _chunks(lines, chunk_size)
+
+    if workers <= 1:
+        _init_worker(candidate, baseline)
+        for chunk in chunks:
+            report.merge(_score_chunk(chunk))
+        return report
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(candidate, baseline)) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_score_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    report.merge(future.result())
+        for future in pending:
+            report.merge(future.result())
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay an action log under a candidate wave policy")
+    parser.add_argument("--log", required=True, help="Action-log JSONL (e.g. from GET /api/v1/actions/export)")
+    parser.add_argument("--policy", required=True, help="Candidate policy JSON")
+    parser.add_argument("--baseline-policy", help="Re-score the baseline with this policy instead of using logged decisions")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    candidate = load_policy_from_json(args.policy)
+    baseline = load_policy_from_json(args.baseline_policy) if args.baseline_policy else None
+    with open(args.log) as f:
+        report = simulate(f, candidate, baseline, workers=args.workers, chunk_size=args.chunk_size)
+
+    payload = json.dumps(report.to_dict(), indent=2)
+    if args.out:
+        with open(args.out, "w") as out:
+            out.write(payload + "\n")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,10 @@
 from .engine import WaveEngine
-from .models import EvaluateRequest, WaveResult, ResourceInfo, ContextInfo, ContentMetadata
-from .policy import CustomerPolicy, load_default_policy, load_policy_from_json
+from .batch import BatchResult
+from .models import EvaluateRequest, WaveResult, WaveDecision, ResourceInfo, ContextInfo, ContentMetadata
+from .policy import CustomerPolicy, CompiledPolicy, load_default_policy, load_policy_from_json
 
 __all__ = [
-    "WaveEngine",
-    "EvaluateRequest", "WaveResult", "ResourceInfo", "ContextInfo", "ContentMetadata",
-    "CustomerPolicy", "load_default_policy", "load_policy_from_json",
+    "WaveEngine", "BatchResult",
+    "EvaluateRequest", "WaveResult", "WaveDecision", "ResourceInfo", "ContextInfo", "ContentMetadata",
+    "CustomerPolicy", "CompiledPolicy", "load_default_policy", "load_policy_from_json",
 ]
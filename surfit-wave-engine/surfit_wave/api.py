@@ -3,7 +3,7 @@ SURFIT Wave Engine — API Layer
 RESTful endpoints for wave evaluation.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
 
@@ -61,10 +61,29 @@ EVALUATE_RESPONSE_SCHEMA = {
 }
 
 
-def create_app():
+# BATCH REQUEST / RESPONSE (POST /api/v1/governance/evaluate/batch)
+# Reasons and contributing factors are only included when explain=true.
+EVALUATE_BATCH_REQUEST_SCHEMA = {
+    "requests": [EVALUATE_REQUEST_SCHEMA],
+    "explain": False,
+}
+
+EVALUATE_BATCH_RESPONSE_SCHEMA = {
+    "count": 1,
+    "handling_counts": {"approve": 1},
+    "results": [
+        {"wave_score": 4, "wave_label": "Wave 4", "handling": "approve", "destination_class_resolved": "company_announcement"},
+    ],
+}
+
+
+def create_app(policy_dir: Optional[str] = None):
     """
     Create a FastAPI app with wave evaluation endpoints.
     Import this and run with uvicorn when ready to serve.
+
+    Tenant policies are read from policy_dir (or SURFIT_WAVE_POLICY_DIR) as
+    <tenant_id>.json; requests without a known tenant use the default policy.
     """
     try:
         from fastapi import FastAPI
@@ -73,11 +92,15 @@ def create_app():
         print("FastAPI not installed. Install with: pip install fastapi uvicorn")
         return None
 
-    from .engine import WaveEngine
+    import os
     from .models import EvaluateRequest, ResourceInfo, ContextInfo, ContentMetadata
+    from .registry import PolicyRegistry
 
     app = FastAPI(title="SurfitAI Wave Engine", version="1.0.0")
-    engine = WaveEngine()
+    registry = PolicyRegistry(
+        policy_dir or os.environ.get("SURFIT_WAVE_POLICY_DIR"),
+        max_resident=int(os.environ.get("SURFIT_WAVE_MAX_RESIDENT_TENANTS", "64")),
+    )
 
     class ResourceIn(BaseModel):
         resource_id: Optional[str] = None
@@ -108,9 +131,12 @@ def create_app():
         agent_id: Optional[str] = None
         tenant_id: Optional[str] = None
 
-    @app.post("/api/v1/governance/evaluate")
-    def evaluate(req: EvalIn):
-        eval_req = EvaluateRequest(
+    class BatchEvalIn(BaseModel):
+        requests: List[EvalIn]
+        explain: bool = False
+
+    def to_evaluate_request(req: EvalIn) -> EvaluateRequest:
+        return EvaluateRequest(
             system=req.system,
             action=req.action,
             resource=ResourceInfo(
@@ -133,11 +159,42 @@ def create_app():
             agent_id=req.agent_id,
             tenant_id=req.tenant_id,
         )
-        result = engine.evaluate(eval_req)
+
+    @app.post("/api/v1/governance/evaluate")
+    def evaluate(req: EvalIn, explain: bool = True):
+        eval_req = to_evaluate_request(req)
+        result = registry.engine_for(eval_req.tenant_id).evaluate(eval_req, explain=explain)
         return result.to_dict()
 
+    @app.post("/api/v1/governance/evaluate/batch")
+    def evaluate_batch(req: BatchEvalIn):
+        eval_reqs = [to_evaluate_request(r) for r in req.requests]
+        by_tenant: Dict[Optional[str], List[int]] = {}
+        for i, eval_req in enumerate(eval_reqs):
+            by_tenant.setdefault(eval_req.tenant_id, []).append(i)
+        results: List[Optional[dict]] = [None] * len(eval_reqs)
+        handling_counts: Dict[str, int] = {}
+        for tenant_id, indexes in by_tenant.items():
+            batch = registry.engine_for(tenant_id).evaluate_batch([eval_reqs[i] for i in indexes])
+            for i, row in zip(indexes, batch.to_dicts(explain=req.explain)):
+                results[i] = row
+            for handling, count in batch.handling_counts().items():
+                handling_counts[handling] = handling_counts.get(handling, 0) + count
+        return {
+            "count": len(results),
+            "handling_counts": handling_counts,
+            "results": results,
+        }
+
     @app.get("/api/v1/health")
     def health():
         return {"status": "ok", "engine": "wave-engine-v1"}
 
+    @app.get("/api/v1/engine/stats")
+    def engine_stats():
+        return {
+            "evaluation_cache": registry.cache_stats(),
+            "policy_registry": registry.stats(),
+        }
+
     return app
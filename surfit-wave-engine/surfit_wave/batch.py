@@ -0,0 +1,184 @@
+"""
+SURFIT Wave Engine — Batch Evaluator
+Scores many requests at once using per-column lookups instead of per-call
+object construction. Used for replaying historical action logs.
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models import (
+    EvaluateRequest, WaveResult, WaveDecision, ResourceInfo, ContextInfo,
+    FACTOR_OVERRIDE, FACTOR_BASELINE, FACTOR_ACTION, FACTOR_DESTINATION, FACTOR_CONTEXT,
+)
+
+
+class BatchResult:
+    """
+    Columnar output of WaveEngine.evaluate_batch.
+
+    Scores, handling, destination classes and factor codes are plain columns
+    indexed by request position. Reasons and contributing factors are only
+    built when result(i) or to_dicts(explain=True) asks for them, from the
+    batch's own decision and the policy it was scored under.
+    """
+
+    def __init__(self, engine, requests: Sequence[EvaluateRequest], wave_scores: array,
+                 raw_scores: List[Optional[int]], handlings: List[str],
+                 destination_classes: List[Optional[str]],
+                 factor_codes: Optional[List[Tuple[int, ...]]] = None,
+                 groups: Optional[List[object]] = None,
+                 overrides: Optional[Dict[int, object]] = None):
+        self._engine = engine
+        self._compiled = engine.compiled
+        self._requests = requests
+        self.wave_scores = wave_scores
+        self.raw_scores = raw_scores
+        self.handlings = handlings
+        self.destination_classes = destination_classes
+        self.factor_codes = factor_codes if factor_codes is not None else [()] * len(wave_scores)
+        self._groups = groups if groups is not None else [None] * len(wave_scores)
+        self._overrides = overrides or {}
+
+    def __len__(self) -> int:
+        return len(self.wave_scores)
+
+    def decision(self, index: int) -> WaveDecision:
+        """Compact decision for one request, built from the batch columns."""
+        request = self._requests[index]
+        return WaveDecision(
+            wave_score=self.wave_scores[index],
+            handling=self.handlings[index],
+            destination_class_resolved=self.destination_classes[index],
+            raw_score=self.raw_scores[index],
+            factor_codes=self.factor_codes[index],
+            system=request.system.lower(),
+            action=request.action.lower(),
+            group=self._groups[index],
+            override=self._overrides.get(index),
+        )
+
+    def result(self, index: int) -> WaveResult:
+        """Full explained result for one request (not re-scored)."""
+        return self._engine.explain(self.decision(index), compiled=self._compiled)
+
+    def handling_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for handling in self.handlings:
+            counts[handling] = counts.get(handling, 0) + 1
+        return counts
+
+    def to_dicts(self, explain: bool = False) -> List[dict]:
+        if explain:
+            return [self.result(i).to_dict() for i in range(len(self))]
+        return [
+            {
+                "wave_score": score,
+                "wave_label": f"Wave {score}",
+                "handling": handling,
+                "destination_class_resolved": dest_class,
+            }
+            for score, handling, dest_class in zip(self.wave_scores, self.handlings, self.destination_classes)
+        ]
+
+
+def evaluate_batch(engine, requests: Sequence[EvaluateRequest]) -> BatchResult:
+    """
+    Same arithmetic as WaveEngine.evaluate, one column at a time.
+
+    Every policy lookup (baseline, action modifier, destination, override) is
+    resolved once per distinct key in the batch, and each context modifier is
+    applied as a mask over the whole score column.
+    """
+    compiled = engine.compiled
+    n = len(requests)
+
+    systems = [r.system.lower() for r in requests]
+    actions = [r.action.lower() for r in requests]
+    resources = [r.resource or ResourceInfo() for r in requests]
+    contexts = [r.context or ContextInfo() for r in requests]
+
+    # ── Destination + override columns (resolved per distinct key) ──
+    dest_cache: Dict[Tuple, Tuple[Optional[str], object]] = {}
+    override_cache: Dict[Tuple, object] = {}
+    dest_classes: List[Optional[str]] = [None] * n
+    dest_mods = array("i", [0]) * n
+    groups: List[object] = [None] * n
+    forced: Dict[int, object] = {}
+    for i in range(n):
+        system, res = systems[i], resources[i]
+        dest_key = (system, res.resource_id, res.resource_name, res.destination_class)
+        hit = dest_cache.get(dest_key)
+        if hit is None:
+            hit = engine.classifier.classify(system, res)
+            dest_cache[dest_key] = hit
+        dest_class, group = hit
+        dest_classes[i] = dest_class
+        if group:
+            dest_mods[i] = group.risk_modifier
+            groups[i] = group
+
+        ov_key = (system, actions[i], res.resource_name, dest_class)
+        if ov_key in override_cache:
+            override = override_cache[ov_key]
+        else:
+            override = compiled.find_override(system, actions[i], res.resource_name, dest_class)
+            override_cache[ov_key] = override
+        if override and override.forced_wave is not None and override.forced_handling is not None:
+            forced[i] = override
+
+    # ── Baseline + action modifier columns ──
+    baselines = {s: compiled.get_system_baseline(s) for s in set(systems)}
+    action_mods: Dict[Tuple[str, str], Optional[int]] = {}
+    for key in set(zip(systems, actions)):
+        mod = compiled.get_action_modifier(*key)
+        action_mods[key] = mod.modifier if mod else None
+
+    scores = array("i", [0]) * n
+    codes: List[List[int]] = []
+    for i in range(n):
+        row_codes = [FACTOR_BASELINE]
+        score = baselines[systems[i]] + dest_mods[i]
+        action_mod = action_mods[(systems[i], actions[i])]
+        if action_mod is not None:
+            row_codes.append(FACTOR_ACTION)
+            score += action_mod
+        if groups[i] is not None:
+            row_codes.append(FACTOR_DESTINATION)
+        scores[i] = score
+        codes.append(row_codes)
+
+    # ── Context modifier masks, applied in policy order ──
+    get_value = engine._get_context_value
+    for idx, cm in enumerate(engine.policy.context_modifiers):
+        for i in range(n):
+            value = get_value(contexts[i], cm.field_name)
+            if value is not None and value == cm.trigger_value:
+                codes[i].append(FACTOR_CONTEXT + idx)
+                if cm.modifier >= 99:
+                    scores[i] = 99
+                else:
+                    scores[i] += cm.modifier
+
+    # ── Clamp + handling ──
+    handling_for = {wave: compiled.get_handling_for_wave(wave) for wave in range(1, 6)}
+    wave_scores = array("i", [0]) * n
+    raw_scores: List[Optional[int]] = list(scores)
+    handlings: List[str] = [""] * n
+    factor_codes: List[Tuple[int, ...]] = [()] * n
+    for i in range(n):
+        override = forced.get(i)
+        if override is not None:
+            wave_scores[i] = override.forced_wave
+            raw_scores[i] = None
+            handlings[i] = override.forced_handling
+            factor_codes[i] = (FACTOR_OVERRIDE,)
+            groups[i] = None
+            continue
+        score = max(1, min(5, scores[i]))
+        wave_scores[i] = score
+        handlings[i] = handling_for[score]
+        factor_codes[i] = tuple(codes[i])
+
+    return BatchResult(engine, requests, wave_scores, raw_scores, handlings, dest_classes,
+                       factor_codes=factor_codes, groups=groups, overrides=forced)
@@ -6,7 +6,7 @@ per-channel hardcoding.
 
 from typing import Optional, Tuple
 from .models import ResourceInfo
-from .policy import CustomerPolicy, ResourceGroup
+from .policy import CustomerPolicy, CompiledPolicy, ResourceGroup
 
 
 class DestinationClassifier:
@@ -17,8 +17,9 @@ class DestinationClassifier:
     3. Fallback heuristics (name patterns)
     """
 
-    def __init__(self, policy: CustomerPolicy):
+    def __init__(self, policy: CustomerPolicy, compiled: Optional[CompiledPolicy] = None):
         self.policy = policy
+        self.compiled = compiled or CompiledPolicy(policy)
 
     def classify(self, system: str, resource: Optional[ResourceInfo]) -> Tuple[Optional[str], Optional[ResourceGroup]]:
         """
@@ -36,7 +37,7 @@ class DestinationClassifier:
             return resource.destination_class, group
 
         # 2. Check explicit customer config lists
-        group = self.policy.classify_resource(system, resource_name)
+        group = self.compiled.classify_resource(system, resource_name)
         if group:
             return group.destination_class, group
 
@@ -65,20 +66,9 @@ class DestinationClassifier:
             return "small_private_channel", self._find_group_by_class("slack", "small_private_channel")
 
         # Name-based heuristics for channels not in explicit lists
-        announcement_keywords = ["announcement", "all-hands", "company-", "exec-", "leadership"]
-        for kw in announcement_keywords:
-            if kw in name:
-                return "company_announcement", self._find_group_by_class("slack", "company_announcement")
-
-        external_keywords = ["external", "shared-", "partner-", "client-"]
-        for kw in external_keywords:
-            if kw in name:
-                return "external_shared_channel", self._find_group_by_class("slack", "external_shared_channel")
-
-        sensitive_keywords = ["security", "legal", "hr-", "confidential", "incident"]
-        for kw in sensitive_keywords:
-            if kw in name:
-                return "sensitive_channel", self._find_group_by_class("slack", "sensitive_channel")
+        dest_class = self.compiled.match_keywords("slack", name)
+        if dest_class:
+            return dest_class, self._find_group_by_class("slack", dest_class)
 
         # Default: team channel
         return "team_channel", self._find_group_by_class("slack", "team_channel")
@@ -97,7 +87,7 @@ class DestinationClassifier:
         """Notion-specific classification."""
         name = resource.resource_name or ""
 
-        group = self.policy.classify_resource("notion", name)
+        group = self.compiled.classify_resource("notion", name)
         if group:
             return group.destination_class, group
 
@@ -105,8 +95,4 @@ class DestinationClassifier:
 
     def _find_group_by_class(self, system: str, dest_class: str) -> Optional[ResourceGroup]:
         """Find a resource group by its destination class."""
-        sys_groups = self.policy.resource_groups.get(system, {})
-        for group in sys_groups.values():
-            if group.destination_class == dest_class:
-                return group
-        return None
+        return self.compiled.find_group_by_class(system, dest_class)
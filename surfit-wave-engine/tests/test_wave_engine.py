@@ -198,6 +198,315 @@ def test_calibrated():
     return len(failures) == 0
 
 
+
+def _calibration_requests():
+    requests = []
+    for system, action, resource, context in [
+        ("slack", "post_dm", ResourceInfo(resource_id="D0ABC123"), ContextInfo()),
+        ("slack", "post_message", ResourceInfo(resource_name="eng-platform"), ContextInfo()),
+        ("slack", "post_announcement", ResourceInfo(resource_name="company-announcements"), ContextInfo(visibility="company_wide")),
+        ("slack", "post_message", ResourceInfo(resource_name="external-partner-channel"), ContextInfo(visibility="external")),
+        ("slack", "post_message", ResourceInfo(resource_name="general"), ContextInfo(approval_required_override=True, env="dev")),
+        ("notion", "update_database_entry", ResourceInfo(resource_name="OKRs"), ContextInfo(visibility="company_wide")),
+        ("github", "push_branch", ResourceInfo(resource_name="feature-xyz"), ContextInfo(env="dev")),
+        ("github", "merge_pr", ResourceInfo(resource_name="main"), ContextInfo(reversible=False)),
+        ("salesforce", "update_record", None, None),
+    ]:
+        requests.append(EvaluateRequest(system=system, action=action, resource=resource, context=context))
+    return requests
+
+
+def test_batch_matches_single_evaluation():
+    engine = WaveEngine()
+    requests = _calibration_requests() * 50
+    batch = engine.evaluate_batch(requests)
+    assert len(batch) == len(requests)
+    for i, request in enumerate(requests):
+        single = engine.evaluate(request)
+        assert batch.wave_scores[i] == single.wave_score
+        assert batch.raw_scores[i] == single.raw_score
+        assert batch.handlings[i] == single.handling
+        assert batch.destination_classes[i] == single.destination_class_resolved
+        assert batch.factor_codes[i] == engine.evaluate(request, explain=False).factor_codes
+    assert batch.to_dicts()[2] == {
+        "wave_score": 5, "wave_label": "Wave 5", "handling": "approve",
+        "destination_class_resolved": "company_announcement",
+    }
+    assert batch.to_dicts(explain=True)[2]["reasons"] == list(engine.evaluate(requests[2]).reasons)
+    assert sum(batch.handling_counts().values()) == len(requests)
+
+
+def test_batch_applies_forced_overrides():
+    from surfit_wave.policy import Override, load_default_policy
+
+    policy = load_default_policy()
+    policy.overrides.append(Override(system="github", action="merge_pr", resource_name="main",
+                                     forced_wave=5, forced_handling="block", reason="freeze"))
+    engine = WaveEngine(policy)
+    batch = engine.evaluate_batch(_calibration_requests())
+    assert batch.handlings[7] == "block"
+    assert batch.raw_scores[7] is None
+    assert batch.handlings[6] == "auto"
+    assert batch.result(7).reasons == ("Override applied: freeze",)
+
+
+def test_batch_explains_its_own_decisions():
+    from surfit_wave.policy import load_default_policy
+
+    engine = WaveEngine()
+    requests = _calibration_requests()
+    batch = engine.evaluate_batch(requests)
+    before = [batch.result(i) for i in range(len(batch))]
+
+    # A policy reload after scoring must not change what the batch reports.
+    reloaded = load_default_policy()
+    reloaded.systems["slack"].base_risk += 2
+    engine.set_policy(reloaded)
+    engine.evaluate = None  # result() must not re-evaluate
+    for i, expected in enumerate(before):
+        result = batch.result(i)
+        assert result == expected
+        assert result.wave_score == batch.wave_scores[i]
+
+
+def test_compiled_policy_matches_linear_lookups():
+    from surfit_wave.policy import CompiledPolicy, HandlingThreshold, Override, ResourceGroup, load_default_policy
+
+    policy = load_default_policy()
+    policy.resource_groups["slack"]["bulk"] = ResourceGroup(
+        destination_class="team_channel", risk_modifier=1,
+        members=[f"team-{i}" for i in range(5000)] + ["eng-platform"],
+    )
+    policy.handling_thresholds.append(HandlingThreshold(wave=3, handling="block"))
+    policy.overrides.extend([
+        Override(system="slack", destination_class="sensitive_channel", forced_wave=4, forced_handling="approve"),
+        Override(system="slack", action="post_message", resource_name="team-7", forced_wave=2, forced_handling="log"),
+        Override(system="slack", action="post_message", forced_wave=3, forced_handling="check"),
+    ])
+    compiled = CompiledPolicy(policy)
+
+    for system in ["slack", "github", "notion", "aws", "jira"]:
+        assert compiled.get_system_baseline(system) == policy.get_system_baseline(system)
+        for name in ["eng-platform", "team-4999", "main", "OKRs", "nope", None]:
+            assert compiled.classify_resource(system, name) is policy.classify_resource(system, name)
+        for action in ["post_message", "merge_pr", "post_dm", "unknown"]:
+            assert compiled.get_action_modifier(system, action) is policy.get_action_modifier(system, action)
+            for name, dest in [("team-7", "team_channel"), ("x", "sensitive_channel"), ("x", None)]:
+                assert compiled.find_override(system, action, name, dest) is policy.find_override(system, action, name, dest)
+    for wave in range(0, 7):
+        assert compiled.get_handling_for_wave(wave) == policy.get_handling_for_wave(wave)
+
+
+def test_keyword_matcher_matches_nested_loops():
+    from surfit_wave.keywords import KeywordMatcher
+
+    classes = [
+        (10, "company_announcement", ["announcement", "all-hands", "company-", "exec-", "leadership"]),
+        (20, "external_shared_channel", ["external", "shared-", "partner-", "client-"]),
+        (30, "sensitive_channel", ["security", "legal", "hr-", "confidential", "incident"]),
+    ]
+    matcher = KeywordMatcher(classes)
+
+    def naive(name):
+        for _, dest_class, keywords in classes:
+            if any(kw in name for kw in keywords):
+                return dest_class
+        return None
+
+    for name in ["eng-platform", "client-security", "incident-exec-sync", "leadershiphr-",
+                 "ext", "paralegal", "sharedexternal", "", "company-all-hands", "chr-ops"]:
+        assert matcher.match(name) == naive(name), name
+
+
+def test_tenant_keyword_classes_load_from_json():
+    import json
+    import tempfile
+    from surfit_wave.policy import load_policy_from_json
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"keyword_classes": {"slack": [
+            {"destination_class": "sensitive_channel", "keywords": ["payroll"], "priority": 5},
+            {"destination_class": "vendor_channel", "keywords": ["vendor-"]},
+        ]}}, f)
+        path = f.name
+    try:
+        engine = WaveEngine(load_policy_from_json(path))
+    finally:
+        os.unlink(path)
+
+    def dest(name):
+        return engine.evaluate(EvaluateRequest(system="slack", action="post_message",
+                                               resource=ResourceInfo(resource_name=name))).destination_class_resolved
+
+    assert dest("payroll-announcements") == "sensitive_channel"
+    assert dest("legal-team") == "team_channel"
+    assert dest("vendor-acme") == "vendor_channel"
+    assert dest("partner-vendor-acme") == "external_shared_channel"
+
+
+def test_keyword_override_keeps_existing_class_priority():
+    import json
+    import tempfile
+    from surfit_wave.policy import load_policy_from_json
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"keyword_classes": {"slack": [
+            {"destination_class": "company_announcement", "keywords": ["announce"]},
+        ]}}, f)
+        path = f.name
+    try:
+        policy = load_policy_from_json(path)
+    finally:
+        os.unlink(path)
+
+    classes = {kc.destination_class: kc for kc in policy.keyword_classes["slack"]}
+    assert classes["company_announcement"].priority == 10
+    assert classes["company_announcement"].keywords == ["announce"]
+    engine = WaveEngine(policy)
+    result = engine.evaluate(EvaluateRequest(system="slack", action="post_message",
+                                             resource=ResourceInfo(resource_name="announce-legal")))
+    assert result.destination_class_resolved == "company_announcement"
+
+
+def test_evaluation_cache_reuses_results_and_invalidates_on_policy_change():
+    from surfit_wave.policy import ContextModifierConfig, Override, load_default_policy
+
+    engine = WaveEngine(cache_size=2)
+    first = engine.evaluate(EvaluateRequest(system="slack", action="post_message",
+                                            resource=ResourceInfo(resource_name="eng-platform"),
+                                            context=ContextInfo(), agent_id="a1"))
+    # agent_id and unreferenced context fields are not part of the key
+    second = engine.evaluate(EvaluateRequest(system="SLACK", action="post_message",
+                                             resource=ResourceInfo(resource_name="eng-platform"),
+                                             context=ContextInfo(deployment_stable=False), agent_id="a2"))
+    assert second is first
+    changed = engine.evaluate(EvaluateRequest(system="slack", action="post_message",
+                                              resource=ResourceInfo(resource_name="eng-platform"),
+                                              context=ContextInfo(visibility="external")))
+    assert changed.wave_score != first.wave_score
+    stats = engine.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+    policy = load_default_policy()
+    policy.overrides.append(Override(system="slack", forced_wave=5, forced_handling="block"))
+    engine.policy = policy
+    blocked = engine.evaluate(EvaluateRequest(system="slack", action="post_message",
+                                              resource=ResourceInfo(resource_name="eng-platform")))
+    assert blocked.handling == "block"
+    assert engine.cache_stats()["size"] == 1
+
+    uncacheable = ContextInfo(custom={"tags": ["a"]})
+    policy.context_modifiers.append(ContextModifierConfig(field_name="tags", trigger_value=["a"], modifier=1))
+    engine.set_policy(policy)
+    assert engine.evaluate(EvaluateRequest(system="github", action="create_pr", context=uncacheable)).raw_score == 3
+    assert engine.cache_stats()["size"] == 0
+
+
+def test_policy_registry_routes_by_tenant_and_hot_reloads():
+    import json
+    import tempfile
+    from surfit_wave.registry import PolicyRegistry
+
+    now = [0.0]
+    request = EvaluateRequest(system="github", action="merge_pr", resource=ResourceInfo(resource_name="production"),
+                              tenant_id="acme")
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "acme.json")
+        registry = PolicyRegistry(td, max_resident=1, check_interval_seconds=5, clock=lambda: now[0])
+        assert registry.engine_for("acme") is registry.default_engine
+
+        with open(path, "w") as f:
+            json.dump({"tenant_id": "acme", "overrides": [{"system": "github", "action": "merge_pr",
+                       "forced_wave": 5, "forced_handling": "block"}]}, f)
+        acme = registry.engine_for("acme")
+        assert acme.evaluate(request).handling == "block"
+        assert registry.engine_for("../acme") is registry.default_engine
+        assert registry.engine_for(None).evaluate(request).handling == "approve"
+
+        with open(path, "w") as f:
+            json.dump({"tenant_id": "acme", "overrides": [{"system": "github", "action": "merge_pr",
+                       "forced_wave": 2, "forced_handling": "log", "reason": "v2"}]}, f)
+        os.utime(path, ns=(10**9, 10**9))
+        assert registry.engine_for("acme") is acme  # within check interval
+        now[0] = 10
+        assert registry.engine_for("acme").evaluate(request).handling == "log"
+
+        with open(path, "w") as f:
+            f.write("{broken")
+        now[0] = 20
+        assert registry.engine_for("acme").evaluate(request).handling == "log"  # last good policy
+
+        stats = registry.stats()
+        assert (stats["loads"], stats["reloads"], stats["load_errors"]) == (1, 1, 1)
+
+        cache = registry.cache_stats()
+        assert (cache["tenants"]["acme"]["hits"], cache["tenants"]["acme"]["misses"]) == (1, 1)
+        assert cache["default"]["misses"] == 1
+        # The replaced v1 engine's miss still counts towards the totals.
+        assert (cache["total"]["hits"], cache["total"]["misses"]) == (1, 3)
+
+        os.remove(path)
+        now[0] = 30
+        assert registry.engine_for("acme") is registry.default_engine
+        cache = registry.cache_stats()
+        assert "acme" not in cache["tenants"]
+        # So do the removed tenant's.
+        assert (cache["total"]["hits"], cache["total"]["misses"]) == (1, 3)
+
+
+def test_simulator_reports_transitions_for_candidate_policy():
+    import json
+    from surfit_wave.policy import Override, load_default_policy
+    from surfit_wave.simulator import request_from_record, simulate
+
+    engine = WaveEngine()
+    lines = []
+    for request in _calibration_requests() * 20:
+        result = engine.evaluate(request)
+        lines.append(json.dumps({"system": request.system, "action": request.action,
+                                 "wave_score": result.wave_score, "handling": result.handling,
+                                 "request": request.to_dict()}))
+    lines.append("not json")
+    legacy = {"system": "slack", "action": "post_message", "channel_name": "eng-platform",
+              "wave_score": 2, "handling": "log",
+              "contributing_factors": [{"source": "context_modifier", "key": "visibility=company_wide"},
+                                       {"source": "context_modifier", "key": "reversible=False"}]}
+    lines.append(json.dumps(legacy))
+    assert request_from_record(legacy).context.reversible is False
+
+    candidate = load_default_policy()
+    candidate.overrides.append(Override(system="github", action="merge_pr", forced_wave=5, forced_handling="block"))
+    for workers in (1, 2):
+        report = simulate(iter(lines), candidate, workers=workers, chunk_size=7).to_dict()
+        assert report["records"] == 182 and report["scored"] == 181 and report["skipped"] == 1
+        assert report["handling_transitions"]["approve->block"] == 20
+        assert report["wave_transitions"]["2->3"] == 1  # legacy record re-scored
+        assert report["changed"] == 21
+
+    same = simulate(iter(lines), load_default_policy(), baseline=load_default_policy(), workers=1).to_dict()
+    assert same["changed"] == 0
+
+
+def test_slim_decision_explains_to_full_result():
+    from surfit_wave.models import FACTOR_BASELINE, FACTOR_CONTEXT, FACTOR_DESTINATION, WaveDecision
+
+    engine = WaveEngine(cache_size=0)
+    for request in _calibration_requests():
+        decision = engine.evaluate(request, explain=False)
+        assert isinstance(decision, WaveDecision)
+        full = engine.evaluate(request)
+        assert engine.explain(decision) == full
+        assert (decision.wave_score, decision.handling, decision.raw_score) == (full.wave_score, full.handling, full.raw_score)
+        assert not hasattr(decision, "__dict__")
+
+    announcement = engine.evaluate(_calibration_requests()[2], explain=False)
+    visibility_idx = [(cm.field_name, cm.trigger_value) for cm in engine.policy.context_modifiers].index(
+        ("visibility", "company_wide"))
+    assert announcement.factor_codes[0] == FACTOR_BASELINE
+    assert FACTOR_DESTINATION in announcement.factor_codes
+    assert FACTOR_CONTEXT + visibility_idx in announcement.factor_codes
+    assert set(announcement.to_dict()) == {"wave_score", "wave_label", "handling", "destination_class_resolved", "factor_codes"}
+
 if __name__ == "__main__":
     success = test_calibrated()
     exit(0 if success else 1)
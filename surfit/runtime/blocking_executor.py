@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class BlockingExecutorConfig:
+    db_workers: int = 8
+    io_workers: int = 32
+    wave_workers: int = 8
+
+
+class BlockingWorkExecutors:
+    """Dedicated pools for blocking work issued from async request handlers.
+
+    Keeping SQLite, outbound HTTP and whole-wave execution off Starlette's shared
+    threadpool means a burst of slow proxy targets cannot starve cheap routes
+    such as /healthz.
+    """
+
+    def __init__(self, config: BlockingExecutorConfig):
+        self.config = config
+        self._db = ThreadPoolExecutor(max_workers=max(1, config.db_workers), thread_name_prefix="surfit-db")
+        self._io = ThreadPoolExecutor(max_workers=max(1, config.io_workers), thread_name_prefix="surfit-io")
+        self._wave = ThreadPoolExecutor(max_workers=max(1, config.wave_workers), thread_name_prefix="surfit-wave")
+
+    @staticmethod
+    async def _submit(executor: ThreadPoolExecutor, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    async def run_db(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._submit(self._db, fn, *args, **kwargs)
+
+    async def run_io(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._submit(self._io, fn, *args, **kwargs)
+
+    async def run_wave(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._submit(self._wave, fn, *args, **kwargs)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        for executor in (self._db, self._io, self._wave):
+            executor.shutdown(wait=wait)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import base64
@@ -15,7 +16,10 @@ import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable
+
+from .mutation_token_codec import pack_swt2_claims, unpack_swt2_claims
+from .token_cache import VerifiedTokenCache
 
 
 @dataclass(frozen=True)
@@ -30,6 +34,28 @@ class MutationBoundaryConfig:
     market_intel_templates: set[str] = field(default_factory=set)
     prod_config_target: str = "demo_artifacts/prod_config.json"
     prod_config_allowed_keys: set[str] = field(default_factory=set)
+    token_cache_max_entries: int = 4096
+    mutation_token_format: str = "swt2"
+    scope_cache_max_entries: int = 1024
+
+
+@dataclass(frozen=True)
+class ProxyPlan:
+    wave_id: str
+    method: str
+    url: str
+    sanitized_url: str
+    headers: dict[str, str]
+    data: bytes | None
+
+
+@dataclass(frozen=True)
+class ProxyFetchResult:
+    kind: str
+    status_code: int | None = None
+    headers: dict[str, Any] | None = None
+    body: str | None = None
+    error: str | None = None
 
 
 class MutationBoundaryService:
@@ -47,6 +73,9 @@ class MutationBoundaryService:
         self.sha256_text = sha256_text or (lambda text: hashlib.sha256(text.encode("utf-8")).hexdigest())
         self._token_replay_lock = threading.Lock()
         self._token_replay_state: dict[str, dict[str, int]] = {}
+        self._verified_tokens = VerifiedTokenCache(max_entries=config.token_cache_max_entries)
+        self._scope_cache_lock = threading.Lock()
+        self._scope_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
     @staticmethod
     def _b64url_decode(data: str) -> bytes:
@@ -58,9 +87,32 @@ class MutationBoundaryService:
         return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
 
     def decode_wave_mutation_token(self, token: str) -> tuple[dict[str, Any] | None, str | None]:
+        _, payload, error = self._verify_wave_mutation_token(token)
+        return payload, error
+
+    def _verify_wave_mutation_token(self, token: str) -> tuple[str, dict[str, Any] | None, str | None]:
+        # The digest doubles as the replay-accounting key, so it is computed once per request.
+        token_id = self.sha256_text(token)
+        cached = self._verified_tokens.get(token_id)
+        if cached is not None:
+            return token_id, cached, None
+        payload, error = self._decode_uncached(token)
+        if payload is not None:
+            try:
+                exp_epoch = int(payload.get("exp", 0))
+            except (TypeError, ValueError):
+                exp_epoch = 0
+            self._verified_tokens.put(token_id, payload, exp_epoch)
+        return token_id, payload, error
+
+    def _decode_uncached(self, token: str) -> tuple[dict[str, Any] | None, str | None]:
         try:
             parts = token.split(".")
-            if len(parts) != 3 or parts[0] != "swt1":
+            if len(parts) != 3:
+                return None, "TOKEN_INVALID_SIGNATURE"
+            if parts[0] == "swt2":
+                return self._decode_swt2(parts[1], parts[2])
+            if parts[0] != "swt1":
                 return None, "TOKEN_INVALID_SIGNATURE"
             payload_b64, sig_b64 = parts[1], parts[2]
             expected = hmac.new(
@@ -78,6 +130,56 @@ class MutationBoundaryService:
         except Exception:
             return None, "TOKEN_INVALID_SIGNATURE"
 
+    def _swt2_signature(self, claims_bin: bytes) -> bytes:
+        return hmac.new(self.config.token_secret.encode("utf-8"), b"swt2." + claims_bin, hashlib.sha256).digest()
+
+    def _decode_swt2(self, claims_b64: str, sig_b64: str) -> tuple[dict[str, Any] | None, str | None]:
+        claims_bin = self._b64url_decode(claims_b64)
+        if not hmac.compare_digest(self._swt2_signature(claims_bin), self._b64url_decode(sig_b64)):
+            return None, "TOKEN_INVALID_SIGNATURE"
+        return unpack_swt2_claims(claims_bin), None
+
+    def _remember_scope(self, scope_hash: str, scope: dict[str, Any]) -> None:
+        with self._scope_cache_lock:
+            self._scope_cache[scope_hash] = scope
+            self._scope_cache.move_to_end(scope_hash)
+            while len(self._scope_cache) > self.config.scope_cache_max_entries:
+                self._scope_cache.popitem(last=False)
+
+    def _resolve_token_scope(self, conn: sqlite3.Connection, token_payload: dict[str, Any]) -> dict[str, Any] | None:
+        if "scope" in token_payload:
+            scope = token_payload.get("scope") or {}
+            return scope if isinstance(scope, dict) else None
+        scope_hash = str(token_payload.get("scope_hash") or "")
+        if not scope_hash:
+            return None
+        with self._scope_cache_lock:
+            cached = self._scope_cache.get(scope_hash)
+            if cached is not None:
+                self._scope_cache.move_to_end(scope_hash)
+                return cached
+        try:
+            row = conn.execute(
+                "SELECT scope_json FROM mutation_scopes WHERE scope_hash = ?",
+                (scope_hash,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        # Scopes are content-addressed; a row whose content does not hash to its key is never trusted.
+        if not row or not row[0] or self.sha256_text(row[0]) != scope_hash:
+            return None
+        try:
+            scope = json.loads(row[0])
+        except Exception:
+            return None
+        if not isinstance(scope, dict):
+            return None
+        self._remember_scope(scope_hash, scope)
+        return scope
+
+    def token_cache_stats(self) -> dict[str, Any]:
+        return self._verified_tokens.stats()
+
     def build_mutation_scope(
         self,
         wave_template_id: str,
@@ -260,26 +362,43 @@ class MutationBoundaryService:
         ttl_seconds: int | None = None,
     ) -> tuple[str, str, str, str]:
         expires_epoch = int(time.time()) + int(ttl_seconds if ttl_seconds is not None else self.config.mutation_token_ttl_seconds)
-        payload = {
-            "v": 1,
-            "wave_id": wave_id,
-            "agent_id": agent_id,
-            "policy_manifest_hash": policy_manifest_hash,
-            "policy_version": policy_version,
-            "wave_template_id": wave_template_id,
-            "scope": scope,
-            "exp": expires_epoch,
-        }
-        payload_json = self.canonicalize_policy_manifest(payload)
-        payload_b64 = self._b64url_encode(payload_json.encode("utf-8"))
-        sig = hmac.new(self.config.token_secret.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
-        token = f"swt1.{payload_b64}.{self._b64url_encode(sig)}"
+        if self.config.mutation_token_format == "swt2":
+            scope_json = self.canonicalize_policy_manifest(scope)
+            scope_hash = self.sha256_text(scope_json)
+            self._remember_scope(scope_hash, scope)
+            claims = {
+                "v": 2,
+                "wave_id": wave_id,
+                "agent_id": agent_id,
+                "policy_manifest_hash": policy_manifest_hash,
+                "policy_version": policy_version,
+                "wave_template_id": wave_template_id,
+                "scope_hash": scope_hash,
+                "exp": expires_epoch,
+            }
+            claims_bin = pack_swt2_claims(claims)
+            token = f"swt2.{self._b64url_encode(claims_bin)}.{self._b64url_encode(self._swt2_signature(claims_bin))}"
+            payload_json = self.canonicalize_policy_manifest(claims)
+        else:
+            payload = {
+                "v": 1,
+                "wave_id": wave_id,
+                "agent_id": agent_id,
+                "policy_manifest_hash": policy_manifest_hash,
+                "policy_version": policy_version,
+                "wave_template_id": wave_template_id,
+                "scope": scope,
+                "exp": expires_epoch,
+            }
+            payload_json = self.canonicalize_policy_manifest(payload)
+            payload_b64 = self._b64url_encode(payload_json.encode("utf-8"))
+            sig = hmac.new(self.config.token_secret.encode("utf-8"), payload_b64.encode("utf-8"), hashlib.sha256).digest()
+            token = f"swt1.{payload_b64}.{self._b64url_encode(sig)}"
         token_hash = self.sha256_text(token)
         expires_iso = datetime.fromtimestamp(expires_epoch, tz=timezone.utc).isoformat()
         return token, token_hash, expires_iso, payload_json
 
-    def _token_replay_decision(self, token: str, exp_epoch: int, now_epoch: int) -> str | None:
-        token_id = self.sha256_text(token)
+    def _token_replay_decision(self, token_id: str, exp_epoch: int, now_epoch: int) -> str | None:
         with self._token_replay_lock:
             state = self._token_replay_state.get(token_id)
             if state is None:
@@ -316,35 +435,28 @@ class MutationBoundaryService:
                 return True
         return False
 
-    def proxy_http(
+    def _authorize_proxy_request(
         self,
         conn: sqlite3.Connection,
         req: dict[str, Any],
         *,
         log_decision: Callable[[sqlite3.Connection, str, str, str, str, str], None],
         api_tenant_id: str | None = None,
-    ) -> tuple[int, dict[str, Any]]:
+    ) -> tuple[ProxyPlan | None, tuple[int, dict[str, Any]] | None]:
         token = req.get("wave_mutation_token")
         method = str(req.get("method", "GET")).upper()
         url = str(req.get("url", "")).strip()
         sanitized_url = self._sanitize_url(url)
 
-        def deny(reason_code: str, message: str, wave_id: str | None = None) -> tuple[int, dict[str, Any]]:
-            if wave_id:
-                log_decision(conn, wave_id, "DENY", f"{message} ({method} {sanitized_url})", reason_code, "ocean.proxy.http")
-                conn.commit()
-            return 403, {
-                "status": "REJECTED",
-                "reason_code": reason_code,
-                "message": message,
-                "url": sanitized_url,
-                "method": method,
-            }
+        def deny(
+            reason_code: str, message: str, wave_id: str | None = None
+        ) -> tuple[None, tuple[int, dict[str, Any]]]:
+            return None, self._proxy_deny(conn, log_decision, method, sanitized_url, reason_code, message, wave_id)
 
         if not token:
             return deny("TOKEN_MISSING", "wave_mutation_token is required.")
 
-        token_payload, token_error = self.decode_wave_mutation_token(str(token))
+        token_id, token_payload, token_error = self._verify_wave_mutation_token(str(token))
         if token_error or not token_payload:
             return deny("TOKEN_INVALID_SIGNATURE", "Mutation token signature is invalid.")
 
@@ -365,7 +477,7 @@ class MutationBoundaryService:
 
         exp = int(token_payload.get("exp", 0))
         now_epoch = int(time.time())
-        replay_decision = self._token_replay_decision(str(token), exp_epoch=exp, now_epoch=now_epoch)
+        replay_decision = self._token_replay_decision(token_id, exp_epoch=exp, now_epoch=now_epoch)
         if replay_decision:
             return deny("TOKEN_REPLAY_DETECTED", "Mutation token replay threshold exceeded.", wave_id)
         if exp <= now_epoch:
@@ -376,7 +488,9 @@ class MutationBoundaryService:
         if api_tenant_id and wave[3] and str(wave[3]) != api_tenant_id:
             return deny("TENANT_MISMATCH", "API key tenant does not match token wave tenant.", wave_id)
 
-        scope = token_payload.get("scope") or {}
+        scope = self._resolve_token_scope(conn, token_payload)
+        if scope is None:
+            return deny("TOKEN_INVALID_SIGNATURE", "Mutation token scope reference not found.", wave_id)
         proxy_scope = scope.get("http_proxy") or {}
         scope_tools = {str(t) for t in (scope.get("allowlisted_tools", []) or [])}
         scope_paths = [str(p) for p in (scope.get("allowlisted_paths", []) or [])]
@@ -550,61 +664,154 @@ class MutationBoundaryService:
         elif req.get("body") is not None:
             data = str(req.get("body")).encode("utf-8")
 
+        return ProxyPlan(
+            wave_id=wave_id,
+            method=method,
+            url=url,
+            sanitized_url=sanitized_url,
+            headers=headers,
+            data=data,
+        ), None
+
+    @staticmethod
+    def _proxy_deny(
+        conn: sqlite3.Connection,
+        log_decision: Callable[[sqlite3.Connection, str, str, str, str, str], None],
+        method: str,
+        sanitized_url: str,
+        reason_code: str,
+        message: str,
+        wave_id: str | None = None,
+    ) -> tuple[int, dict[str, Any]]:
+        if wave_id:
+            log_decision(conn, wave_id, "DENY", f"{message} ({method} {sanitized_url})", reason_code, "ocean.proxy.http")
+            conn.commit()
+        return 403, {
+            "status": "REJECTED",
+            "reason_code": reason_code,
+            "message": message,
+            "url": sanitized_url,
+            "method": method,
+        }
+
+    def _fetch_proxy_target(self, plan: ProxyPlan) -> ProxyFetchResult:
         try:
-            proxy_req = urllib.request.Request(url, data=data, headers=headers, method=method)
+            proxy_req = urllib.request.Request(plan.url, data=plan.data, headers=plan.headers, method=plan.method)
             with urllib.request.urlopen(proxy_req, timeout=self.config.proxy_timeout_seconds) as resp:
                 raw = resp.read(self.config.proxy_max_response_bytes + 1)
                 if len(raw) > self.config.proxy_max_response_bytes:
-                    return deny("RESPONSE_TOO_LARGE", "Proxy response exceeds max allowed bytes.", wave_id)
-                body_text = raw.decode("utf-8", errors="replace")
-                selected_headers = {
-                    "content-type": resp.headers.get("Content-Type"),
-                    "content-length": resp.headers.get("Content-Length"),
-                }
-                log_decision(conn, wave_id, "ALLOW", f"{method} {sanitized_url}", "http_proxy_allow", "ocean.proxy.http")
-                conn.commit()
-                return 200, {
-                    "status": "ALLOWED",
-                    "reason_code": "OK",
-                    "wave_id": wave_id,
-                    "url": sanitized_url,
-                    "method": method,
-                    "status_code": resp.status,
-                    "headers": selected_headers,
-                    "body": body_text,
-                    "truncated": False,
-                }
+                    return ProxyFetchResult(kind="too_large")
+                return ProxyFetchResult(
+                    kind="ok",
+                    status_code=resp.status,
+                    headers={
+                        "content-type": resp.headers.get("Content-Type"),
+                        "content-length": resp.headers.get("Content-Length"),
+                    },
+                    body=raw.decode("utf-8", errors="replace"),
+                )
         except urllib.error.HTTPError as exc:
-            log_decision(
+            return ProxyFetchResult(kind="http_error", status_code=exc.code)
+        except Exception as exc:
+            return ProxyFetchResult(kind="transport_error", error=str(exc))
+
+    def _record_proxy_outcome(
+        self,
+        conn: sqlite3.Connection,
+        plan: ProxyPlan,
+        outcome: ProxyFetchResult,
+        *,
+        log_decision: Callable[[sqlite3.Connection, str, str, str, str, str], None],
+    ) -> tuple[int, dict[str, Any]]:
+        wave_id, method, sanitized_url = plan.wave_id, plan.method, plan.sanitized_url
+        if outcome.kind == "too_large":
+            return self._proxy_deny(
                 conn,
+                log_decision,
+                method,
+                sanitized_url,
+                "RESPONSE_TOO_LARGE",
+                "Proxy response exceeds max allowed bytes.",
                 wave_id,
-                "DENY",
-                f"{method} {sanitized_url} -> HTTP {exc.code}",
-                "http_proxy_target_error",
-                "ocean.proxy.http",
             )
+        if outcome.kind == "ok":
+            log_decision(conn, wave_id, "ALLOW", f"{method} {sanitized_url}", "http_proxy_allow", "ocean.proxy.http")
             conn.commit()
-            return 403, {
-                "status": "REJECTED",
-                "reason_code": "TARGET_HTTP_ERROR",
-                "message": f"Target responded with HTTP {exc.code}",
+            return 200, {
+                "status": "ALLOWED",
+                "reason_code": "OK",
+                "wave_id": wave_id,
                 "url": sanitized_url,
                 "method": method,
+                "status_code": outcome.status_code,
+                "headers": outcome.headers,
+                "body": outcome.body,
+                "truncated": False,
             }
-        except Exception as exc:
+        if outcome.kind == "http_error":
             log_decision(
                 conn,
                 wave_id,
                 "DENY",
-                f"{method} {sanitized_url} -> {exc}",
-                "http_proxy_transport_error",
+                f"{method} {sanitized_url} -> HTTP {outcome.status_code}",
+                "http_proxy_target_error",
                 "ocean.proxy.http",
             )
             conn.commit()
             return 403, {
                 "status": "REJECTED",
                 "reason_code": "TARGET_HTTP_ERROR",
-                "message": f"Proxy transport error: {exc}",
+                "message": f"Target responded with HTTP {outcome.status_code}",
                 "url": sanitized_url,
                 "method": method,
             }
+        log_decision(
+            conn,
+            wave_id,
+            "DENY",
+            f"{method} {sanitized_url} -> {outcome.error}",
+            "http_proxy_transport_error",
+            "ocean.proxy.http",
+        )
+        conn.commit()
+        return 403, {
+            "status": "REJECTED",
+            "reason_code": "TARGET_HTTP_ERROR",
+            "message": f"Proxy transport error: {outcome.error}",
+            "url": sanitized_url,
+            "method": method,
+        }
+
+    def proxy_http(
+        self,
+        conn: sqlite3.Connection,
+        req: dict[str, Any],
+        *,
+        log_decision: Callable[[sqlite3.Connection, str, str, str, str, str], None],
+        api_tenant_id: str | None = None,
+    ) -> tuple[int, dict[str, Any]]:
+        plan, denied = self._authorize_proxy_request(conn, req, log_decision=log_decision, api_tenant_id=api_tenant_id)
+        if denied is not None:
+            return denied
+        assert plan is not None
+        return self._record_proxy_outcome(conn, plan, self._fetch_proxy_target(plan), log_decision=log_decision)
+
+    async def proxy_http_async(
+        self,
+        conn: sqlite3.Connection,
+        req: dict[str, Any],
+        *,
+        log_decision: Callable[[sqlite3.Connection, str, str, str, str, str], None],
+        run_db: Callable[..., Awaitable[Any]],
+        run_io: Callable[..., Awaitable[Any]],
+        api_tenant_id: str | None = None,
+    ) -> tuple[int, dict[str, Any]]:
+        # Policy checks and decision logging touch SQLite; the outbound call does not.
+        # Splitting them keeps a slow target from holding a DB worker.
+        plan, denied = await run_db(
+            self._authorize_proxy_request, conn, req, log_decision=log_decision, api_tenant_id=api_tenant_id
+        )
+        if denied is not None:
+            return denied
+        outcome = await run_io(self._fetch_proxy_target, plan)
+        return await run_db(self._record_proxy_outcome, conn, plan, outcome, log_decision=log_decision)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import struct
+from typing import Any
+
+# swt2 claims layout (big-endian):
+#   u8 version | u64 exp | fields...
+# Each field is u8 kind | u16 length | bytes, in _SWT2_FIELDS order.
+# Kind 1 packs a lowercase hex digest as raw bytes (halves sha256 hashes);
+# kind 0 is plain UTF-8.
+SWT2_VERSION = 2
+_SWT2_HEADER = struct.Struct(">BQ")
+_SWT2_FIELD_HEADER = struct.Struct(">BH")
+_SWT2_FIELDS = (
+    "wave_id",
+    "agent_id",
+    "policy_manifest_hash",
+    "policy_version",
+    "wave_template_id",
+    "scope_hash",
+)
+_KIND_TEXT = 0
+_KIND_HEX = 1
+_HEX_CHARS = frozenset("0123456789abcdef")
+
+
+class MutationTokenCodecError(ValueError):
+    pass
+
+
+def _pack_field(value: str) -> bytes:
+    if value and len(value) % 2 == 0 and set(value) <= _HEX_CHARS:
+        kind, raw = _KIND_HEX, bytes.fromhex(value)
+    else:
+        kind, raw = _KIND_TEXT, value.encode("utf-8")
+    if len(raw) > 0xFFFF:
+        raise MutationTokenCodecError("swt2 claim field too long")
+    return _SWT2_FIELD_HEADER.pack(kind, len(raw)) + raw
+
+
+def pack_swt2_claims(claims: dict[str, Any]) -> bytes:
+    parts = [_SWT2_HEADER.pack(SWT2_VERSION, int(claims["exp"]))]
+    for name in _SWT2_FIELDS:
+        parts.append(_pack_field(str(claims.get(name) or "")))
+    return b"".join(parts)
+
+
+def unpack_swt2_claims(data: bytes) -> dict[str, Any]:
+    try:
+        version, exp = _SWT2_HEADER.unpack_from(data, 0)
+        if version != SWT2_VERSION:
+            raise MutationTokenCodecError("unsupported swt2 claims version")
+        offset = _SWT2_HEADER.size
+        claims: dict[str, Any] = {"v": version, "exp": exp}
+        for name in _SWT2_FIELDS:
+            kind, length = _SWT2_FIELD_HEADER.unpack_from(data, offset)
+            offset += _SWT2_FIELD_HEADER.size
+            raw = data[offset : offset + length]
+            if len(raw) != length:
+                raise MutationTokenCodecError("truncated swt2 claims")
+            offset += length
+            if kind == _KIND_HEX:
+                claims[name] = raw.hex()
+            elif kind == _KIND_TEXT:
+                claims[name] = raw.decode("utf-8")
+            else:
+                raise MutationTokenCodecError("unknown swt2 field kind")
+        if offset != len(data):
+            raise MutationTokenCodecError("trailing bytes in swt2 claims")
+        return claims
+    except struct.error as exc:
+        raise MutationTokenCodecError(str(exc)) from exc
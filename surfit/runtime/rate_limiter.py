@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+_WINDOW_NS = int(RATE_LIMIT_WINDOW_SECONDS * 1_000_000_000)
+_WINDOW_US = int(RATE_LIMIT_WINDOW_SECONDS * 1_000_000)
+
+# GCRA bookkeeping is integer-only: a request is admitted when
+# tat - now + interval <= window, with interval = window // limit. Because
+# the interval is floored, a burst of exactly `limit` always fits, and
+# `limit + 1` never does while limit**2 + limit < window (in clock units).
+
+# GCRA over Redis: one key per tenant:bucket holding the theoretical arrival
+# time (TAT) in microseconds. Redis TIME keeps every worker on the same clock.
+# Lua numbers are doubles, exact for integers up to 2**53 (~285 years of
+# microseconds), so bursts are exact for limits below ~7,700 per minute.
+_REDIS_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+  tat = now
+end
+if tat - now + interval > window then
+  return 0
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+return 1
+"""
+
+
+class RateLimiter(Protocol):
+    def check(self, tenant_id: str, bucket: str, limit_per_min: int) -> bool: ...
+
+
+class RateLimitOverrides:
+    """Per-tenant limit overrides keyed by bucket name.
+
+    Config shape: {"tenants": {"tenant_acme": {"proxy_request": 600}}}.
+    A value of 0 disables limiting for that tenant/bucket.
+    """
+
+    def __init__(self, config_path: Path | None = None, overrides: dict[str, dict[str, int]] | None = None):
+        self.config_path = Path(config_path) if config_path else None
+        self._overrides: dict[tuple[str, str], int] = {}
+        if overrides is not None:
+            self._overrides = self._index(overrides)
+        else:
+            self.reload()
+
+    @staticmethod
+    def _index(raw: dict[str, Any]) -> dict[tuple[str, str], int]:
+        out: dict[tuple[str, str], int] = {}
+        for tenant_id, buckets in raw.items():
+            tenant = str(tenant_id).strip()
+            if not tenant or not isinstance(buckets, dict):
+                continue
+            for bucket, limit in buckets.items():
+                try:
+                    out[(tenant, str(bucket).strip())] = int(limit)
+                except (TypeError, ValueError):
+                    continue
+        return out
+
+    def reload(self) -> None:
+        if self.config_path is None or not self.config_path.exists():
+            self._overrides = {}
+            return
+        try:
+            payload = json.loads(self.config_path.read_text(encoding="utf-8"))
+        except Exception:
+            self._overrides = {}
+            return
+        tenants = payload.get("tenants", {}) if isinstance(payload, dict) else {}
+        self._overrides = self._index(tenants) if isinstance(tenants, dict) else {}
+
+    def limit_for(self, tenant_id: str, bucket: str, default_limit: int) -> int:
+        return self._overrides.get((tenant_id, bucket), default_limit)
+
+
+class InMemoryRateLimiter:
+    """Process-local GCRA limiter with lock striping.
+
+    Each tenant:bucket key stores a single int (its theoretical arrival time in
+    nanoseconds), so memory is constant per key and tenants on different
+    stripes never contend.
+    """
+
+    def __init__(
+        self,
+        *,
+        stripes: int = 64,
+        overrides: RateLimitOverrides | None = None,
+        clock: Callable[[], float] | None = None,
+        prune_threshold: int = 4096,
+    ):
+        self.stripes = max(1, int(stripes))
+        self.overrides = overrides or RateLimitOverrides()
+        self.clock = clock or time.monotonic
+        self.prune_threshold = max(1, int(prune_threshold))
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+        self._tats: list[dict[str, int]] = [{} for _ in range(self.stripes)]
+
+    def _stripe(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self.stripes
+
+    @staticmethod
+    def _prune(tats: dict[str, int], now: int) -> None:
+        # A TAT in the past is equivalent to an absent key.
+        for stale in [k for k, tat in tats.items() if tat <= now]:
+            del tats[stale]
+
+    def check(self, tenant_id: str, bucket: str, limit_per_min: int) -> bool:
+        limit = self.overrides.limit_for(tenant_id, bucket, limit_per_min)
+        if limit <= 0:
+            return True
+        interval = _WINDOW_NS // limit
+        key = f"{tenant_id}:{bucket}"
+        idx = self._stripe(key)
+        with self._locks[idx]:
+            now = int(self.clock() * 1_000_000_000)
+            tats = self._tats[idx]
+            tat = max(tats.get(key, now), now)
+            if tat - now + interval > _WINDOW_NS:
+                return False
+            tats[key] = tat + interval
+            if len(tats) > self.prune_threshold:
+                self._prune(tats, now)
+            return True
+
+
+class RedisRateLimiter:
+    """GCRA limiter shared across API workers via a single Redis Lua script.
+
+    Falls back to a process-local limiter when Redis is unreachable so that a
+    cache outage degrades to per-worker limits instead of failing requests.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        overrides: RateLimitOverrides | None = None,
+        key_prefix: str = "surfit:rl:",
+        fallback: InMemoryRateLimiter | None = None,
+    ):
+        self.client = client
+        self.overrides = overrides or RateLimitOverrides()
+        self.key_prefix = key_prefix
+        self.fallback = fallback or InMemoryRateLimiter(overrides=self.overrides)
+        self._script = client.register_script(_REDIS_GCRA_SCRIPT)
+
+    def check(self, tenant_id: str, bucket: str, limit_per_min: int) -> bool:
+        limit = self.overrides.limit_for(tenant_id, bucket, limit_per_min)
+        if limit <= 0:
+            return True
+        interval_us = max(1, _WINDOW_US // limit)
+        try:
+            allowed = self._script(
+                keys=[f"{self.key_prefix}{tenant_id}:{bucket}"],
+                args=[interval_us, _WINDOW_US],
+            )
+        except Exception:
+            return self.fallback.check(tenant_id, bucket, limit)
+        return int(allowed) == 1
+
+
+def build_rate_limiter(
+    *,
+    redis_url: str = "",
+    overrides_path: Path | None = None,
+    stripes: int = 64,
+) -> RateLimiter:
+    overrides = RateLimitOverrides(overrides_path)
+    local = InMemoryRateLimiter(stripes=stripes, overrides=overrides)
+    if not redis_url:
+        return local
+    try:
+        import redis
+    except ModuleNotFoundError:
+        return local
+    try:
+        client = redis.Redis.from_url(redis_url, socket_connect_timeout=2, socket_timeout=2)
+        return RedisRateLimiter(client, overrides=overrides, fallback=local)
+    except Exception:
+        return local
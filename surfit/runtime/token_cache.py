@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified mutation-token claims keyed by token digest.
+
+    Entries are only served until the token's own `exp`, so a cache hit can
+    never extend a token's validity. Cached claims are shared; callers must
+    treat them as read-only.
+    """
+
+    def __init__(self, *, max_entries: int = 4096, clock: Callable[[], float] | None = None):
+        self.max_entries = max(0, int(max_entries))
+        self.clock = clock or time.time
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[dict[str, Any], int]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, token_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(token_id)
+            if entry is None:
+                self._misses += 1
+                return None
+            claims, exp_epoch = entry
+            if exp_epoch <= self.clock():
+                del self._entries[token_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token_id)
+            self._hits += 1
+            return claims
+
+    def put(self, token_id: str, claims: dict[str, Any], exp_epoch: int) -> None:
+        if self.max_entries == 0 or exp_epoch <= self.clock():
+            return
+        with self._lock:
+            self._entries[token_id] = (claims, int(exp_epoch))
+            self._entries.move_to_end(token_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
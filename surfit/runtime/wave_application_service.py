@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, is_dataclass
 import sqlite3
 from typing import Any, Callable
 
@@ -49,12 +49,70 @@ class WaveRunApplicationDeps:
     wave_execution_error_type: type[Exception]
 
 
+@dataclass(frozen=True)
+class WaveExecutionJob:
+    wave_id: str
+    tenant_id: str
+    workspace_dir: str
+    req: Any
+    output_path: str
+    policy_manifest_hash: str
+    wave_mutation_token: str
+    wave_mutation_token_expires_at: str
+    handler_request: Any
+
+    @classmethod
+    def from_preparation(
+        cls, prep_result: WaveRunPreparationResult, request: WaveRunApplicationRequest
+    ) -> WaveExecutionJob:
+        return cls(
+            wave_id=request.wave_id,
+            tenant_id=request.tenant_id,
+            workspace_dir=request.workspace_dir,
+            req=request.req,
+            output_path=prep_result.prepared_context.output_path,
+            policy_manifest_hash=prep_result.policy_manifest_hash,
+            wave_mutation_token=prep_result.wave_mutation_token,
+            wave_mutation_token_expires_at=prep_result.wave_mutation_token_expires_at,
+            handler_request=prep_result.handler_request,
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        req = self.req.model_dump() if hasattr(self.req, "model_dump") else dict(vars(self.req))
+        handler_request = asdict(self.handler_request) if is_dataclass(self.handler_request) else dict(vars(self.handler_request))
+        return {
+            "wave_id": self.wave_id,
+            "tenant_id": self.tenant_id,
+            "workspace_dir": self.workspace_dir,
+            "req": req,
+            "output_path": self.output_path,
+            "policy_manifest_hash": self.policy_manifest_hash,
+            "wave_mutation_token": self.wave_mutation_token,
+            "wave_mutation_token_expires_at": self.wave_mutation_token_expires_at,
+            "handler_request": handler_request,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any], *, req_factory: Callable[[dict[str, Any]], Any]) -> WaveExecutionJob:
+        return cls(
+            wave_id=str(payload["wave_id"]),
+            tenant_id=str(payload["tenant_id"]),
+            workspace_dir=str(payload["workspace_dir"]),
+            req=req_factory(dict(payload["req"])),
+            output_path=str(payload["output_path"]),
+            policy_manifest_hash=str(payload["policy_manifest_hash"]),
+            wave_mutation_token=str(payload["wave_mutation_token"]),
+            wave_mutation_token_expires_at=str(payload["wave_mutation_token_expires_at"]),
+            handler_request=DemoHandlerRequest(**payload["handler_request"]),
+        )
+
+
 class WaveApplicationService:
-    def run_wave(
+    def _prepare(
         self,
         request: WaveRunApplicationRequest,
         deps: WaveRunApplicationDeps,
-    ) -> WaveRunApplicationResult:
+    ) -> tuple[WaveRunPreparationResult | None, WaveRunApplicationResult | None]:
         prep_req = WaveRunPreparationRequest(
             req=request.req,
             tenant_id=request.tenant_id,
@@ -78,26 +136,78 @@ class WaveApplicationService:
                 request.tenant_id,
                 snapshot,
             )
-            return WaveRunApplicationResult(payload=payload, http_status=prep_deny.http_status)
+            return None, WaveRunApplicationResult(payload=payload, http_status=prep_deny.http_status)
 
         assert prep_result is not None
-        return self._execute_wave(prep_result, request, deps)
+        return prep_result, None
 
-    def _execute_wave(
+    def run_wave(
         self,
-        prep_result: WaveRunPreparationResult,
         request: WaveRunApplicationRequest,
         deps: WaveRunApplicationDeps,
     ) -> WaveRunApplicationResult:
-        pinned_policy_manifest_hash = prep_result.policy_manifest_hash
-        output_path = prep_result.prepared_context.output_path
-        wave_mutation_token = prep_result.wave_mutation_token
-        wave_mutation_token_expires_at = prep_result.wave_mutation_token_expires_at
+        prep_result, denied = self._prepare(request, deps)
+        if denied is not None:
+            return denied
+        assert prep_result is not None
+        job = WaveExecutionJob.from_preparation(prep_result, request)
+        return self._execute_wave(job, request.conn, request.max_runtime_seconds, deps)
+
+    def enqueue_wave(
+        self,
+        request: WaveRunApplicationRequest,
+        deps: WaveRunApplicationDeps,
+        *,
+        enqueue: Callable[[sqlite3.Connection, WaveExecutionJob], None],
+    ) -> WaveRunApplicationResult:
+        prep_result, denied = self._prepare(request, deps)
+        if denied is not None:
+            return denied
+        assert prep_result is not None
+        job = WaveExecutionJob.from_preparation(prep_result, request)
+        enqueue(request.conn, job)
+        deps.update_wave_status(request.conn, request.wave_id, "queued", None, None, None)
+        request.conn.commit()
+        return WaveRunApplicationResult(
+            payload={
+                "wave_id": request.wave_id,
+                "tenant_id": request.tenant_id,
+                "status": "queued",
+                "wave_token": job.wave_mutation_token,
+                "wave_mutation_token": job.wave_mutation_token,
+                "wave_mutation_token_expires_at": job.wave_mutation_token_expires_at,
+                "policy_manifest_hash": job.policy_manifest_hash,
+                "policy_manifest_hash_prefix": job.policy_manifest_hash[:12],
+            }
+        )
+
+    def execute_job(
+        self,
+        job: WaveExecutionJob,
+        conn: sqlite3.Connection,
+        max_runtime_seconds: int,
+        deps: WaveRunApplicationDeps,
+    ) -> WaveRunApplicationResult:
+        deps.update_wave_status(conn, job.wave_id, "running", None, None, None)
+        conn.commit()
+        return self._execute_wave(job, conn, max_runtime_seconds, deps)
+
+    def _execute_wave(
+        self,
+        job: WaveExecutionJob,
+        conn: sqlite3.Connection,
+        max_runtime_seconds: int,
+        deps: WaveRunApplicationDeps,
+    ) -> WaveRunApplicationResult:
+        pinned_policy_manifest_hash = job.policy_manifest_hash
+        output_path = job.output_path
+        wave_mutation_token = job.wave_mutation_token
+        wave_mutation_token_expires_at = job.wave_mutation_token_expires_at
         started = deps.monotonic()
 
         try:
-            handler_request = prep_result.handler_request
-            handler_deps = deps.build_handler_deps(request.conn)
+            handler_request = job.handler_request
+            handler_deps = deps.build_handler_deps(conn)
             try:
                 evidence = deps.dispatch_template_handler(handler_request, handler_deps)
             except DemoHandlerError as e:
@@ -106,33 +216,33 @@ class WaveApplicationService:
                 raise deps.wave_execution_error_type("WAVE_TEMPLATE_INVALID", "Unsupported wave template.", "run_wave")
 
             elapsed = deps.monotonic() - started
-            if elapsed > request.max_runtime_seconds:
-                raise TimeoutError(f"Wave exceeded max runtime of {request.max_runtime_seconds}s")
+            if elapsed > max_runtime_seconds:
+                raise TimeoutError(f"Wave exceeded max runtime of {max_runtime_seconds}s")
 
             output_hash = deps.sha256_file(output_path)
             evidence["output_hash"] = output_hash
-            evidence["workspace_dir"] = request.workspace_dir
+            evidence["workspace_dir"] = job.workspace_dir
             deps.write_manifest(
-                request.conn,
-                request.wave_id,
-                request.workspace_dir,
-                request.req,
+                conn,
+                job.wave_id,
+                job.workspace_dir,
+                job.req,
                 output_path,
                 evidence,
             )
             deps.update_wave_status(
-                request.conn,
-                request.wave_id,
+                conn,
+                job.wave_id,
                 "complete",
                 None,
                 None,
                 None,
             )
-            request.conn.commit()
+            conn.commit()
 
             response_payload: dict[str, Any] = {
-                "wave_id": request.wave_id,
-                "tenant_id": request.tenant_id,
+                "wave_id": job.wave_id,
+                "tenant_id": job.tenant_id,
                 "status": "running",
                 "wave_token": wave_mutation_token,
                 "wave_mutation_token": wave_mutation_token,
@@ -162,20 +272,20 @@ class WaveApplicationService:
                 err_node = "run_wave"
                 err_message = str(e)
 
-            deps.log_decision(request.conn, request.wave_id, "DENY", err_message, err_code, err_node)
+            deps.log_decision(conn, job.wave_id, "DENY", err_message, err_code, err_node)
             deps.update_wave_status(
-                request.conn,
-                request.wave_id,
+                conn,
+                job.wave_id,
                 "failed",
                 err_code,
                 err_message,
                 err_node,
             )
-            request.conn.commit()
+            conn.commit()
             return WaveRunApplicationResult(
                 payload={
-                    "wave_id": request.wave_id,
-                    "tenant_id": request.tenant_id,
+                    "wave_id": job.wave_id,
+                    "tenant_id": job.tenant_id,
                     "status": "failed",
                     "error": {
                         "code": err_code,
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class WaveJobQueue:
+    """SQLite-backed FIFO of prepared waves awaiting execution.
+
+    Claiming uses BEGIN IMMEDIATE so any number of worker threads or processes
+    sharing the database never pick up the same wave twice. A running job's
+    worker refreshes heartbeat_at while it works; jobs whose heartbeat stops
+    are the ones reap_stale treats as abandoned.
+    """
+
+    def __init__(self, *, now_iso: Callable[[], str]):
+        self.now_iso = now_iso
+
+    def ensure_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS wave_jobs (
+                wave_id TEXT PRIMARY KEY,
+                tenant_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload_json TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                error TEXT,
+                enqueued_at TEXT NOT NULL,
+                started_at TEXT,
+                heartbeat_at TEXT,
+                finished_at TEXT
+            )
+            """
+        )
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(wave_jobs)").fetchall()}
+        if "heartbeat_at" not in cols:
+            conn.execute("ALTER TABLE wave_jobs ADD COLUMN heartbeat_at TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_wave_jobs_status_enqueued ON wave_jobs(status, enqueued_at)")
+        conn.commit()
+
+    def enqueue(self, conn: sqlite3.Connection, *, wave_id: str, tenant_id: str, payload: dict[str, Any]) -> None:
+        conn.execute(
+            """
+            INSERT INTO wave_jobs (wave_id, tenant_id, status, payload_json, enqueued_at)
+            VALUES (?, ?, 'queued', ?, ?)
+            """,
+            (wave_id, tenant_id, json.dumps(payload, sort_keys=True), self.now_iso()),
+        )
+
+    def claim_next(self, conn: sqlite3.Connection, worker_id: str) -> tuple[str, dict[str, Any]] | None:
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                """
+                SELECT wave_id, payload_json
+                FROM wave_jobs
+                WHERE status = 'queued'
+                ORDER BY enqueued_at ASC
+                LIMIT 1
+                """
+            ).fetchone()
+            if not row:
+                conn.execute("COMMIT")
+                return None
+            now = self.now_iso()
+            conn.execute(
+                """
+                UPDATE wave_jobs
+                SET status = 'running', worker_id = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ?
+                WHERE wave_id = ?
+                """,
+                (worker_id, now, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return str(row[0]), json.loads(row[1] or "{}")
+
+    def heartbeat(self, conn: sqlite3.Connection, wave_id: str, worker_id: str) -> bool:
+        """Refresh a running job's heartbeat; False once worker_id no longer owns it."""
+        cur = conn.execute(
+            "UPDATE wave_jobs SET heartbeat_at = ? WHERE wave_id = ? AND status = 'running' AND worker_id = ?",
+            (self.now_iso(), wave_id, worker_id),
+        )
+        conn.commit()
+        return cur.rowcount > 0
+
+    def mark_finished(
+        self, conn: sqlite3.Connection, wave_id: str, *, worker_id: str, status: str, error: str | None = None
+    ) -> bool:
+        """Record the outcome of worker_id's attempt.
+
+        Returns False without touching the row if the job was reaped from
+        worker_id in the meantime, so a late finish can't overwrite the
+        attempt that replaced it.
+        """
+        # Payloads carry the short-lived wave token; drop them once the job is done.
+        cur = conn.execute(
+            """
+            UPDATE wave_jobs
+            SET status = ?, error = ?, payload_json = NULL, finished_at = ?
+            WHERE wave_id = ? AND status = 'running' AND worker_id = ?
+            """,
+            (status, error, self.now_iso(), wave_id, worker_id),
+        )
+        conn.commit()
+        return cur.rowcount > 0
+
+    def requeue_stale(self, conn: sqlite3.Connection, *, started_before_iso: str, max_attempts: int = 3) -> int:
+        requeued, failed = self.reap_stale(conn, started_before_iso=started_before_iso, max_attempts=max_attempts)
+        return requeued + len(failed)
+
+    def reap_stale(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        started_before_iso: str,
+        token_expires_before_iso: str | None = None,
+        max_attempts: int = 3,
+    ) -> tuple[int, list[tuple[str, str]]]:
+        """Requeue jobs whose worker vanished mid-run.
+
+        A running job counts as abandoned once its last heartbeat (or its
+        start, for rows written before heartbeats existed) is older than
+        started_before_iso.
+
+        A job is failed instead when it is out of attempts (WORKER_LOST) or its
+        wave mutation token expires before token_expires_before_iso
+        (WAVE_MUTATION_TOKEN_EXPIRED), since a re-run could not use it.
+        Returns (requeued count, [(wave_id, error)] for the failed ones).
+        """
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT wave_id,
+                       CASE
+                           WHEN attempts >= ? THEN 'WORKER_LOST'
+                           WHEN ? IS NOT NULL
+                                AND json_extract(payload_json, '$.wave_mutation_token_expires_at') < ?
+                               THEN 'WAVE_MUTATION_TOKEN_EXPIRED'
+                       END
+                FROM wave_jobs
+                WHERE status = 'running' AND COALESCE(heartbeat_at, started_at) < ?
+                """,
+                (max_attempts, token_expires_before_iso, token_expires_before_iso, started_before_iso),
+            ).fetchall()
+            requeued = 0
+            failed: list[tuple[str, str]] = []
+            for wave_id, error in rows:
+                if error is None:
+                    conn.execute(
+                        "UPDATE wave_jobs SET status = 'queued', worker_id = NULL WHERE wave_id = ?",
+                        (wave_id,),
+                    )
+                    requeued += 1
+                else:
+                    conn.execute(
+                        """
+                        UPDATE wave_jobs
+                        SET status = 'failed', error = ?, worker_id = NULL, payload_json = NULL, finished_at = ?
+                        WHERE wave_id = ?
+                        """,
+                        (error, self.now_iso(), wave_id),
+                    )
+                    failed.append((str(wave_id), str(error)))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return requeued, failed
+
+    def counts(self, conn: sqlite3.Connection) -> dict[str, int]:
+        rows = conn.execute("SELECT status, COUNT(*) FROM wave_jobs GROUP BY status").fetchall()
+        return {str(status): int(count) for status, count in rows}
+
+
+class WaveWorkerPool:
+    """Threads that drain a WaveJobQueue, each with its own SQLite connection.
+
+    on_failed(conn, wave_id, error_code, message) is called whenever a job
+    fails outside execute's own error handling (execute raised, or the job
+    was reaped), so the caller can fail the wave itself and log a decision.
+    While execute runs, the job's heartbeat is refreshed every
+    heartbeat_interval_seconds (capped at a third of stale_after_seconds)
+    from a separate connection. With stale_after_seconds set, one more
+    thread reaps jobs whose heartbeat is that old every
+    reap_interval_seconds; jobs whose mutation token has less than
+    token_min_remaining_seconds left are failed, not requeued.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue: WaveJobQueue,
+        connect: Callable[[], sqlite3.Connection],
+        execute: Callable[[sqlite3.Connection, str, dict[str, Any]], str],
+        workers: int = 4,
+        poll_interval_seconds: float = 0.5,
+        name: str = "surfit-wave-worker",
+        on_failed: Callable[[sqlite3.Connection, str, str, str], None] | None = None,
+        stale_after_seconds: float | None = None,
+        reap_interval_seconds: float = 30.0,
+        heartbeat_interval_seconds: float = 15.0,
+        token_min_remaining_seconds: float = 60.0,
+        max_attempts: int = 3,
+        now_utc: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.queue = queue
+        self.connect = connect
+        self.execute = execute
+        self.workers = max(1, int(workers))
+        self.poll_interval_seconds = poll_interval_seconds
+        self.name = name
+        self.on_failed = on_failed
+        self.stale_after_seconds = stale_after_seconds
+        self.reap_interval_seconds = reap_interval_seconds
+        self.heartbeat_interval_seconds = heartbeat_interval_seconds
+        if stale_after_seconds is not None:
+            self.heartbeat_interval_seconds = min(heartbeat_interval_seconds, stale_after_seconds / 3)
+        self.token_min_remaining_seconds = token_min_remaining_seconds
+        self.max_attempts = max_attempts
+        self.now_utc = now_utc
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for idx in range(self.workers):
+            # Worker ids must be unique across processes sharing the queue.
+            worker_id = f"{self.name}-{os.getpid()}-{idx}"
+            thread = threading.Thread(target=self._run, args=(worker_id,), name=f"{self.name}-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if self.stale_after_seconds is not None:
+            thread = threading.Thread(target=self._reap_loop, name=f"{self.name}-reaper", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def stop(self, *, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def drain_once(self, conn: sqlite3.Connection, worker_id: str) -> bool:
+        claimed = self.queue.claim_next(conn, worker_id)
+        if claimed is None:
+            return False
+        wave_id, payload = claimed
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop, args=(wave_id, worker_id, stop_heartbeat),
+            name=f"{worker_id}-heartbeat", daemon=True,
+        )
+        heartbeat.start()
+        try:
+            status = self.execute(conn, wave_id, payload)
+            error = None
+        except Exception as exc:
+            logger.exception("wave job %s failed", wave_id)
+            conn.rollback()
+            status, error = "failed", str(exc)
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        if not self.queue.mark_finished(conn, wave_id, worker_id=worker_id, status=status, error=error):
+            logger.warning("wave job %s was reaped from %s before it finished; leaving it to the new attempt",
+                           wave_id, worker_id)
+        elif error is not None:
+            self._report_failure(conn, wave_id, "WAVE_EXECUTION_ERROR", error)
+        return True
+
+    def _heartbeat_loop(self, wave_id: str, worker_id: str, stop: threading.Event) -> None:
+        # The connection is opened on the first beat so short jobs never pay for it.
+        conn: sqlite3.Connection | None = None
+        try:
+            while not stop.wait(self.heartbeat_interval_seconds):
+                if conn is None:
+                    conn = self.connect()
+                try:
+                    if not self.queue.heartbeat(conn, wave_id, worker_id):
+                        return
+                except sqlite3.Error:
+                    logger.exception("heartbeat for wave job %s failed", wave_id)
+                    if conn.in_transaction:
+                        conn.rollback()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def reap_once(self, conn: sqlite3.Connection) -> int:
+        """Requeue or fail stale running jobs; returns how many were touched."""
+        if self.stale_after_seconds is None:
+            return 0
+        now = self.now_utc()
+        requeued, failed = self.queue.reap_stale(
+            conn,
+            started_before_iso=(now - timedelta(seconds=self.stale_after_seconds)).isoformat(),
+            token_expires_before_iso=(now + timedelta(seconds=self.token_min_remaining_seconds)).isoformat(),
+            max_attempts=self.max_attempts,
+        )
+        for wave_id, error in failed:
+            self._report_failure(conn, wave_id, error, "Wave job abandoned by its worker")
+        if requeued or failed:
+            logger.warning("reaped stale wave jobs: requeued=%d failed=%d counts=%s",
+                           requeued, len(failed), self.queue.counts(conn))
+            self._wake.set()
+        return requeued + len(failed)
+
+    def _report_failure(self, conn: sqlite3.Connection, wave_id: str, error_code: str, message: str) -> None:
+        if self.on_failed is None:
+            return
+        try:
+            self.on_failed(conn, wave_id, error_code, message)
+        except Exception:
+            logger.exception("could not record failure of wave %s", wave_id)
+            conn.rollback()
+
+    def _reap_loop(self) -> None:
+        conn = self.connect()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.reap_once(conn)
+                except sqlite3.Error:
+                    logger.exception("stale wave job reaping failed")
+                    if conn.in_transaction:
+                        conn.rollback()
+                self._stop.wait(self.reap_interval_seconds)
+        finally:
+            conn.close()
+
+    def _run(self, worker_id: str) -> None:
+        conn = self.connect()
+        try:
+            while not self._stop.is_set():
+                if self.drain_once(conn, worker_id):
+                    continue
+                self._wake.wait(self.poll_interval_seconds)
+                self._wake.clear()
+        finally:
+            conn.close()
@@ -30,6 +30,7 @@ class WaveInsertPayload:
     wave_mutation_token_hash: str | None = None
     wave_mutation_token_expires_at: str | None = None
     wave_mutation_token_payload_json: str | None = None
+    mutation_scope: dict[str, Any] | None = None
 
 
 class WaveLifecycleStore:
@@ -109,6 +110,15 @@ class WaveLifecycleStore:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS mutation_scopes (
+                scope_hash TEXT PRIMARY KEY,
+                scope_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
         self._ensure_wave_columns(conn)
         self._ensure_wave_decision_columns(conn)
         self._ensure_api_event_columns(conn)
@@ -320,6 +330,17 @@ class WaveLifecycleStore:
                 now,
             ),
         )
+        if payload.mutation_scope is not None:
+            self.store_mutation_scope(conn, payload.mutation_scope)
+
+    def store_mutation_scope(self, conn: sqlite3.Connection, scope: dict[str, Any]) -> str:
+        scope_json = self.canonicalize_policy_manifest(scope)
+        scope_hash = self.sha256_text(scope_json)
+        conn.execute(
+            "INSERT OR IGNORE INTO mutation_scopes (scope_hash, scope_json, created_at) VALUES (?, ?, ?)",
+            (scope_hash, scope_json, self.now_iso()),
+        )
+        return scope_hash
 
     def update_wave_status(
         self,
@@ -256,6 +256,7 @@ class WaveOrchestrator:
             wave_mutation_token_hash=wave_mutation_token_hash,
             wave_mutation_token_expires_at=wave_mutation_token_expires_at,
             wave_mutation_token_payload_json=wave_mutation_token_payload_json,
+            mutation_scope=mutation_scope,
         )
         deps.log_decision(request.wave_id, "ALLOW", "wave token issued", "wave_token_issue", "run_wave", request.tenant_id)
         deps.commit()
@@ -0,0 +1,126 @@
+"""
+SurFit V1 — Cycle-Time Analytics Tests
+
+Run:  python -m pytest test_analytics.py -v
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import tempfile
+from copy import deepcopy
+from pathlib import Path
+
+from analytics import _run_filter, _run_times_sql, main, run_cycle_times, saw_trends, tool_latency_percentiles
+from engine import run_saw
+from logger import get_cycle_time_breakdown, get_run_logs, init_db, write_log
+from models import LogEntry, RunContext
+from test_engine import SAW_SPEC
+
+
+def _renamed_gate_spec() -> dict:
+    """Board metrics spec whose approval gate is not called n_approval."""
+    spec = deepcopy(SAW_SPEC)
+    for node in spec["graph"]["nodes"]:
+        if node["id"] == "n_approval":
+            node["id"] = "n_cfo_signoff"
+    for edge in spec["graph"]["edges"]:
+        for end in ("from", "to"):
+            if edge[end] == "n_approval":
+                edge[end] = "n_cfo_signoff"
+    return spec
+
+
+def _nearest_rank(values: list[float], pct: int) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct * len(ordered) / 100)) - 1]
+
+
+def test_cycle_times_use_gate_nodes_from_the_spec():
+    conn = init_db(":memory:")
+    spec = _renamed_gate_spec()
+    run_ids = []
+    for wait_ms in (250.0, 1000.0, 4000.0):
+        ctx = RunContext(state={"_approval_granted": True, "_approval_wait_ms": wait_ms})
+        run_saw(spec, ctx, conn)
+        run_ids.append(ctx.run_id)
+
+    # A legacy run: log rows only, no runs record or stored spec.
+    for node_id, tool_name, latency in (("n_start", "", 0.0), ("n_pull", "tool_x", 5.0), ("n_gate", "", 700.0)):
+        write_log(conn, LogEntry(run_id="legacy_run", saw_id="saw_legacy", node_id=node_id,
+                                 tool_name=tool_name, decision="allow", latency_ms=latency))
+
+    times = {row["run_id"]: row for row in run_cycle_times(conn)}
+    assert [times[r]["human_wait_time_ms"] for r in run_ids] == [250.0, 1000.0, 4000.0]
+    for run_id in run_ids:
+        logged = sum(l["latency_ms"] for l in get_run_logs(conn, run_id))
+        assert math.isclose(times[run_id]["total_ms"], logged, abs_tol=0.02)
+    assert times["legacy_run"]["human_wait_time_ms"] == 700.0
+    assert times["legacy_run"]["system_time_ms"] == 5.0
+
+    breakdown = get_cycle_time_breakdown(conn, run_ids[1])
+    assert breakdown["human_wait_time_ms"] == 1000.0 and breakdown["run_id"] == run_ids[1]
+
+    trends = saw_trends(conn)
+    assert len(trends) == 1 and trends[0]["runs"] == 3 and trends[0]["completed"] == 3
+    assert trends[0]["mean_human_wait_ms"] == 1750.0
+    print("  ✅ Cycle times: gate 'n_cfo_signoff' counted as human wait")
+    conn.close()
+
+
+def test_single_run_breakdown_only_expands_that_runs_spec():
+    conn = init_db(":memory:")
+    run_filter, gate_filter, params = _run_filter(run_ids=["run_x"])
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + _run_times_sql(run_filter, gate_filter), params)]
+    assert not any(step.startswith("SCAN r") for step in plan), plan
+    conn.close()
+
+
+def test_tool_latency_percentiles_match_nearest_rank():
+    conn = init_db(":memory:")
+    latencies = [float(v) for v in range(1, 101)] + [500.0]
+    for i, latency in enumerate(latencies):
+        write_log(conn, LogEntry(run_id=f"r{i}", saw_id="saw_a", node_id="n_pull",
+                                 tool_name="tool_pull", decision="allow", latency_ms=latency))
+    write_log(conn, LogEntry(run_id="r_hit", saw_id="saw_a", node_id="n_pull",
+                             tool_name="tool_pull", decision="allow", latency_ms=9999.0, cache_hit=True))
+    write_log(conn, LogEntry(run_id="r_b", saw_id="saw_b", node_id="n_other",
+                             tool_name="tool_other", decision="allow", latency_ms=3.0))
+
+    stats = {row["tool_name"]: row for row in tool_latency_percentiles(conn)}
+    pull = stats["tool_pull"]
+    assert pull["calls"] == len(latencies)
+    for p in (50, 95, 99):
+        assert pull[f"p{p}_ms"] == _nearest_rank(latencies, p), (p, pull)
+    assert pull["max_ms"] == 500.0
+
+    only_b = tool_latency_percentiles(conn, saw_id="saw_b", percentiles=(50,))
+    assert only_b == [{"tool_name": "tool_other", "calls": 1, "mean_ms": 3.0, "max_ms": 3.0, "p50_ms": 3.0}]
+    with_hits = {row["tool_name"]: row for row in tool_latency_percentiles(conn, include_cache_hits=True)}
+    assert with_hits["tool_pull"]["max_ms"] == 9999.0
+    conn.close()
+
+
+def test_cli_report_json(capsys):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "runs.db"
+        conn = init_db(db_path)
+        ctx = RunContext(state={"_approval_granted": True})
+        run_saw(SAW_SPEC, ctx, conn)
+        conn.close()
+
+        assert main(["--db", str(db_path), "--json", "--percentiles", "50,90"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        tools = {t["tool_name"] for t in report["tool_latency"]}
+        assert "tool_salesforce_read_pipeline" in tools
+        assert "p90_ms" in report["tool_latency"][0]
+        assert report["saw_trends"][0]["runs"] == 1
+
+
+if __name__ == "__main__":
+    print("Analytics tests:")
+    test_cycle_times_use_gate_nodes_from_the_spec()
+    test_single_run_breakdown_only_expands_that_runs_spec()
+    test_tool_latency_percentiles_match_nearest_rank()
+    print("\n✅ All analytics tests PASSED")
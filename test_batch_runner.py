@@ -0,0 +1,88 @@
+"""
+SurFit V1 — Batch Runner Tests
+
+Run:  python -m pytest test_batch_runner.py -v
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from batch_runner import run_batch
+from engine import TOOL_REGISTRY
+from logger import verify_run_integrity
+from models import RunContext
+from test_engine import SAW_SPEC
+
+
+def _jobs(count: int) -> list[tuple[dict, RunContext]]:
+    return [
+        (SAW_SPEC, RunContext(run_id=f"batch_run_{i:03d}", state={"_approval_granted": True}))
+        for i in range(count)
+    ]
+
+
+def test_batch_shares_identical_reads_across_concurrent_runs():
+    original = TOOL_REGISTRY["tool_salesforce_read_pipeline"]
+    calls = []
+    lock = threading.Lock()
+
+    def slow_read(inputs, ctx):
+        with lock:
+            calls.append(ctx.run_id)
+        time.sleep(0.05)
+        return original(inputs, ctx)
+
+    TOOL_REGISTRY["tool_salesforce_read_pipeline"] = slow_read
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "batch.db"
+            jobs = _jobs(24)
+            report = run_batch(jobs, db_path, workers=6)
+
+            conn = sqlite3.connect(str(db_path))
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert all(verify_run_integrity(conn, ctx.run_id)["valid"] for _, ctx in jobs)
+            completed = conn.execute("SELECT COUNT(*) FROM runs WHERE status = 'completed'").fetchone()[0]
+            conn.close()
+    finally:
+        TOOL_REGISTRY["tool_salesforce_read_pipeline"] = original
+
+    assert report.errors == {}
+    assert [s.run_id for s in report.summaries] == [ctx.run_id for _, ctx in jobs]
+    assert report.stats["statuses"] == {"completed": 24} and completed == 24
+    assert len(calls) == 1, calls
+    assert report.stats["tool_calls_shared"] + report.stats["tool_cache_hits"] >= 23
+    assert report.stats["runs_per_second"] > 0
+    print(f"  ✅ Batch: 24 runs, 1 Salesforce call, {report.stats['runs_per_second']} runs/s")
+
+
+def test_batch_records_failed_runs_and_keeps_going():
+    original = TOOL_REGISTRY["tool_reconcile_metrics"]
+
+    def flaky(inputs, ctx):
+        if ctx.run_id.endswith("_002"):
+            raise RuntimeError("bad unit")
+        return original(inputs, ctx)
+
+    TOOL_REGISTRY["tool_reconcile_metrics"] = flaky
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_batch(_jobs(4), Path(tmp) / "batch.db", workers=2, dedupe_reads=False)
+    finally:
+        TOOL_REGISTRY["tool_reconcile_metrics"] = original
+
+    assert report.errors == {2: "RuntimeError: bad unit"}
+    assert report.summaries[2] is None
+    assert report.stats["statuses"] == {"completed": 3} and report.stats["errors"] == 1
+
+
+if __name__ == "__main__":
+    print("Batch runner tests:")
+    test_batch_shares_identical_reads_across_concurrent_runs()
+    test_batch_records_failed_runs_and_keeps_going()
+    print("\n✅ All batch runner tests PASSED")
@@ -0,0 +1,79 @@
+"""
+SurFit V1 — Blob Store / LLM Ledger Tests
+
+Run:  python -m pytest test_blob_store.py -v
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+
+from blob_store import blob_stats, get_blob, iter_blob, put_blob
+from engine import run_saw
+from logger import get_llm_invocations, init_db, load_llm_invocation
+from models import RunContext
+from test_engine import SAW_SPEC
+
+
+def _llm_spec() -> dict:
+    spec = deepcopy(SAW_SPEC)
+    for node in spec["graph"]["nodes"]:
+        if node["id"] == "n_generate_summary":
+            node["tool"] = "tool_generate_summary_llm"
+    spec["policy_bundle"]["tools"]["allowlist"].append("tool_generate_summary_llm")
+    return spec
+
+
+def test_blobs_are_deduplicated_compressed_and_streamed():
+    conn = init_db(":memory:")
+    payload = ("quarterly pipeline commentary " * 5000).encode("utf-8")
+
+    digest = put_blob(conn, payload)
+    assert put_blob(conn, payload) == digest
+    assert conn.execute("SELECT encoding FROM blobs WHERE hash = ?", (digest,)).fetchone()[0] == "zlib"
+
+    stats = blob_stats(conn)
+    assert stats["blobs"] == 1 and stats["stored_bytes"] < stats["logical_bytes"] // 10
+
+    chunks = list(iter_blob(conn, digest, chunk_size=256))
+    assert len(chunks) > 1 and b"".join(chunks) == payload
+    assert get_blob(conn, digest) == payload
+
+    small = put_blob(conn, "ok")
+    assert list(iter_blob(conn, small)) == [b"ok"]
+    assert get_blob(conn, "0" * 64) is None
+    conn.close()
+
+
+def test_llm_ledger_references_full_payloads():
+    conn = init_db(":memory:")
+    for _ in range(2):
+        ctx = RunContext()
+        ctx.state["_approval_granted"] = True
+        assert run_saw(_llm_spec(), ctx, conn).status == "completed"
+
+    rows = get_llm_invocations(conn, ctx.run_id)
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["raw_tool_input_preview"] is None and row["llm_output_preview"] is None
+
+    record = load_llm_invocation(conn, row["id"])
+    assert record["payload_verified"]
+    assert record["raw_tool_input"]["reconciled_metrics"]["pipeline_usd"] == 4_250_000.00
+    assert record["sanitized_prompt_input"]["discrepancy_count"] == 1
+    assert record["llm_output_text"].startswith("Pipeline remains healthy.")
+
+    # Both runs made the identical call, so its payloads are stored once.
+    assert blob_stats(conn)["blobs"] == 3
+
+    conn.execute("UPDATE llm_invocations SET llm_output_text_hash = 'x' WHERE id = ?", (row["id"],))
+    assert not load_llm_invocation(conn, row["id"])["payload_verified"]
+    print("  ✅ LLM ledger: payloads replayable from 3 shared blobs")
+    conn.close()
+
+
+if __name__ == "__main__":
+    print("Blob store tests:")
+    test_blobs_are_deduplicated_compressed_and_streamed()
+    test_llm_ledger_references_full_payloads()
+    print("\n✅ All blob store tests PASSED")
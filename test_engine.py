@@ -5,7 +5,14 @@ Tests:
   1. Golden path: full run, approval granted, slides updated.
   2. Approval denied: run terminates at gate.
   3. Policy deny: wrong template ID → slides update blocked.
-  4. Branching graph: raises NotImplementedError.
+  4. Parallel branches: reads overlap, log order stays deterministic.
+  5. Cyclic graph: raises ValueError.
+  6. Buffered log writer: one commit per gate, crash marks run incomplete.
+  7. Resume: approval after a denied gate re-runs only what follows it.
+  8. Tool cache: repeat runs reuse read + reconcile results until the TTL lapses.
+  9. Execution policy: a timed-out read is retried, each attempt logged.
+ 10. Circuit breaker: a failing tool trips its breaker for later runs.
+ 11. Compiled spec: one cached plan per spec content, accepted by run_saw.
 
 Run:  python test_engine.py
 """
@@ -14,6 +21,8 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
+import time
 from copy import deepcopy
 
 from models import RunContext
@@ -205,22 +214,392 @@ def test_engine_policy_deny_wrong_template():
     conn.close()
 
 
-# ── Test 5: Branching graph raises ────────────────────────────────
+# ── Test 5: Parallel branches join at fan-in ─────────────────────
 
-def test_engine_rejects_branching():
-    branching_spec = deepcopy(SAW_SPEC)
-    branching_spec["graph"]["edges"].append(
-        {"from": "n_reconcile", "to": "n_end"}  # second edge from n_reconcile
+def _fan_out_spec() -> dict:
+    spec = deepcopy(SAW_SPEC)
+    spec["graph"]["edges"] = [
+        {"from": "n_start", "to": "n_salesforce_pull"},
+        {"from": "n_start", "to": "n_stripe_pull"},
+        {"from": "n_salesforce_pull", "to": "n_reconcile"},
+        {"from": "n_stripe_pull", "to": "n_reconcile"},
+        {"from": "n_reconcile", "to": "n_generate_summary"},
+        {"from": "n_generate_summary", "to": "n_approval"},
+        {"from": "n_approval", "to": "n_update_slides"},
+        {"from": "n_update_slides", "to": "n_end"},
+    ]
+    return spec
+
+
+def test_engine_parallel_branches():
+    from engine import TOOL_REGISTRY
+
+    def slow(tool_fn):
+        def wrapped(inputs, ctx):
+            time.sleep(0.2)
+            return tool_fn(inputs, ctx)
+        return wrapped
+
+    originals = {name: TOOL_REGISTRY[name] for name in ("tool_salesforce_read_pipeline", "tool_stripe_read_revenue")}
+    TOOL_REGISTRY.update({name: slow(fn) for name, fn in originals.items()})
+    try:
+        conn = _make_conn()
+        ctx = RunContext()
+        ctx.state["_approval_granted"] = True
+        ctx.state["_approval_wait_ms"] = 100.0
+        summary = run_saw(_fan_out_spec(), ctx, conn)
+    finally:
+        TOOL_REGISTRY.update(originals)
+
+    assert summary.status == "completed", summary.denial_reason
+    # Both reads overlapped: wall time is close to one read, not two.
+    assert summary.wall_time_ms < 350, summary.wall_time_ms
+    assert summary.system_time_ms >= 400
+    assert summary.critical_path[0] == "n_start" and summary.critical_path[-1] == "n_end"
+    assert summary.critical_path_ms < summary.system_time_ms + summary.human_wait_time_ms
+
+    # Log order is the deterministic topological order, not completion order.
+    node_ids = [l["node_id"] for l in get_run_logs(conn, ctx.run_id)]
+    assert node_ids == [
+        "n_start", "n_salesforce_pull", "n_stripe_pull", "n_reconcile",
+        "n_generate_summary", "n_approval", "n_update_slides", "n_end",
+    ], f"Log order: {node_ids}"
+    print(f"  ✅ Parallel branches: wall={summary.wall_time_ms:.1f}ms critical={summary.critical_path_ms:.1f}ms")
+    conn.close()
+
+
+# ── Test 6: Cycles are rejected ──────────────────────────────────
+
+def test_engine_rejects_cycles():
+    cyclic_spec = deepcopy(SAW_SPEC)
+    cyclic_spec["graph"]["edges"].append(
+        {"from": "n_reconcile", "to": "n_salesforce_pull"}
     )
 
+    conn = _make_conn()
+    try:
+        run_saw(cyclic_spec, RunContext(), conn)
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "cycle" in str(e)
+        print(f"  ✅ Cycle rejected: {e}")
+    conn.close()
+
+
+# ── Test 7: Buffered log writer ──────────────────────────────────
+
+def test_engine_commits_per_gate_not_per_node():
+    from logger import get_run_record, verify_run_integrity
+
+    conn = _make_conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    ctx = RunContext()
+    ctx.state["_approval_granted"] = True
+    summary = run_saw(SAW_SPEC, ctx, conn)
+    conn.set_trace_callback(None)
+
+    assert summary.status == "completed"
+    commits = [sql for sql in statements if sql.strip().upper() == "COMMIT"]
+    # run start, approval gate, run end
+    assert len(commits) == 3, commits
+    assert verify_run_integrity(conn, ctx.run_id)["valid"]
+    assert len(get_run_logs(conn, ctx.run_id)) == 8
+    assert get_run_record(conn, ctx.run_id)["status"] == "completed"
+    print(f"  ✅ Buffered log: {len(commits)} commits for 8 nodes")
+    conn.close()
+
+
+def test_engine_marks_run_incomplete_on_crash():
+    from engine import TOOL_REGISTRY
+    from logger import get_run_record, verify_run_integrity
+
+    def broken(inputs, ctx):
+        raise RuntimeError("connector crashed")
+
+    original = TOOL_REGISTRY["tool_reconcile_metrics"]
+    TOOL_REGISTRY["tool_reconcile_metrics"] = broken
+    conn = _make_conn()
+    ctx = RunContext()
+    try:
+        run_saw(SAW_SPEC, ctx, conn)
+        assert False, "Should have raised RuntimeError"
+    except RuntimeError:
+        pass
+    finally:
+        TOOL_REGISTRY["tool_reconcile_metrics"] = original
+
+    assert get_run_record(conn, ctx.run_id)["status"] == "incomplete"
+    node_ids = [l["node_id"] for l in get_run_logs(conn, ctx.run_id)]
+    assert node_ids == ["n_start", "n_salesforce_pull", "n_stripe_pull"], node_ids
+    assert verify_run_integrity(conn, ctx.run_id)["valid"]
+    print("  ✅ Crash: run marked incomplete, partial log kept")
+    conn.close()
+
+
+# ── Test 8: Resume after approval ────────────────────────────────
+
+def test_engine_resume_after_approval_skips_finished_nodes():
+    from engine import TOOL_REGISTRY, resume_saw
+    from logger import get_run_record, verify_run_integrity
+
+    calls = []
+    originals = dict(TOOL_REGISTRY)
+
+    def counted(name, tool_fn):
+        def wrapped(inputs, ctx):
+            calls.append(name)
+            return tool_fn(inputs, ctx)
+        return wrapped
+
+    TOOL_REGISTRY.update({name: counted(name, fn) for name, fn in originals.items()})
+    try:
+        conn = _make_conn()
+        ctx = RunContext()
+        first = run_saw(SAW_SPEC, ctx, conn)
+        assert first.status == "denied"
+        reads = list(calls)
+        assert "tool_generate_board_summary" in reads
+
+        calls.clear()
+        resumed = resume_saw(ctx.run_id, conn, state={"_approval_granted": True, "_approved_by": "bob@example.com"})
+    finally:
+        TOOL_REGISTRY.clear()
+        TOOL_REGISTRY.update(originals)
+
+    assert resumed.status == "completed", resumed.denial_reason
+    assert calls == ["tool_slides_update_template"], calls
+    assert resumed.resumed_nodes == [
+        "n_start", "n_salesforce_pull", "n_stripe_pull", "n_reconcile", "n_generate_summary",
+    ]
+    assert resumed.final_outputs.get("status") == "updated"
+
+    node_ids = [l["node_id"] for l in get_run_logs(conn, ctx.run_id)]
+    assert node_ids[-4:] == ["n_approval", "n_approval", "n_update_slides", "n_end"], node_ids
+    assert verify_run_integrity(conn, ctx.run_id)["valid"]
+    record = get_run_record(conn, ctx.run_id)
+    assert record["status"] == "completed" and record["approved_by"] == "bob@example.com"
+
+    # Identical outputs from a second run are stored once.
+    run_saw(SAW_SPEC, RunContext(), conn)
+    outputs = conn.execute("SELECT COUNT(*) FROM node_outputs").fetchone()[0]
+    checkpoints = conn.execute("SELECT COUNT(*) FROM run_checkpoints").fetchone()[0]
+    assert checkpoints == 5 + 4 and outputs == 5, (checkpoints, outputs)
+    print(f"  ✅ Resume: only {calls} re-ran after approval")
+    conn.close()
+
+
+# ── Test 9: Tool cache ───────────────────────────────────────────
+
+def test_engine_tool_cache_reuses_reads_until_ttl():
+    from engine import TOOL_REGISTRY
+    from logger import verify_run_integrity
+    from tool_cache import ToolCache
+    from tools import READ_CACHE_TTL_SECONDS
+
+    calls = []
+    originals = dict(TOOL_REGISTRY)
+
+    def counted(name, tool_fn):
+        def wrapped(inputs, ctx):
+            calls.append(name)
+            return tool_fn(inputs, ctx)
+        return wrapped
+
+    now = [1_000_000.0]
+    cache = ToolCache(clock=lambda: now[0])
+    TOOL_REGISTRY.update({name: counted(name, fn) for name, fn in originals.items()})
     try:
         conn = _make_conn()
+        approved = {"_approval_granted": True, "_approved_by": "alice@example.com"}
+        first = run_saw(SAW_SPEC, RunContext(state=dict(approved)), conn, tool_cache=cache)
+        first_calls = list(calls)
+
+        calls.clear()
+        ctx = RunContext(state=dict(approved))
+        second = run_saw(SAW_SPEC, ctx, conn, tool_cache=cache)
+        second_calls = list(calls)
+
+        # A fresh cache on the same DB still hits the SQLite tier, until reads expire.
+        calls.clear()
+        now[0] += READ_CACHE_TTL_SECONDS + 1
+        third = run_saw(SAW_SPEC, RunContext(state=dict(approved)), conn, tool_cache=ToolCache(clock=lambda: now[0]))
+        third_calls = list(calls)
+    finally:
+        TOOL_REGISTRY.clear()
+        TOOL_REGISTRY.update(originals)
+
+    assert first.status == second.status == third.status == "completed"
+    assert "tool_salesforce_read_pipeline" in first_calls
+    assert second_calls == ["tool_generate_board_summary", "tool_slides_update_template"], second_calls
+    assert second.final_outputs == first.final_outputs
+
+    hits = {l["node_id"] for l in get_run_logs(conn, ctx.run_id) if l["cache_hit"]}
+    assert hits == {"n_salesforce_pull", "n_stripe_pull", "n_reconcile"}, hits
+    assert verify_run_integrity(conn, ctx.run_id)["valid"]
+
+    assert "tool_salesforce_read_pipeline" in third_calls and "tool_stripe_read_revenue" in third_calls
+    assert "tool_reconcile_metrics" not in third_calls, third_calls
+    print(f"  ✅ Tool cache: second run invoked only {second_calls}")
+    conn.close()
+
+
+# ── Test 10: Execution policies ──────────────────────────────────
+
+def test_engine_retries_timed_out_read():
+    from engine import TOOL_REGISTRY
+    from logger import verify_run_integrity
+
+    original = TOOL_REGISTRY["tool_salesforce_read_pipeline"]
+    calls = []
+
+    def hangs_once(inputs, ctx):
+        calls.append(time.perf_counter())
+        if len(calls) == 1:
+            time.sleep(0.5)
+        return original(inputs, ctx)
+
+    spec = deepcopy(SAW_SPEC)
+    spec["execution_policy"] = {"timeout_seconds": 5}
+    for node in spec["graph"]["nodes"]:
+        if node["id"] == "n_salesforce_pull":
+            node["execution_policy"] = {"timeout_seconds": 0.1, "max_retries": 2, "backoff_base_seconds": 0.01}
+
+    TOOL_REGISTRY["tool_salesforce_read_pipeline"] = hangs_once
+    conn = _make_conn()
+    ctx = RunContext()
+    ctx.state["_approval_granted"] = True
+    try:
+        summary = run_saw(spec, ctx, conn)
+    finally:
+        TOOL_REGISTRY["tool_salesforce_read_pipeline"] = original
+
+    assert summary.status == "completed", summary.denial_reason
+    rows = [l for l in get_run_logs(conn, ctx.run_id) if l["node_id"] == "n_salesforce_pull"]
+    assert [(r["attempt"], r["decision"]) for r in rows] == [(1, "allow"), (2, "allow")], rows
+    assert rows[0]["error"].startswith("Timed out") and rows[1]["error"] is None
+
+    timing = summary.node_timings["n_salesforce_pull"]
+    assert timing["attempts"] == 2 and timing["failed_attempts_ms"] >= 100, timing
+    assert summary.failed_attempt_ms == timing["failed_attempts_ms"]
+    assert summary.wall_time_ms < 450, summary.wall_time_ms
+    assert verify_run_integrity(conn, ctx.run_id)["valid"]
+    print(f"  ✅ Execution policy: read retried after timeout ({timing})")
+    conn.close()
+
+
+def test_engine_does_not_retry_timed_out_write():
+    from engine import TOOL_REGISTRY
+
+    original = TOOL_REGISTRY["tool_slides_update_template"]
+    calls = []
+    finished = threading.Event()
+
+    def slow_write(inputs, ctx):
+        calls.append(1)
+        time.sleep(0.3)
+        finished.set()
+        return original(inputs, ctx)
+
+    spec = deepcopy(SAW_SPEC)
+    for node in spec["graph"]["nodes"]:
+        if node["id"] == "n_update_slides":
+            node["execution_policy"] = {"timeout_seconds": 0.05, "max_retries": 2, "backoff_base_seconds": 0.0}
+
+    TOOL_REGISTRY["tool_slides_update_template"] = slow_write
+    conn = _make_conn()
+    ctx = RunContext()
+    ctx.state["_approval_granted"] = True
+    try:
+        summary = run_saw(spec, ctx, conn)
+        finished.wait(2)
+    finally:
+        TOOL_REGISTRY["tool_slides_update_template"] = original
+
+    assert summary.status == "error", summary.status
+    assert "may still complete" in summary.denial_reason, summary.denial_reason
+    assert len(calls) == 1, calls
+    rows = [l for l in get_run_logs(conn, ctx.run_id) if l["node_id"] == "n_update_slides"]
+    assert [r["attempt"] for r in rows] == [1], rows
+    print("  ✅ Execution policy: timed-out write recorded as unknown, not retried")
+    conn.close()
+
+
+def test_engine_circuit_breaker_fails_fast_across_runs():
+    from engine import TOOL_REGISTRY
+    from resilience import CircuitBreakerRegistry
+
+    original = TOOL_REGISTRY["tool_stripe_read_revenue"]
+    calls = []
+
+    def down(inputs, ctx):
+        calls.append(1)
+        raise ConnectionError("stripe unavailable")
+
+    spec = deepcopy(SAW_SPEC)
+    spec["execution_policy"] = {
+        "max_retries": 1,
+        "backoff_base_seconds": 0.0,
+        "circuit_breaker": {"failure_threshold": 2, "reset_seconds": 60},
+    }
+    breakers = CircuitBreakerRegistry()
+    TOOL_REGISTRY["tool_stripe_read_revenue"] = down
+    conn = _make_conn()
+    try:
+        first = run_saw(spec, RunContext(), conn, circuit_breakers=breakers)
+        calls_after_first = len(calls)
         ctx = RunContext()
-        run_saw(branching_spec, ctx, conn)
-        assert False, "Should have raised NotImplementedError"
-    except NotImplementedError as e:
-        assert "n_reconcile" in str(e)
-        print(f"  ✅ Branching rejected: {e}")
+        second = run_saw(spec, ctx, conn, circuit_breakers=breakers)
+    finally:
+        TOOL_REGISTRY["tool_stripe_read_revenue"] = original
+
+    assert first.status == "error" and "ConnectionError" in first.denial_reason
+    assert calls_after_first == 2 and len(calls) == 2
+    assert breakers.snapshot()["tool_stripe_read_revenue"]["state"] == "open"
+
+    assert second.status == "error"
+    assert second.denial_reason == "Circuit open for tool 'tool_stripe_read_revenue'"
+    rows = [l for l in get_run_logs(conn, ctx.run_id) if l["node_id"] == "n_stripe_pull"]
+    assert [(r["decision"], r["attempt"]) for r in rows] == [("deny", 1)], rows
+    print("  ✅ Circuit breaker: second run failed fast without calling the tool")
+    conn.close()
+
+
+# ── Test 11: Compiled SAW plans ──────────────────────────────────
+
+def test_engine_runs_compiled_saw():
+    from engine import CompiledSaw, compile_saw, compute_policy_hash
+    from logger import get_run_record
+
+    spec = deepcopy(SAW_SPEC)
+    plan = compile_saw(spec)
+    assert isinstance(plan, CompiledSaw)
+    assert compile_saw(deepcopy(SAW_SPEC)) is plan
+    assert plan.order[0] == "n_start" and plan.order[-1] == "n_end"
+    assert plan.policy_hash == compute_policy_hash(SAW_SPEC["policy_bundle"])
+
+    # The plan owns its copy of the spec.
+    spec["graph"]["nodes"].append({"id": "n_orphan", "type": "end"})
+    assert "n_orphan" not in plan.node_map
+    assert compile_saw(spec) is not plan
+
+    conn = _make_conn()
+    ctx = RunContext()
+    ctx.state["_approval_granted"] = True
+    summary = run_saw(plan, ctx, conn)
+    assert summary.status == "completed"
+    record = get_run_record(conn, ctx.run_id)
+    assert record["policy_hash"] == plan.policy_hash
+    assert json.loads(record["saw_spec"]) == SAW_SPEC
+
+    broken = deepcopy(SAW_SPEC)
+    broken["graph"]["edges"].append({"from": "n_end", "to": "n_missing"})
+    try:
+        compile_saw(broken)
+        assert False, "Should have raised ValueError"
+    except ValueError:
+        pass
+    print(f"  ✅ Compiled SAW: plan {plan.spec_hash[:12]} reused across runs")
     conn.close()
 
 
@@ -232,7 +611,16 @@ if __name__ == "__main__":
     test_engine_approval_denied()
     test_engine_approval_not_set()
     test_engine_policy_deny_wrong_template()
-    test_engine_rejects_branching()
+    test_engine_parallel_branches()
+    test_engine_rejects_cycles()
+    test_engine_commits_per_gate_not_per_node()
+    test_engine_marks_run_incomplete_on_crash()
+    test_engine_resume_after_approval_skips_finished_nodes()
+    test_engine_tool_cache_reuses_reads_until_ttl()
+    test_engine_retries_timed_out_read()
+    test_engine_does_not_retry_timed_out_write()
+    test_engine_circuit_breaker_fails_fast_across_runs()
+    test_engine_runs_compiled_saw()
     print("\n✅ All engine tests PASSED")
 import unittest
 
@@ -0,0 +1,72 @@
+"""
+SurFit V1 — Integrity Sweep Tests
+
+Run:  python -m pytest test_verify_integrity.py -v
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from engine import run_saw
+from logger import init_db
+from models import RunContext
+from test_engine import SAW_SPEC
+from verify_integrity import main, verify_runs
+
+
+def _seed_runs(db_path: Path, count: int) -> list[str]:
+    conn = init_db(db_path)
+    run_ids = []
+    for i in range(count):
+        ctx = RunContext(run_id=f"sweep_run_{i:03d}")
+        ctx.state["_approval_granted"] = True
+        run_saw(SAW_SPEC, ctx, conn)
+        run_ids.append(ctx.run_id)
+    conn.close()
+    return run_ids
+
+
+def test_verify_runs_across_processes_reports_tampered_run():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "runs.db"
+        run_ids = _seed_runs(db_path, 12)
+
+        clean = verify_runs(db_path, workers=2, chunk_size=4)
+        assert clean["runs"] == 12 and clean["invalid"] == 0
+        assert clean["rows_checked"] == 12 * 8
+
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "UPDATE execution_log SET latency_ms = latency_ms + 1 WHERE run_id = ? AND node_id = 'n_reconcile'",
+            (run_ids[5],),
+        )
+        conn.commit()
+        conn.close()
+
+        report = verify_runs(db_path, workers=2, chunk_size=4)
+        assert report["invalid"] == 1
+        assert report["failures"][0]["run_id"] == run_ids[5]
+        assert report["failures"][0]["first_mismatch_index"] == 3
+
+        subset = verify_runs(db_path, run_ids=run_ids[:2], workers=1)
+        assert subset["runs"] == 2 and subset["invalid"] == 0
+        assert main(["--db", str(db_path), "--workers", "1"]) == 1
+        print(f"  ✅ Sweep: {report['runs']} runs in {report['elapsed_ms']}ms, 1 tampered run found")
+
+
+def test_verify_runs_since_filters_on_run_start():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "runs.db"
+        _seed_runs(db_path, 3)
+        assert verify_runs(db_path, since="2000-01-01", workers=1)["runs"] == 3
+        assert verify_runs(db_path, since="2999-01-01", workers=1)["runs"] == 0
+
+
+if __name__ == "__main__":
+    print("Integrity sweep tests:")
+    test_verify_runs_across_processes_reports_tampered_run()
+    test_verify_runs_since_filters_on_run_start()
+    print("\n✅ All integrity sweep tests PASSED")
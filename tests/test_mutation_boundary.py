@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import sqlite3
 import sys
@@ -12,6 +13,7 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from surfit.runtime.blocking_executor import BlockingExecutorConfig, BlockingWorkExecutors
 from surfit.runtime.mutation_boundary import MutationBoundaryConfig, MutationBoundaryService
 
 
@@ -46,7 +48,7 @@ def _sha256(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def _build_service(*, replay_max_uses: int = 1000) -> MutationBoundaryService:
+def _build_service(*, replay_max_uses: int = 1000, token_format: str = "swt2") -> MutationBoundaryService:
     return MutationBoundaryService(
         MutationBoundaryConfig(
             token_secret="boundary-test-secret",
@@ -59,6 +61,7 @@ def _build_service(*, replay_max_uses: int = 1000) -> MutationBoundaryService:
             market_intel_templates={"market_intelligence_digest_v1"},
             prod_config_target="demo_artifacts/prod_config.json",
             prod_config_allowed_keys={"logging.level"},
+            mutation_token_format=token_format,
         ),
         resolve_connector_type=lambda template_id: "github"
         if template_id == "ENTERPRISE_GITHUB_GOVERNANCE_V1"
@@ -247,6 +250,185 @@ class MutationBoundaryTests(unittest.TestCase):
             server.server_close()
             conn.close()
 
+    def test_verified_token_claims_are_cached_until_exp(self):
+        service = _build_service()
+        token, _, _, _ = service.mint_wave_mutation_token(
+            wave_id="wave-cache",
+            agent_id="agent",
+            policy_manifest_hash="hash",
+            policy_version="policy",
+            wave_template_id="market_intelligence_digest_v1",
+            scope={"http_proxy": {"allowed_domains": ["127.0.0.1"]}},
+        )
+        first, err1 = service.decode_wave_mutation_token(token)
+        second, err2 = service.decode_wave_mutation_token(token)
+        self.assertIsNone(err1)
+        self.assertIsNone(err2)
+        self.assertIs(first, second)
+        stats = service.token_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (1, 1, 1))
+
+        tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+        payload, err = service.decode_wave_mutation_token(tampered)
+        self.assertIsNone(payload)
+        self.assertEqual(err, "TOKEN_INVALID_SIGNATURE")
+        self.assertEqual(service.token_cache_stats()["size"], 1)
+
+    def test_expired_token_claims_are_not_cached(self):
+        service = _build_service()
+        token, _, _, _ = service.mint_wave_mutation_token(
+            wave_id="wave-expired",
+            agent_id="agent",
+            policy_manifest_hash="hash",
+            policy_version="policy",
+            wave_template_id="market_intelligence_digest_v1",
+            scope={},
+            ttl_seconds=-1,
+        )
+        payload, err = service.decode_wave_mutation_token(token)
+        self.assertIsNone(err)
+        self.assertEqual(payload["wave_id"], "wave-expired")
+        self.assertEqual(service.token_cache_stats()["size"], 0)
+
+    def test_swt2_token_references_scope_by_hash(self):
+        service = _build_service()
+        scope = {
+            "allowlisted_paths": [f"/repo/docs/{idx}/" for idx in range(50)],
+            "http_proxy": {"allowed_domains": ["127.0.0.1"], "allowed_methods": ["GET"]},
+        }
+        token, _, _, payload_json = service.mint_wave_mutation_token(
+            wave_id="wave-compact",
+            agent_id="agent",
+            policy_manifest_hash=_sha256("manifest"),
+            policy_version="policy",
+            wave_template_id="market_intelligence_digest_v1",
+            scope=scope,
+        )
+        self.assertTrue(token.startswith("swt2."))
+        self.assertLess(len(token), len(_canonical(scope)))
+        claims, err = service.decode_wave_mutation_token(token)
+        self.assertIsNone(err)
+        self.assertEqual(claims["scope_hash"], _sha256(_canonical(scope)))
+        self.assertEqual(claims["policy_manifest_hash"], _sha256("manifest"))
+        self.assertNotIn("scope", json.loads(payload_json))
+
+    def test_swt1_tokens_still_verify(self):
+        legacy = _build_service(token_format="swt1")
+        token, _, _, _ = legacy.mint_wave_mutation_token(
+            wave_id="wave-legacy",
+            agent_id="agent",
+            policy_manifest_hash="hash",
+            policy_version="policy",
+            wave_template_id="market_intelligence_digest_v1",
+            scope={"allowlisted_tools": ["ocean.proxy.http"]},
+        )
+        self.assertTrue(token.startswith("swt1."))
+        claims, err = _build_service().decode_wave_mutation_token(token)
+        self.assertIsNone(err)
+        self.assertEqual(claims["scope"], {"allowlisted_tools": ["ocean.proxy.http"]})
+
+    def test_swt2_scope_resolved_from_store_in_other_worker(self):
+        minting = _build_service()
+        verifying = _build_service()
+        conn = _make_conn()
+        conn.execute("CREATE TABLE mutation_scopes (scope_hash TEXT PRIMARY KEY, scope_json TEXT, created_at TEXT)")
+        server, port = _start_local_server()
+        try:
+            target_url = f"http://127.0.0.1:{port}/repo/review_commit"
+            manifest_json = _canonical({"http_proxy_allowlist": {"allowed_domains": ["127.0.0.1"], "allowed_methods": ["GET"]}})
+            manifest_hash = _sha256(manifest_json)
+            conn.execute(
+                "INSERT INTO waves (wave_id, policy_manifest_hash, policy_manifest_json, tenant_id) VALUES (?, ?, ?, ?)",
+                ("wave-swt2", manifest_hash, manifest_json, "tenant_a"),
+            )
+            scope = {"http_proxy": {"allowed_domains": ["127.0.0.1"], "allowed_methods": ["GET"]}}
+            token, _, _, _ = minting.mint_wave_mutation_token(
+                wave_id="wave-swt2",
+                agent_id="agent",
+                policy_manifest_hash=manifest_hash,
+                policy_version="policy",
+                wave_template_id="market_intelligence_digest_v1",
+                scope=scope,
+            )
+            request = {"method": "GET", "url": target_url, "wave_mutation_token": token}
+
+            status, payload = verifying.proxy_http(conn, request, log_decision=_log_decision, api_tenant_id="tenant_a")
+            self.assertEqual(status, 403)
+            self.assertEqual(payload["message"], "Mutation token scope reference not found.")
+
+            scope_json = _canonical(scope)
+            conn.execute(
+                "INSERT INTO mutation_scopes (scope_hash, scope_json, created_at) VALUES (?, ?, ?)",
+                (_sha256(scope_json), scope_json, "now"),
+            )
+            status, payload = verifying.proxy_http(conn, request, log_decision=_log_decision, api_tenant_id="tenant_a")
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["status"], "ALLOWED")
+        finally:
+            server.shutdown()
+            server.server_close()
+            conn.close()
+
+    def test_async_proxy_splits_db_and_network_work(self):
+        service = _build_service()
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        executors = BlockingWorkExecutors(BlockingExecutorConfig(db_workers=1, io_workers=2, wave_workers=1))
+        server, port = _start_local_server()
+        try:
+            conn.executescript(
+                """
+                CREATE TABLE waves (wave_id TEXT PRIMARY KEY, policy_manifest_hash TEXT, policy_manifest_json TEXT, tenant_id TEXT);
+                CREATE TABLE decisions (id INTEGER PRIMARY KEY AUTOINCREMENT, wave_id TEXT, decision TEXT, reason TEXT, rule TEXT, node TEXT);
+                """
+            )
+            manifest_json = _canonical({"http_proxy_allowlist": {"allowed_domains": ["127.0.0.1"], "allowed_methods": ["GET"]}})
+            manifest_hash = _sha256(manifest_json)
+            conn.execute(
+                "INSERT INTO waves (wave_id, policy_manifest_hash, policy_manifest_json, tenant_id) VALUES (?, ?, ?, ?)",
+                ("wave-async", manifest_hash, manifest_json, "tenant_a"),
+            )
+            token, _, _, _ = service.mint_wave_mutation_token(
+                wave_id="wave-async",
+                agent_id="agent",
+                policy_manifest_hash=manifest_hash,
+                policy_version="policy",
+                wave_template_id="market_intelligence_digest_v1",
+                scope={"http_proxy": {"allowed_domains": ["127.0.0.1"], "allowed_methods": ["GET"]}},
+            )
+            phases: list[str] = []
+
+            async def run_db(fn, *args, **kwargs):
+                phases.append(f"db:{fn.__name__}")
+                return await executors.run_db(fn, *args, **kwargs)
+
+            async def run_io(fn, *args, **kwargs):
+                phases.append(f"io:{fn.__name__}")
+                return await executors.run_io(fn, *args, **kwargs)
+
+            status, payload = asyncio.run(
+                service.proxy_http_async(
+                    conn,
+                    {"method": "GET", "url": f"http://127.0.0.1:{port}/ok", "wave_mutation_token": token},
+                    log_decision=_log_decision,
+                    run_db=run_db,
+                    run_io=run_io,
+                    api_tenant_id="tenant_a",
+                )
+            )
+            self.assertEqual(status, 200)
+            self.assertEqual(payload["body"], '{"ok":true}')
+            self.assertEqual(
+                phases,
+                ["db:_authorize_proxy_request", "io:_fetch_proxy_target", "db:_record_proxy_outcome"],
+            )
+            decisions = conn.execute("SELECT decision FROM decisions WHERE wave_id = ?", ("wave-async",)).fetchall()
+            self.assertEqual(decisions, [("ALLOW",)])
+        finally:
+            executors.shutdown()
+            server.shutdown()
+            server.server_close()
+            conn.close()
+
 
 if __name__ == "__main__":
     unittest.main()
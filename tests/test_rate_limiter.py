@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from surfit.runtime.rate_limiter import InMemoryRateLimiter, RateLimitOverrides, RedisRateLimiter
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FailingRedis:
+    def register_script(self, script):
+        def _run(keys, args):
+            raise ConnectionError("redis down")
+
+        return _run
+
+
+class _GcraRedis:
+    """Runs the GCRA script's arithmetic in Python (no Lua here) against a fixed TIME."""
+
+    def __init__(self, now_us: int = 1_760_000_000_123_456):
+        self.now_us = now_us
+        self.store: dict[str, str] = {}
+
+    def register_script(self, script):
+        def _run(keys, args):
+            interval, window = int(args[0]), int(args[1])
+            now = self.now_us
+            tat = max(int(self.store.get(keys[0], now)), now)
+            if tat - now + interval > window:
+                return 0
+            self.store[keys[0]] = "%d" % (tat + interval)
+            return 1
+
+        return _run
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_allows_burst_up_to_limit_then_denies(self):
+        clock = _Clock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        results = [limiter.check("tenant_a", "proxy_request", 5) for _ in range(6)]
+        self.assertEqual(results, [True, True, True, True, True, False])
+
+    def test_burst_admits_exactly_limit(self):
+        for limit in (7, 45, 300, 999, 5000):
+            clock = _Clock(now=123456.789)
+            limiter = InMemoryRateLimiter(clock=clock)
+            admitted = sum(limiter.check("tenant_a", "proxy_request", limit) for _ in range(limit + 5))
+            self.assertEqual(admitted, limit, limit)
+
+            redis_limiter = RedisRateLimiter(_GcraRedis())
+            admitted = sum(redis_limiter.check("tenant_a", "proxy_request", limit) for _ in range(limit + 5))
+            self.assertEqual(admitted, limit, limit)
+
+    def test_capacity_refills_at_emission_interval(self):
+        clock = _Clock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        for _ in range(3):
+            self.assertTrue(limiter.check("tenant_a", "wave_create", 3))
+        self.assertFalse(limiter.check("tenant_a", "wave_create", 3))
+        clock.now += 20.0
+        self.assertTrue(limiter.check("tenant_a", "wave_create", 3))
+        self.assertFalse(limiter.check("tenant_a", "wave_create", 3))
+
+    def test_tenants_and_buckets_are_isolated(self):
+        limiter = InMemoryRateLimiter(clock=_Clock(), stripes=4)
+        self.assertTrue(limiter.check("tenant_a", "export_bundle", 1))
+        self.assertFalse(limiter.check("tenant_a", "export_bundle", 1))
+        self.assertTrue(limiter.check("tenant_b", "export_bundle", 1))
+        self.assertTrue(limiter.check("tenant_a", "wave_create", 1))
+
+    def test_non_positive_limit_disables_check(self):
+        limiter = InMemoryRateLimiter(clock=_Clock())
+        self.assertTrue(all(limiter.check("tenant_a", "proxy_request", 0) for _ in range(50)))
+
+    def test_stale_keys_are_pruned(self):
+        clock = _Clock()
+        limiter = InMemoryRateLimiter(clock=clock, stripes=1, prune_threshold=2)
+        for idx in range(3):
+            limiter.check(f"tenant_{idx}", "proxy_request", 60)
+        clock.now += 120.0
+        limiter.check("tenant_new", "proxy_request", 60)
+        self.assertEqual(set(limiter._tats[0]), {"tenant_new:proxy_request"})
+
+    def test_overrides_loaded_from_config(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rate_limits.json"
+            path.write_text(
+                json.dumps({"tenants": {"tenant_big": {"proxy_request": 4}, "tenant_free": {"proxy_request": 0}}}),
+                encoding="utf-8",
+            )
+            limiter = InMemoryRateLimiter(clock=_Clock(), overrides=RateLimitOverrides(path))
+            self.assertEqual(sum(limiter.check("tenant_big", "proxy_request", 1) for _ in range(10)), 4)
+            self.assertEqual(sum(limiter.check("tenant_free", "proxy_request", 1) for _ in range(10)), 10)
+            self.assertEqual(sum(limiter.check("tenant_other", "proxy_request", 1) for _ in range(10)), 1)
+
+    def test_missing_override_file_uses_defaults(self):
+        overrides = RateLimitOverrides(Path("/nonexistent/rate_limits.json"))
+        self.assertEqual(overrides.limit_for("tenant_a", "wave_create", 30), 30)
+
+    def test_redis_errors_fall_back_to_local_limiter(self):
+        fallback = InMemoryRateLimiter(clock=_Clock())
+        limiter = RedisRateLimiter(_FailingRedis(), fallback=fallback)
+        self.assertTrue(limiter.check("tenant_a", "proxy_request", 1))
+        self.assertFalse(limiter.check("tenant_a", "proxy_request", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SURFIT_V2 = REPO_ROOT / "surfit-v2"
+if str(SURFIT_V2) not in sys.path:
+    sys.path.insert(0, str(SURFIT_V2))
+
+from action_store import ActionStore
+
+
+def _record(idx: int) -> dict:
+    return {"id": f"slack-{idx:04d}", "timestamp": f"2026-03-13T00:00:{idx % 60:02d}+00:00", "status": "completed", "proof": {}}
+
+
+class ActionStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / "actions.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_actions_page_newest_first_from_cache_and_disk(self):
+        store = ActionStore(self.db_path, hot_size=5)
+        store.add_actions([_record(i) for i in range(3)])
+        for i in range(3, 12):
+            store.add_action(_record(i))
+
+        self.assertEqual(store.count_actions(), 12)
+        self.assertEqual([r["id"] for r in store.list_actions(limit=3)], ["slack-0011", "slack-0010", "slack-0009"])
+        self.assertEqual([r["id"] for r in store.list_actions(limit=3, offset=4)], ["slack-0007", "slack-0006", "slack-0005"])
+        self.assertEqual([r["id"] for r in store.list_actions(limit=2, offset=10)], ["slack-0001", "slack-0000"])
+
+        record = store.get_action("slack-0001")
+        record["status"] = "approved"
+        store.save_action(record)
+        store.close()
+
+        reopened = ActionStore(self.db_path, hot_size=5)
+        self.assertEqual(reopened.get_action("slack-0001")["status"], "approved")
+        self.assertEqual([r["id"] for r in reopened.iter_actions(batch_size=4)][:2], ["slack-0000", "slack-0001"])
+        self.assertEqual(reopened.list_actions(limit=1)[0]["id"], "slack-0011")
+        reopened.close()
+
+    def test_pending_can_only_be_claimed_once(self):
+        store = ActionStore(self.db_path)
+        store.add_pending({"id": "slack-a", "status": "pending", "channel_id": "C1", "content_text": "hi"})
+        store.add_pending({"id": "slack-b", "status": "pending", "channel_id": "C1", "content_text": "yo"})
+        self.assertEqual(store.count_pending(), 2)
+
+        claimed = store.claim_pending("slack-a", "approving")
+        self.assertEqual(claimed["status"], "approving")
+        self.assertIsNone(store.claim_pending("slack-a", "rejected"))
+        self.assertIsNone(store.claim_pending("missing", "rejected"))
+
+        claimed["status"] = "approved_executed"
+        store.save_pending(claimed)
+        self.assertEqual([r["id"] for r in store.list_pending()], ["slack-b"])
+        self.assertEqual(store.list_pending(status="approved_executed")[0]["id"], "slack-a")
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SURFIT_V2 = REPO_ROOT / "surfit-v2"
+if str(SURFIT_V2) not in sys.path:
+    sys.path.insert(0, str(SURFIT_V2))
+
+from event_ingest import EventIngestPipeline, TTLSet, slack_event_key
+
+
+class EventIngestPipelineTests(unittest.TestCase):
+    def test_duplicate_event_ids_are_processed_once_in_batches(self):
+        batches = []
+        pipeline = EventIngestPipeline(batches.append, max_batch=4, max_delay_seconds=0.2)
+        outcomes = [pipeline.submit(f"Ev{i % 6}", i) for i in range(10)]
+        pipeline.start()
+        try:
+            self.assertTrue(pipeline.join(timeout=5))
+        finally:
+            pipeline.stop(timeout=5)
+
+        self.assertEqual(outcomes.count("queued"), 6)
+        self.assertEqual(outcomes.count("duplicate"), 4)
+        self.assertEqual([item for batch in batches for item in batch], [0, 1, 2, 3, 4, 5])
+        self.assertEqual([len(batch) for batch in batches], [4, 2])
+        self.assertEqual(pipeline.stats()["processed"], 6)
+
+    def test_full_queue_does_not_remember_the_key(self):
+        release = threading.Event()
+        pipeline = EventIngestPipeline(lambda batch: release.wait(5), max_batch=1, max_queue=1, max_delay_seconds=0)
+
+        self.assertEqual(pipeline.submit("Ev1", 1), "queued")
+        self.assertEqual(pipeline.submit("Ev2", 2), "full")
+        pipeline.start()
+        try:
+            release.set()
+            self.assertTrue(pipeline.join(timeout=5))
+            self.assertEqual(pipeline.submit("Ev2", 2), "queued")
+            self.assertTrue(pipeline.join(timeout=5))
+        finally:
+            pipeline.stop(timeout=5)
+
+    def test_failed_batch_is_retried_then_forgotten(self):
+        calls = []
+
+        def flaky(batch):
+            calls.append(list(batch))
+            if batch[0] != "ok":
+                raise RuntimeError("db locked")
+
+        pipeline = EventIngestPipeline(flaky, max_batch=1, max_delay_seconds=0, max_batch_retries=1,
+                                       retry_delay_seconds=0)
+        with self.assertLogs("event_ingest", level="WARNING"):
+            pipeline.start()
+            try:
+                self.assertEqual(pipeline.submit("Ev1", "bad"), "queued")
+                self.assertEqual(pipeline.submit("Ev2", "ok"), "queued")
+                self.assertTrue(pipeline.join(timeout=5))
+            finally:
+                pipeline.stop(timeout=5)
+
+        self.assertEqual(calls, [["bad"], ["bad"], ["ok"]])
+        stats = pipeline.stats()
+        self.assertEqual((stats["processed"], stats["retried"], stats["dropped"]), (1, 1, 1))
+        # The dropped event's key is forgotten, so a resubmission is accepted.
+        self.assertEqual(pipeline.submit("Ev1", "bad"), "queued")
+        self.assertEqual(pipeline.submit("Ev2", "ok"), "duplicate")
+
+    def test_one_bad_event_does_not_drop_its_batch(self):
+        processed = []
+
+        def strict(batch):
+            if "bad" in batch:
+                raise ValueError("unparseable event")
+            processed.extend(batch)
+
+        pipeline = EventIngestPipeline(strict, max_batch=4, max_delay_seconds=0.2, max_batch_retries=1,
+                                       retry_delay_seconds=0)
+        for i, item in enumerate(["a", "b", "bad", "c"]):
+            pipeline.submit(f"Ev{i}", item)
+        with self.assertLogs("event_ingest", level="ERROR") as logs:
+            pipeline.start()
+            try:
+                self.assertTrue(pipeline.join(timeout=5))
+            finally:
+                pipeline.stop(timeout=5)
+
+        self.assertEqual(sorted(processed), ["a", "b", "c"])
+        stats = pipeline.stats()
+        self.assertEqual((stats["processed"], stats["dropped"]), (3, 1))
+        self.assertTrue(any("Ev2" in line for line in logs.output))
+        self.assertEqual(pipeline.submit("Ev2", "bad"), "queued")
+        self.assertEqual(pipeline.submit("Ev0", "a"), "duplicate")
+
+    def test_keys_expire_after_ttl(self):
+        now = [0.0]
+        seen = TTLSet(ttl_seconds=10, clock=lambda: now[0])
+        seen.add("Ev1")
+        now[0] = 9.0
+        self.assertIn("Ev1", seen)
+        now[0] = 10.5
+        self.assertNotIn("Ev1", seen)
+
+    def test_event_key_prefers_event_id(self):
+        self.assertEqual(slack_event_key({"event_id": "Ev9", "event": {"ts": "1.2"}}), "Ev9")
+        self.assertEqual(slack_event_key({"team_id": "T1", "event": {"channel": "C1", "ts": "1.2"}}), "T1:C1:1.2")
+        self.assertIsNone(slack_event_key({"event": {}}))
+
+
+if __name__ == "__main__":
+    unittest.main()
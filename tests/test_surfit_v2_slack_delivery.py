@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SURFIT_V2 = REPO_ROOT / "surfit-v2"
+if str(SURFIT_V2) not in sys.path:
+    sys.path.insert(0, str(SURFIT_V2))
+
+from fake_slack import FakeSlack
+from slack_delivery import SlackDeliveryQueue, SlackWebClient
+
+
+class SlackDeliveryQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeSlack().start()
+        self.updates = []
+        self.queue = SlackDeliveryQueue(
+            SlackWebClient("xoxb-test", api_base=self.fake.api_base, timeout=5),
+            workers=2,
+            max_attempts=3,
+            backoff_base_seconds=0.01,
+            min_interval_seconds=0.0,
+            on_update=self.updates.append,
+        )
+        self.queue.start()
+
+    def tearDown(self):
+        self.queue.stop(timeout=5)
+        self.fake.stop()
+
+    def test_delivers_once_per_action_id(self):
+        first = self.queue.enqueue("slack-1", "C1", "hello", workspace="T1")
+        again = self.queue.enqueue("slack-1", "C1", "hello", workspace="T1")
+
+        self.assertIs(first, again)
+        self.assertTrue(first.wait(5))
+        self.assertEqual(first.status, "delivered")
+        self.assertTrue(first.result.get("ts"))
+        self.assertEqual(len(self.fake.posts), 1)
+        self.assertEqual([t.action_id for t in self.updates], ["slack-1"])
+
+    def test_oldest_finished_tickets_are_forgotten_past_max_tracked(self):
+        self.queue.max_tracked = 2
+        for i in range(3):
+            self.assertTrue(self.queue.enqueue(f"slack-t{i}", "C1", "hello", workspace="T1").wait(5))
+
+        self.assertIsNone(self.queue.get("slack-t0"))
+        self.assertEqual(self.queue.get("slack-t2").status, "delivered")
+        self.assertIsNotNone(self.queue.get("slack-t1"))
+
+    def test_rate_limit_holds_workspace_until_retry_after(self):
+        self.fake.script(429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "1"})
+        ticket = self.queue.enqueue("slack-2", "C1", "hello", workspace="T1")
+
+        self.assertTrue(ticket.wait(5))
+        self.assertEqual(ticket.status, "delivered")
+        self.assertEqual(ticket.attempts, 2)
+        self.assertGreaterEqual(self.fake.posts[1]["at"] - self.fake.posts[0]["at"], 0.9)
+
+    def test_permanent_error_fails_without_retry(self):
+        self.fake.script(200, {"ok": False, "error": "channel_not_found"})
+        ticket = self.queue.enqueue("slack-3", "C404", "hello")
+
+        self.assertTrue(ticket.wait(5))
+        self.assertEqual(ticket.status, "failed")
+        self.assertEqual(ticket.attempts, 1)
+        self.assertEqual(ticket.to_dict()["error"], "channel_not_found")
+
+    def test_transient_errors_retry_up_to_max_attempts(self):
+        for _ in range(3):
+            self.fake.script(500, {"ok": False, "error": "internal_error"})
+        ticket = self.queue.enqueue("slack-4", "C1", "hello")
+
+        self.assertTrue(ticket.wait(5))
+        self.assertEqual(ticket.status, "failed")
+        self.assertEqual(ticket.attempts, 3)
+        self.assertEqual(len(self.fake.posts), 3)
+
+
+    def test_unreadable_success_body_is_retried(self):
+        self.fake.script(200, b"\xff<html>gateway</html>")
+        ticket = self.queue.enqueue("slack-5", "C1", "hello")
+
+        self.assertTrue(ticket.wait(5))
+        self.assertEqual(ticket.status, "delivered")
+        self.assertEqual(ticket.attempts, 2)
+
+    def test_throttled_workspace_does_not_block_others(self):
+        self.fake.script(429, {"ok": False, "error": "ratelimited"}, {"Retry-After": "2"})
+        held = self.queue.enqueue("slack-6", "C1", "hello", workspace="T1")
+        # Wait until the 429 has been handled and the ticket requeued behind Retry-After.
+        self.assertTrue(self._wait_until(lambda: held.attempts == 1 and self.queue.pending_count() == 1))
+        queued_behind = self.queue.enqueue("slack-7", "C1", "hello", workspace="T1")
+        others = [self.queue.enqueue(f"slack-other-{i}", "C2", "hi", workspace="T2") for i in range(5)]
+
+        self.assertTrue(all(t.wait(1) for t in others))
+        self.assertFalse(held.wait(0) or queued_behind.wait(0))
+        self.assertEqual(self.queue.pending_count(), 2)
+        self.assertTrue(held.wait(5) and queued_behind.wait(5))
+        self.assertEqual(self.queue.pending_count(), 0)
+
+    def _wait_until(self, condition, timeout=5.0):
+        deadline = time.time() + timeout
+        while not condition():
+            if time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from surfit.demos.handlers._common import DemoHandlerRequest
+from surfit.runtime.wave_application_service import (
+    WaveApplicationService,
+    WaveExecutionJob,
+    WaveRunApplicationDeps,
+    WaveRunApplicationRequest,
+)
+from surfit.runtime.wave_job_queue import WaveJobQueue, WaveWorkerPool
+
+
+class _OrchestratorStub:
+    def __init__(self, prep_result):
+        self.prep_result = prep_result
+
+    def prepare_wave_run(self, request, deps):
+        return self.prep_result, None
+
+
+def _queue() -> WaveJobQueue:
+    return WaveJobQueue(now_iso=lambda: "2026-03-13T00:00:00+00:00")
+
+
+def _deps(prep_result, status_updates: list[str]) -> WaveRunApplicationDeps:
+    return WaveRunApplicationDeps(
+        orchestrator=_OrchestratorStub(prep_result),
+        build_prep_deps=lambda _conn: SimpleNamespace(),
+        build_handler_deps=lambda _conn: SimpleNamespace(),
+        dispatch_template_handler=lambda _req, _deps: {"ok": True},
+        write_manifest=lambda *_args: ("m", "h"),
+        update_wave_status=lambda _conn, _wave_id, status, _ec, _em, _en: status_updates.append(status),
+        log_decision=lambda *_args, **_kwargs: None,
+        sha256_file=lambda _path: "output-sha",
+        record_prep_deny=lambda *_args, **_kwargs: {"status": "failed"},
+        load_policy_snapshot=lambda: {},
+        monotonic=lambda: 1.0,
+        wave_execution_error_type=RuntimeError,
+    )
+
+
+def _prep_result() -> SimpleNamespace:
+    return SimpleNamespace(
+        policy_manifest_hash="abcdef1234567890",
+        prepared_context=SimpleNamespace(output_path="./outputs/report.md"),
+        wave_mutation_token="tok-1",
+        wave_mutation_token_expires_at="2099-01-01T00:00:00+00:00",
+        handler_request=DemoHandlerRequest(
+            wave_id="wave-q",
+            wave_template_id="sales_report_v1",
+            wave_token="wt",
+            wave_mutation_token="tok-1",
+            workspace_dir="/tmp/wave-q",
+            output_path="./outputs/report.md",
+            approved_by="agent",
+        ),
+    )
+
+
+class WaveJobQueueTests(unittest.TestCase):
+    def test_enqueue_returns_queued_and_job_round_trips(self):
+        service = WaveApplicationService()
+        queue = _queue()
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        status_updates: list[str] = []
+        request = WaveRunApplicationRequest(
+            req=SimpleNamespace(agent_id="agent", wave_template_id="sales_report_v1", policy_version="p1", intent="i", context_refs={}),
+            tenant_id="tenant_a",
+            wave_id="wave-q",
+            conn=conn,
+            workspace_dir="/tmp/wave-q",
+            market_intel_templates=set(),
+            prod_config_target="demo_artifacts/prod_config.json",
+            max_runtime_seconds=30,
+        )
+        result = service.enqueue_wave(
+            request,
+            _deps(_prep_result(), status_updates),
+            enqueue=lambda _conn, job: queue.enqueue(
+                _conn, wave_id=job.wave_id, tenant_id=job.tenant_id, payload=job.to_payload()
+            ),
+        )
+        self.assertEqual(result.payload["status"], "queued")
+        self.assertEqual(status_updates, ["queued"])
+        self.assertEqual(queue.counts(conn), {"queued": 1})
+
+        wave_id, payload = queue.claim_next(conn, "worker-0")
+        self.assertEqual(wave_id, "wave-q")
+        self.assertIsNone(queue.claim_next(conn, "worker-1"))
+        job = WaveExecutionJob.from_payload(payload, req_factory=lambda raw: SimpleNamespace(**raw))
+        self.assertEqual(job.handler_request.wave_token, "wt")
+        self.assertEqual(job.req.policy_version, "p1")
+
+        executed = service.execute_job(job, conn, 30, _deps(_prep_result(), status_updates))
+        self.assertNotEqual(executed.payload["status"], "failed")
+        self.assertEqual(status_updates, ["queued", "running", "complete"])
+        self.assertTrue(queue.mark_finished(conn, wave_id, worker_id="worker-0", status="complete"))
+        row = conn.execute("SELECT status, payload_json, attempts FROM wave_jobs WHERE wave_id = ?", (wave_id,)).fetchone()
+        self.assertEqual(row, ("complete", None, 1))
+        conn.close()
+
+    def test_worker_pool_drains_queue_with_per_worker_connections(self):
+        queue = _queue()
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "jobs.db")
+
+            def connect() -> sqlite3.Connection:
+                conn = sqlite3.connect(db_path, timeout=20)
+                conn.execute("PRAGMA journal_mode = WAL")
+                return conn
+
+            setup = connect()
+            queue.ensure_schema(setup)
+            for idx in range(12):
+                queue.enqueue(setup, wave_id=f"wave-{idx}", tenant_id="tenant_a", payload={"n": idx})
+            setup.commit()
+
+            seen: list[str] = []
+            lock = threading.Lock()
+            done = threading.Event()
+
+            def execute(_conn, wave_id, payload):
+                with lock:
+                    seen.append(wave_id)
+                    if len(seen) == 12:
+                        done.set()
+                return "failed" if payload["n"] == 3 else "complete"
+
+            pool = WaveWorkerPool(queue=queue, connect=connect, execute=execute, workers=3, poll_interval_seconds=0.05)
+            pool.start()
+            try:
+                self.assertTrue(done.wait(10))
+            finally:
+                pool.stop(timeout=5)
+            self.assertEqual(sorted(seen), sorted(f"wave-{idx}" for idx in range(12)))
+            self.assertEqual(queue.counts(setup), {"complete": 11, "failed": 1})
+            setup.close()
+
+    def test_stale_running_jobs_are_requeued(self):
+        queue = _queue()
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        queue.enqueue(conn, wave_id="wave-stale", tenant_id="tenant_a", payload={})
+        queue.claim_next(conn, "worker-dead")
+        self.assertEqual(queue.requeue_stale(conn, started_before_iso="2026-03-14T00:00:00+00:00"), 1)
+        self.assertEqual(queue.counts(conn), {"queued": 1})
+        conn.close()
+
+    def test_heartbeat_keeps_a_slow_job_from_being_reaped(self):
+        now = ["2026-03-13T00:00:00+00:00"]
+        queue = WaveJobQueue(now_iso=lambda: now[0])
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        queue.enqueue(conn, wave_id="wave-slow", tenant_id="tenant_a", payload={})
+        queue.enqueue(conn, wave_id="wave-lost", tenant_id="tenant_a", payload={})
+        queue.claim_next(conn, "worker-a")
+        queue.claim_next(conn, "worker-b")
+        now[0] = "2026-03-13T00:10:00+00:00"
+        self.assertTrue(queue.heartbeat(conn, "wave-slow", "worker-a"))
+
+        self.assertEqual(queue.requeue_stale(conn, started_before_iso="2026-03-13T00:05:00+00:00"), 1)
+        rows = dict(conn.execute("SELECT wave_id, status FROM wave_jobs").fetchall())
+        self.assertEqual(rows, {"wave-slow": "running", "wave-lost": "queued"})
+        conn.close()
+
+    def test_reaped_worker_cannot_finish_the_new_attempt(self):
+        queue = _queue()
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        queue.enqueue(conn, wave_id="wave-twice", tenant_id="tenant_a", payload={})
+        queue.claim_next(conn, "worker-old")
+        queue.requeue_stale(conn, started_before_iso="2026-03-14T00:00:00+00:00")
+        queue.claim_next(conn, "worker-new")
+
+        self.assertFalse(queue.heartbeat(conn, "wave-twice", "worker-old"))
+        self.assertFalse(queue.mark_finished(conn, "wave-twice", worker_id="worker-old", status="failed", error="late"))
+        row = conn.execute("SELECT status, worker_id, error FROM wave_jobs").fetchone()
+        self.assertEqual(row, ("running", "worker-new", None))
+        self.assertTrue(queue.mark_finished(conn, "wave-twice", worker_id="worker-new", status="complete"))
+        self.assertEqual(queue.counts(conn), {"complete": 1})
+        conn.close()
+
+    def test_worker_refreshes_heartbeat_while_executing(self):
+        queue = WaveJobQueue(now_iso=lambda: datetime.now(timezone.utc).isoformat())
+        with tempfile.TemporaryDirectory() as td:
+            db_path = str(Path(td) / "jobs.db")
+
+            def connect() -> sqlite3.Connection:
+                return sqlite3.connect(db_path, timeout=20)
+
+            conn = connect()
+            queue.ensure_schema(conn)
+            queue.enqueue(conn, wave_id="wave-beat", tenant_id="tenant_a", payload={})
+            conn.commit()
+            beats: list[str] = []
+
+            def execute(_conn, wave_id, _payload):
+                reader = connect()
+                try:
+                    for _ in range(50):
+                        row = reader.execute(
+                            "SELECT started_at, heartbeat_at FROM wave_jobs WHERE wave_id = ?", (wave_id,)
+                        ).fetchone()
+                        if row[1] > row[0]:
+                            beats.append(row[1])
+                            break
+                        threading.Event().wait(0.02)
+                finally:
+                    reader.close()
+                return "complete"
+
+            pool = WaveWorkerPool(queue=queue, connect=connect, execute=execute, heartbeat_interval_seconds=0.05)
+            self.assertTrue(pool.drain_once(conn, "worker-0"))
+            self.assertEqual(len(beats), 1)
+            self.assertEqual(queue.counts(conn), {"complete": 1})
+            conn.close()
+
+    def test_worker_failure_reports_the_wave_as_failed(self):
+        queue = _queue()
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        queue.enqueue(conn, wave_id="wave-boom", tenant_id="tenant_a", payload={})
+        failures: list[tuple[str, str, str]] = []
+
+        def execute(_conn, _wave_id, _payload):
+            raise ValueError("bad payload")
+
+        pool = WaveWorkerPool(
+            queue=queue,
+            connect=lambda: conn,
+            execute=execute,
+            on_failed=lambda _conn, wave_id, code, message: failures.append((wave_id, code, message)),
+        )
+        with self.assertLogs("surfit.runtime.wave_job_queue", level="ERROR"):
+            self.assertTrue(pool.drain_once(conn, "worker-0"))
+        self.assertEqual(failures, [("wave-boom", "WAVE_EXECUTION_ERROR", "bad payload")])
+        self.assertEqual(queue.counts(conn), {"failed": 1})
+        conn.close()
+
+    def test_reaper_fails_jobs_whose_token_expired(self):
+        queue = _queue()
+        conn = sqlite3.connect(":memory:")
+        queue.ensure_schema(conn)
+        queue.enqueue(conn, wave_id="wave-fresh", tenant_id="tenant_a",
+                      payload={"wave_mutation_token_expires_at": "2026-03-14T01:00:00+00:00"})
+        queue.enqueue(conn, wave_id="wave-expiring", tenant_id="tenant_a",
+                      payload={"wave_mutation_token_expires_at": "2026-03-14T00:00:30+00:00"})
+        queue.claim_next(conn, "worker-dead")
+        queue.claim_next(conn, "worker-dead")
+        failures: list[tuple[str, str]] = []
+        pool = WaveWorkerPool(
+            queue=queue,
+            connect=lambda: conn,
+            execute=lambda *_args: "complete",
+            on_failed=lambda _conn, wave_id, code, _message: failures.append((wave_id, code)),
+            stale_after_seconds=120,
+            token_min_remaining_seconds=60,
+            now_utc=lambda: datetime(2026, 3, 14, tzinfo=timezone.utc),
+        )
+        with self.assertLogs("surfit.runtime.wave_job_queue", level="WARNING"):
+            self.assertEqual(pool.reap_once(conn), 2)
+        self.assertEqual(failures, [("wave-expiring", "WAVE_MUTATION_TOKEN_EXPIRED")])
+        self.assertEqual(queue.counts(conn), {"queued": 1, "failed": 1})
+        self.assertEqual(queue.claim_next(conn, "worker-1")[0], "wave-fresh")
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
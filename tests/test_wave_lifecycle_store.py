@@ -142,6 +142,32 @@ class WaveLifecycleStoreTests(unittest.TestCase):
             self.assertEqual(resolved, "./outputs/report.md")
             conn.close()
 
+    def test_mutation_scopes_are_content_addressed_and_deduplicated(self):
+        store = _store()
+        conn = sqlite3.connect(":memory:")
+        store.ensure_schema(conn)
+        scope = {"allowlisted_tools": ["ocean.proxy.http"], "http_proxy": {"allowed_domains": ["127.0.0.1"]}}
+        for wave_id in ("wave-a", "wave-b"):
+            store.insert_wave(
+                conn,
+                WaveInsertPayload(
+                    wave_id=wave_id,
+                    tenant_id="tenant_a",
+                    agent_id="agent",
+                    wave_template_id="sales_report_v1",
+                    policy_version="sales_report_policy_v1",
+                    intent="test",
+                    context_refs={},
+                    status="running",
+                    mutation_scope=scope,
+                ),
+            )
+        rows = conn.execute("SELECT scope_hash, scope_json FROM mutation_scopes").fetchall()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(json.loads(rows[0][1]), scope)
+        self.assertEqual(rows[0][0], store.sha256_text(rows[0][1]))
+        conn.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,207 @@
+"""
+SurFit V1 — Tool Result Cache
+Memoizes tools that opt in through tools.TOOL_CACHE_POLICY, keyed by tool
+name + canonical input hash. Two tiers: a bounded in-process LRU and the
+run DB's tool_cache table (outputs stored once in node_outputs), so hits
+survive restarts and are shared by every run on the same DB.
+
+With share_in_flight, concurrent runs that make the same cacheable call
+before either result is stored wait for a single execution (used by the
+batch runner, where many runs start with identical reads).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from logger import canonical_json, sha256_hex, store_output
+from tools import TOOL_CACHE_POLICY
+
+
+def cache_key(tool_name: str, tool_inputs: dict) -> str | None:
+    """sha256 of tool name + canonical inputs; None if inputs are not JSON-serializable."""
+    try:
+        return sha256_hex(tool_name + ":" + canonical_json(tool_inputs or {}))
+    except (TypeError, ValueError):
+        return None
+
+
+class ToolCache:
+    """
+    get() checks memory, then SQLite; put() writes both. Entries for
+    deterministic tools never expire; read tools expire after their
+    policy's ttl_seconds. Tools without a policy entry are never cached.
+    """
+
+    def __init__(
+        self,
+        policy: dict[str, dict] | None = None,
+        max_memory_entries: int = 1024,
+        clock: Callable[[], float] = time.time,
+        share_in_flight: bool = False,
+    ):
+        self.policy = TOOL_CACHE_POLICY if policy is None else policy
+        self.max_memory_entries = max(0, int(max_memory_entries))
+        self.clock = clock
+        self.share_in_flight = share_in_flight
+        self._lock = threading.Lock()
+        # key -> (data_json, expires_at); hits decode a fresh dict for each caller
+        self._memory: OrderedDict[str, tuple[str, float | None]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+
+    def cacheable(self, tool_name: str) -> bool:
+        return tool_name in self.policy
+
+    def _expires_at(self, tool_name: str, now: float) -> float | None:
+        rule = self.policy[tool_name]
+        if rule.get("deterministic"):
+            return None
+        return now + float(rule.get("ttl_seconds", 0))
+
+    def get(self, conn: sqlite3.Connection, tool_name: str, tool_inputs: dict) -> dict | None:
+        if not self.cacheable(tool_name):
+            return None
+        key = cache_key(tool_name, tool_inputs)
+        if key is None:
+            return None
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[0])
+        row = conn.execute(
+            """
+            SELECT o.data_json, c.expires_at
+            FROM tool_cache c JOIN node_outputs o ON o.content_hash = c.content_hash
+            WHERE c.cache_key = ? AND (c.expires_at IS NULL OR c.expires_at > ?)
+            """,
+            (key, now),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, row[0], row[1])
+        return json.loads(row[0])
+
+    def put(
+        self,
+        conn: sqlite3.Connection,
+        tool_name: str,
+        tool_inputs: dict,
+        data: dict,
+        commit: bool = True,
+    ) -> None:
+        if not self.cacheable(tool_name):
+            return
+        key = cache_key(tool_name, tool_inputs)
+        if key is None:
+            return
+        now = self.clock()
+        expires_at = self._expires_at(tool_name, now)
+        content_hash = store_output(conn, data)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO tool_cache (cache_key, tool_name, content_hash, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (key, tool_name, content_hash, now, expires_at),
+        )
+        if commit:
+            conn.commit()
+        with self._lock:
+            self._remember(key, canonical_json(data or {}), expires_at)
+
+    def remember(self, tool_name: str, tool_inputs: dict, data: dict) -> None:
+        """Memory tier only: make a fresh result visible before put() persists it."""
+        if not self.max_memory_entries or not self.cacheable(tool_name):
+            return
+        key = cache_key(tool_name, tool_inputs)
+        if key is None:
+            return
+        expires_at = self._expires_at(tool_name, self.clock())
+        with self._lock:
+            self._remember(key, canonical_json(data or {}), expires_at)
+
+    def _remember(self, key: str, data_json: str, expires_at: float | None) -> None:
+        if not self.max_memory_entries:
+            return
+        self._memory[key] = (data_json, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def run_once(
+        self,
+        tool_name: str,
+        tool_inputs: dict,
+        fn: Callable[[], Any],
+        shareable: Callable[[Any], bool] = lambda value: True,
+    ) -> tuple[Any, bool]:
+        """
+        Returns (fn(), False), or (value, True) when share_in_flight is on
+        and an identical cacheable call already in flight produced a
+        shareable value. A follower whose leader failed runs fn itself.
+        """
+        key = cache_key(tool_name, tool_inputs) if self.share_in_flight and self.cacheable(tool_name) else None
+        if key is None:
+            return fn(), False
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            try:
+                value = flight.result()
+            except Exception:
+                return fn(), False
+            if not shareable(value):
+                return fn(), False
+            with self._lock:
+                self.shared += 1
+            return value, True
+
+        try:
+            value = fn()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(value)
+            return value, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def purge_expired(self, conn: sqlite3.Connection) -> int:
+        """Delete expired rows from the SQLite tier. Returns the count."""
+        cur = conn.execute(
+            "DELETE FROM tool_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (self.clock(),)
+        )
+        conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "memory_entries": len(self._memory),
+            }
@@ -358,3 +358,21 @@ TOOL_REGISTRY: dict[str, callable] = {
     "tool_gen_reforecast": tool_gen_reforecast,
     "tool_update_plan": tool_update_plan,
 }
+
+# ── Result caching (opt-in per tool, used by tool_cache.ToolCache) ──
+# "deterministic": output depends only on inputs, cached with no expiry.
+# "ttl_seconds":   read tools, cached for one reporting window.
+
+READ_CACHE_TTL_SECONDS = 8 * 3600
+
+TOOL_CACHE_POLICY: dict[str, dict] = {
+    "tool_reconcile_metrics": {"deterministic": True},
+    "tool_reconcile_revenue": {"deterministic": True},
+    "tool_variance_analysis": {"deterministic": True},
+    "tool_salesforce_read_pipeline": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+    "tool_stripe_read_revenue": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+    "tool_quickbooks_read_expenses": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+    "tool_stripe_read_payouts": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+    "tool_pull_actuals": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+    "tool_pull_budget": {"ttl_seconds": READ_CACHE_TTL_SECONDS},
+}
@@ -0,0 +1,136 @@
+"""
+SurFit V1 — Integrity Sweep
+Re-verifies the execution_log hash chain for many runs at once, spreading
+runs across worker processes. Each worker opens its own read-only
+connection and streams rows through logger.verify_run_integrity.
+
+Run:  python verify_integrity.py --db surfit_runs.db
+      python verify_integrity.py --db surfit_runs.db --since 2026-03-01 --json
+      python verify_integrity.py --db surfit_runs.db --run-id RUN_A --run-id RUN_B
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from logger import DEFAULT_DB_PATH, init_db, verify_run_integrity
+
+
+def prepare_db(db_path: Path | str) -> None:
+    """
+    Bring an older DB up to the current schema (hash columns, chain index)
+    so the sweep can stream rows in chain order without sorting.
+    """
+    init_db(Path(db_path)).close()
+
+
+def _connect_read_only(db_path: Path | str) -> sqlite3.Connection:
+    return sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+
+
+def list_run_ids(db_path: Path | str, since: str | None = None) -> list[str]:
+    """
+    Runs to sweep. With `since`, runs started at or after that ISO time
+    (from the runs table); otherwise every run present in execution_log.
+    """
+    conn = _connect_read_only(db_path)
+    try:
+        if since is not None:
+            rows = conn.execute(
+                "SELECT run_id FROM runs WHERE started_at >= ? ORDER BY started_at, run_id", (since,)
+            )
+        else:
+            rows = conn.execute("SELECT DISTINCT run_id FROM execution_log ORDER BY run_id")
+        return [row[0] for row in rows]
+    finally:
+        conn.close()
+
+
+def _verify_chunk(db_path: str, run_ids: list[str]) -> list[tuple[str, dict]]:
+    conn = _connect_read_only(db_path)
+    try:
+        return [(run_id, verify_run_integrity(conn, run_id)) for run_id in run_ids]
+    finally:
+        conn.close()
+
+
+def verify_runs(
+    db_path: Path | str = DEFAULT_DB_PATH,
+    run_ids: list[str] | None = None,
+    since: str | None = None,
+    workers: int | None = None,
+    chunk_size: int = 64,
+    migrate: bool = True,
+) -> dict:
+    """
+    Verify many runs and return a summary report:
+        {"runs", "valid", "invalid", "rows_checked", "elapsed_ms", "failures": [...]}
+
+    Each failure carries the run_id plus verify_run_integrity's mismatch
+    details. workers=1 verifies in-process.
+    """
+    t0 = time.perf_counter()
+    if migrate:
+        prepare_db(db_path)
+    if run_ids is None:
+        run_ids = list_run_ids(db_path, since=since)
+    workers = workers or os.cpu_count() or 1
+    chunks = [run_ids[i:i + chunk_size] for i in range(0, len(run_ids), chunk_size)]
+
+    results: list[tuple[str, dict]] = []
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            results.extend(_verify_chunk(str(db_path), chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for chunk_results in pool.map(_verify_chunk, [str(db_path)] * len(chunks), chunks):
+                results.extend(chunk_results)
+
+    failures = [
+        {"run_id": run_id, **result} for run_id, result in results if not result["valid"]
+    ]
+    return {
+        "runs": len(results),
+        "valid": len(results) - len(failures),
+        "invalid": len(failures),
+        "rows_checked": sum(result.get("rows_checked", 0) for _, result in results),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 2),
+        "failures": failures,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify execution_log hash chains")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite DB path (default: surfit_runs.db)")
+    parser.add_argument("--run-id", action="append", dest="run_ids", help="Run to verify (repeatable)")
+    parser.add_argument("--since", help="Only runs started at or after this ISO timestamp")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-migrate", action="store_true", help="Do not upgrade the DB schema first (read-only DBs)")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = verify_runs(
+        args.db,
+        run_ids=args.run_ids,
+        since=args.since,
+        workers=args.workers,
+        migrate=not args.no_migrate,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Runs verified: {report['runs']} ({report['rows_checked']} rows) in {report['elapsed_ms']} ms")
+        print(f"Valid: {report['valid']}  Invalid: {report['invalid']}")
+        for failure in report["failures"]:
+            print(f"  FAIL {failure['run_id']}: first mismatch at index {failure['first_mismatch_index']}")
+    return 1 if report["invalid"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())